@@ -0,0 +1,58 @@
+"""
+Batch token introspection against individual calls.
+
+Tokens are verified by N requests with one token, then by one request with
+N tokens. Batch decodes all tokens in one pass and checks revocation by
+one MGET. Run the benchmark against a started application with a verified
+user and client from 'INTROSPECT_CLIENTS', count of tokens is limited by
+'INTROSPECT_MAX_TOKENS':
+
+    python -m benchmarks.bench_introspect --tokens 100 --client-id gateway --client-secret change-me
+"""
+import time
+import asyncio
+
+from httpx import AsyncClient
+
+from src.core.config import API
+from benchmarks.utils import get_parser
+
+
+async def main() -> None:
+    parser = get_parser(__doc__)
+    parser.add_argument('--tokens', type=int, default=100)
+    parser.add_argument('--rounds', type=int, default=10)
+    parser.add_argument('--client-id', default='gateway')
+    parser.add_argument('--client-secret', default='change-me')
+    args = parser.parse_args()
+
+    auth = (args.client_id, args.client_secret)
+    async with AsyncClient(base_url=args.base_url, timeout=60) as client:
+        tokens = []
+        for _ in range(args.tokens):
+            response = await client.post(API.auth_login_v1,
+                                         json={'username': args.username, 'password': args.password})
+            response.raise_for_status()
+            tokens.append(response.json()['access_token'])
+
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            for token in tokens:
+                response = await client.post(API.auth_introspect_v1, json={'tokens': [token]}, auth=auth)
+                response.raise_for_status()
+        single = (time.perf_counter() - start) / args.rounds
+
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            response = await client.post(API.auth_introspect_v1, json={'tokens': tokens}, auth=auth)
+            response.raise_for_status()
+        batch = (time.perf_counter() - start) / args.rounds
+
+    print(f'tokens={args.tokens} '
+          f'individual calls={single * 1000:.2f}ms '
+          f'batch call={batch * 1000:.2f}ms '
+          f'speedup={single / batch:.1f}x')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,70 @@
+"""
+Latency of '/v1/user/me' while logins are running concurrently.
+
+Password hashing used to run on the event loop, so every login stalled
+all other requests of the worker. Run the benchmark against a started
+application with a verified user:
+
+    python -m benchmarks.bench_login_me_latency --username testtest --password testtest
+
+The first phase measures '/v1/user/me' alone, the second one measures it
+together with '--concurrency' clients that log in without a pause.
+"""
+import time
+import asyncio
+import typing as tp
+
+from httpx import AsyncClient
+
+from src.core.config import API
+from benchmarks.utils import (
+    timer,
+    get_parser,
+    print_latency
+)
+
+
+async def login(client: AsyncClient, username: str, password: str) -> dict:
+    response = await client.post(API.auth_login_v1, json={'username': username, 'password': password})
+    response.raise_for_status()
+    return response.json()
+
+
+async def me_loop(client: AsyncClient, token: str, deadline: float, latencies: tp.List[float]) -> None:
+    headers = {'Authorization': f'Bearer {token}'}
+    while time.perf_counter() < deadline:
+        with timer(latencies):
+            response = await client.get(API.user_me_v1, headers=headers)
+        response.raise_for_status()
+
+
+async def login_loop(client: AsyncClient, username: str, password: str,
+                     deadline: float, latencies: tp.List[float]) -> None:
+    while time.perf_counter() < deadline:
+        with timer(latencies):
+            await client.post(API.auth_login_v1, json={'username': username, 'password': password})
+
+
+async def main() -> None:
+    args = get_parser(__doc__).parse_args()
+    async with AsyncClient(base_url=args.base_url, timeout=60) as client:
+        token = (await login(client, args.username, args.password))['access_token']
+
+        me_latencies = []
+        deadline = time.perf_counter() + args.duration
+        await me_loop(client, token, deadline, me_latencies)
+        print_latency('me without logins', me_latencies)
+
+        me_latencies, login_latencies = [], []
+        deadline = time.perf_counter() + args.duration
+        await asyncio.gather(
+            me_loop(client, token, deadline, me_latencies),
+            *[login_loop(client, args.username, args.password, deadline, login_latencies)
+              for _ in range(args.concurrency)]
+        )
+        print_latency('me with logins', me_latencies)
+        print_latency('login', login_latencies)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
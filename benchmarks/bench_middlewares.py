@@ -0,0 +1,98 @@
+"""
+Requests per second of '/v1/health_ping/app' and '/v1/user/me'
+with pure ASGI middlewares and with the previous 'BaseHTTPMiddleware' wrappers.
+
+'BaseHTTPMiddleware' runs every request in extra task with memory stream
+and wraps response in 'StreamingResponse'. The application is started in
+process with settings from environment, so redis and postgres must be
+available and the user must be verified:
+
+    python -m benchmarks.bench_middlewares --username testtest --password testtest
+
+Rate limiter is checked, but doesn't reject requests ('DEBUG' is enabled),
+so both stacks do the same work.
+"""
+import time
+import asyncio
+import typing as tp
+
+from httpx import AsyncClient
+from asgi_lifespan import LifespanManager
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from src import get_application
+from src.core.config import API, get_config
+from src.endpoints.exceptions import ManyRequestsHTTPException
+from src.endpoints.middlewares import (
+    LoggerMiddleware,
+    RateLimiterMiddleware
+)
+from benchmarks.utils import get_parser
+
+
+class LegacyRateLimiterMiddleware:
+    async def __call__(self, request: Request, call_next: tp.Callable):
+        try:
+            await RateLimiterMiddleware.check(request)
+        except ManyRequestsHTTPException as e:
+            return JSONResponse(e.detail, e.status_code, e.headers)
+        return await call_next(request)
+
+
+class LegacyLoggerMiddleware:
+    def __init__(self):
+        self.logger = LoggerMiddleware(app=None)
+
+    async def __call__(self, request: Request, call_next: tp.Callable):
+        response = await call_next(request)
+        self.logger.http_log.info(self.logger.http_message_log(request, response.status_code))
+        return response
+
+
+def get_legacy_application() -> FastAPI:
+    app = get_application(get_config())
+    app.user_middleware.clear()
+    for middleware in (LegacyRateLimiterMiddleware, LegacyLoggerMiddleware):
+        app.add_middleware(BaseHTTPMiddleware, dispatch=middleware())
+    return app
+
+
+async def rps(client: AsyncClient, url: str, headers: dict, duration: float, concurrency: int) -> float:
+    count = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker() -> None:
+        nonlocal count
+        while time.perf_counter() < deadline:
+            response = await client.get(url, headers=headers)
+            response.raise_for_status()
+            count += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return count / (time.perf_counter() - start)
+
+
+async def run(name: str, app: FastAPI, args) -> None:
+    async with LifespanManager(app):
+        async with AsyncClient(app=app, base_url='http://bench') as client:
+            response = await client.post(API.auth_login_v1, json={'username': args.username, 'password': args.password})
+            response.raise_for_status()
+            headers = {'Authorization': f'Bearer {response.json()["access_token"]}'}
+
+            for url, url_headers in ((API.health_ping_app_v1, {}), (API.user_me_v1, headers)):
+                value = await rps(client, url, url_headers, args.duration, args.concurrency)
+                print(f'{name} {url}: {value:.0f} rps')
+
+
+async def main() -> None:
+    args = get_parser(__doc__).parse_args()
+    get_config().DEBUG = True
+    await run('BaseHTTPMiddleware', get_legacy_application(), args)
+    await run('pure ASGI', get_application(get_config()), args)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,60 @@
+"""
+Throughput of 'AuthService._get_payload' with payload cache on and off.
+
+Without cache every authenticated request verifies signature of access
+token, parses json and validates 'JWTPayload'. The benchmark runs in process,
+it needs only settings of the application:
+
+    python -m benchmarks.bench_payload_cache --requests 100000 --tokens 100
+"""
+import time
+import argparse
+from uuid import uuid4
+
+from src.core.config import get_config
+from src.services.use_case import AuthService
+from src.infrastructure.key_ring import JWTKeyRing
+from src.infrastructure.memory_storage import LRUPayloadCache
+
+
+def run(service: AuthService, tokens: list, requests: int) -> float:
+    start = time.perf_counter()
+    for i in range(requests):
+        service._get_payload(tokens[i % len(tokens)])
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=100_000)
+    parser.add_argument('--tokens', type=int, default=100)
+    parser.add_argument('--cache-size', type=int, default=10_000)
+    args = parser.parse_args()
+
+    config = get_config().model_dump()
+    key_ring = JWTKeyRing(algorithm=config['TOKEN_ALGORITHM'],
+                          secret_key=config['SECRET_KEY'],
+                          keys_dir=config['TOKEN_KEYS_DIR'],
+                          active_kid=config['TOKEN_ACTIVE_KID'])
+    for name, size in (('cache off', 0), ('cache on', args.cache_size)):
+        cache = LRUPayloadCache(size)
+        service = AuthService(config=config,
+                              crypt_context=None,
+                              revocation_filter=None,
+                              key_ring=key_ring,
+                              payload_cache=cache,
+                              memory_uow=None,
+                              repository_uow=None)
+        tokens = [
+            service._get_access_and_refresh_token(uuid4(), 0, service._get_session_id()).access_token
+            for _ in range(args.tokens)
+        ]
+        elapsed = run(service, tokens, args.requests)
+        print(f'{name}: requests={args.requests} '
+              f'throughput={args.requests / elapsed:.0f}/s '
+              f'per request={elapsed / args.requests * 1e6:.2f}us '
+              f'hits={cache.hits} misses={cache.misses}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Overhead of rate limiter per request.
+
+Compares one GCRA script call of 'RedisMemoryStorage.throttle' with the
+previous sequence of rate limiter: TIME, lock, GET, SET and unlock. Every
+request uses own key, so nothing is rejected. Run it against redis:
+
+    python -m benchmarks.bench_rate_limiter --redis-url redis://localhost:6379/0
+"""
+import asyncio
+import argparse
+
+from redis.asyncio import from_url
+
+from src.infrastructure.memory_storage import RedisScripts
+from src.services.uow import RedisUOW
+from benchmarks.utils import (
+    timer,
+    print_latency
+)
+
+
+async def legacy_rate_limiter(redis, key: str, separation: float) -> None:
+    t = await redis.time()
+    now = float(f'{t[0]}.{t[1]}')
+    async with redis.lock('__call__' + key, 2):
+        last_request = await redis.get(key)
+        last_request = now if last_request is None else float(last_request)
+        if last_request - now <= separation:
+            await redis.set(key, max(last_request, now) + separation)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--redis-url', default='redis://localhost:6379/0')
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    redis = from_url(args.redis_url)
+    scripts = RedisScripts(redis)
+    await scripts.load()
+
+    legacy, gcra = [], []
+    for i in range(args.requests):
+        with timer(legacy):
+            await legacy_rate_limiter(redis, f'bench_legacy:{i}', 0.2)
+
+        async with RedisUOW(redis=redis, scripts=scripts) as mem:
+            with timer(gcra):
+                await mem.storage.throttle(f'bench:{i}', 0.2, 0.2)
+
+    print_latency('lock + TIME + GET + SET', legacy)
+    print_latency('GCRA script', gcra)
+    await redis.aclose()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
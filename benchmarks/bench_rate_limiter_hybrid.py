@@ -0,0 +1,105 @@
+"""
+Simulation of hybrid rate limiter: accuracy against count of redis calls.
+
+Workers keep 'LocalTokenBuckets' and lease tokens from GCRA of memory storage
+by chunks of 'lease size'. Clients send requests faster than limit, requests
+are balanced between workers. Simulation uses virtual clock, so it doesn't
+need redis:
+
+    python -m benchmarks.bench_rate_limiter_hybrid --workers 4 --rps 50 --limit 5
+"""
+import random
+import argparse
+
+from src.infrastructure.memory_storage import LocalTokenBuckets
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class SimulatedStorage:
+    """
+    The same algorithm as script 'THROTTLE' of memory storage
+    """
+    def __init__(self, clock: Clock):
+        self.clock = clock
+        self.tats = {}
+        self.calls = 0
+
+    def throttle(self, key: str, interval: float, tolerance: float, quantity: int):
+        self.calls += 1
+        now = self.clock()
+        tat = max(self.tats.get(key, now), now)
+        granted = min(quantity, int((now + tolerance - tat) // interval) + 1)
+        if granted < 1:
+            return 0, tat - tolerance - now
+        self.tats[key] = tat + granted * interval
+        return granted, 0.0
+
+
+def simulate(lease_size: int, args: argparse.Namespace) -> None:
+    random.seed(args.seed)
+    clock = Clock()
+    storage = SimulatedStorage(clock)
+    workers = [LocalTokenBuckets(capacity=args.clients, clock=clock) for _ in range(args.workers)]
+    interval = 1 / args.limit
+    tolerance = interval * (args.burst + lease_size - 2)
+
+    requests = []
+    for client in range(args.clients):
+        t = random.uniform(0, 1 / args.rps)
+        while t < args.duration:
+            requests.append((t, f'client:{client}'))
+            t += random.expovariate(args.rps)
+    requests.sort()
+
+    allowed = {}
+    for i, (t, key) in enumerate(requests):
+        clock.now = t
+        buckets = workers[i % args.workers]
+        retry_after = buckets.take(key)
+        if retry_after is None:
+            granted, retry_after = storage.throttle(key, interval, tolerance, lease_size)
+            buckets.put(key, granted - 1, retry_after, lease_size * interval)
+        if retry_after == 0:
+            allowed.setdefault(key, []).append(t)
+
+    # the most requests of client, which are allowed in one second
+    peak = 0
+    for times in allowed.values():
+        start = 0
+        for end, t in enumerate(times):
+            while times[start] <= t - 1:
+                start += 1
+            peak = max(peak, end - start + 1)
+
+    total = sum(len(times) for times in allowed.values())
+    expected = args.clients * args.duration * min(args.rps, args.limit)
+    print(f'lease size={lease_size:>3} '
+          f'allowed={total / expected:.3f} of expected '
+          f'peak={peak} per second '
+          f'redis calls per request={storage.calls / len(requests):.3f}')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--clients', type=int, default=100)
+    parser.add_argument('--rps', type=float, default=50, help='requests per second of client')
+    parser.add_argument('--limit', type=float, default=5, help='allowed requests per second')
+    parser.add_argument('--burst', type=int, default=2)
+    parser.add_argument('--duration', type=float, default=60)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    for lease_size in (1, 2, 5, 10, 20):
+        simulate(lease_size, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Connection churn of memory storage UOW with client per UOW and with one
+shared pool of the worker.
+
+Previously every 'RedisUOW' got new client from 'from_url', so every request
+opened new connections, which weren't closed. Count of connections is taken
+from 'total_connections_received' of redis INFO. Run it against redis:
+
+    python -m benchmarks.bench_redis_pool --redis-url redis://localhost:6379/0
+"""
+import asyncio
+import argparse
+import typing as tp
+
+from redis.asyncio import Redis, from_url
+
+from src.core.redis_core import TimedBlockingConnectionPool
+from src.infrastructure.memory_storage import RedisScripts
+from src.services.uow import RedisUOW
+from benchmarks.utils import (
+    timer,
+    print_latency
+)
+
+
+async def get_received_connections(redis: Redis) -> int:
+    return (await redis.info('stats'))['total_connections_received']
+
+
+async def run(name: str,
+              get_client: tp.Callable[[], Redis],
+              scripts: RedisScripts,
+              monitor: Redis,
+              requests: int,
+              concurrency: int) -> None:
+    latencies = []
+    clients = []
+
+    async def request(i: int) -> None:
+        client = get_client()
+        clients.append(client)
+        with timer(latencies):
+            async with RedisUOW(redis=client, scripts=scripts) as mem:
+                await mem.storage.get(f'bench_pool:{i}')
+                await mem.storage.set(f'bench_pool:{i}', 1, ex=10)
+
+    before = await get_received_connections(monitor)
+    for start in range(0, requests, concurrency):
+        await asyncio.gather(*[request(i) for i in range(start, min(start + concurrency, requests))])
+    after = await get_received_connections(monitor)
+
+    print_latency(name, latencies)
+    print(f'{name}: new connections={after - before}')
+    for client in {id(client): client for client in clients}.values():
+        await client.aclose()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--redis-url', default='redis://localhost:6379/0')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--max-connections', type=int, default=50)
+    args = parser.parse_args()
+
+    monitor = from_url(args.redis_url)
+    scripts = RedisScripts(monitor)
+    await scripts.load()
+
+    await run('client per UOW', lambda: from_url(args.redis_url), scripts, monitor,
+              args.requests, args.concurrency)
+
+    pool = TimedBlockingConnectionPool.from_url(args.redis_url, max_connections=args.max_connections)
+    shared = Redis(connection_pool=pool)
+    await run('shared pool', lambda: shared, scripts, monitor, args.requests, args.concurrency)
+    await pool.disconnect()
+    await monitor.aclose()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+"""
+Concurrent refresh storm for the same user.
+
+Refresh-token rotation used to take a redis lock per user and send at least
+5 commands, now it's one atomic script. Two phases are measured against a
+started application with a verified user:
+
+    python -m benchmarks.bench_refresh_storm --concurrency 50
+
+1. 'same token': all clients refresh one refresh-token at the same time,
+   exactly one of them must succeed.
+2. 'sessions': every client logs in once and refreshes its own session
+   in a loop during '--duration' seconds.
+"""
+import time
+import asyncio
+import typing as tp
+
+from httpx import AsyncClient
+
+from src.core.config import API
+from benchmarks.utils import (
+    timer,
+    get_parser,
+    print_latency
+)
+
+
+async def login(client: AsyncClient, username: str, password: str) -> dict:
+    response = await client.post(API.auth_login_v1, json={'username': username, 'password': password})
+    response.raise_for_status()
+    return response.json()
+
+
+async def refresh(client: AsyncClient, refresh_token: str, latencies: tp.List[float]) -> tp.Optional[dict]:
+    with timer(latencies):
+        response = await client.post(API.auth_refresh_v1, json={'refresh_token': refresh_token})
+    return response.json() if response.status_code == 200 else None
+
+
+async def session_loop(client: AsyncClient, username: str, password: str,
+                       deadline: float, latencies: tp.List[float]) -> int:
+    count = 0
+    token = await login(client, username, password)
+    while time.perf_counter() < deadline:
+        token = await refresh(client, token['refresh_token'], latencies)
+        if token is None:
+            raise RuntimeError('refresh of own session failed')
+        count += 1
+    return count
+
+
+async def main() -> None:
+    args = get_parser(__doc__).parse_args()
+    async with AsyncClient(base_url=args.base_url, timeout=60) as client:
+        latencies = []
+        token = await login(client, args.username, args.password)
+        results = await asyncio.gather(
+            *[refresh(client, token['refresh_token'], latencies) for _ in range(args.concurrency)]
+        )
+        succeeded = sum(result is not None for result in results)
+        print(f'same token: clients={args.concurrency} succeeded={succeeded}')
+        print_latency('same token', latencies)
+
+        latencies = []
+        start = time.perf_counter()
+        counts = await asyncio.gather(
+            *[session_loop(client, args.username, args.password, start + args.duration, latencies)
+              for _ in range(args.concurrency)]
+        )
+        elapsed = time.perf_counter() - start
+        print(f'sessions: refreshes={sum(counts)} rps={sum(counts) / elapsed:.1f}')
+        print_latency('sessions', latencies)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
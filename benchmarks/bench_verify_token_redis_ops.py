@@ -0,0 +1,53 @@
+"""
+Redis commands per authenticated request.
+
+'AuthService.verify_token' used to send GET to redis on every request to
+check that access token wasn't revoked. Now redis is checked only when the
+revocation filter can't exclude the token. Run the benchmark against a
+started application with a verified user:
+
+    python -m benchmarks.bench_verify_token_redis_ops --redis-url redis://localhost:6379/0
+
+The value is calculated from 'total_commands_processed' of 'INFO stats', so
+run it against redis without other clients.
+"""
+import asyncio
+
+from httpx import AsyncClient
+from redis.asyncio import from_url
+
+from src.core.config import API
+from benchmarks.utils import get_parser
+
+
+async def get_commands_processed(redis) -> int:
+    info = await redis.info('stats')
+    return info['total_commands_processed']
+
+
+async def main() -> None:
+    parser = get_parser(__doc__)
+    parser.add_argument('--redis-url', default='redis://localhost:6379/0')
+    parser.add_argument('--requests', type=int, default=1000)
+    args = parser.parse_args()
+
+    async with AsyncClient(base_url=args.base_url, timeout=60) as client, from_url(args.redis_url) as redis:
+        response = await client.post(API.auth_login_v1,
+                                     json={'username': args.username, 'password': args.password})
+        response.raise_for_status()
+        headers = {'Authorization': f'Bearer {response.json()["access_token"]}'}
+
+        before = await get_commands_processed(redis)
+        for _ in range(args.requests):
+            response = await client.get(API.user_me_v1, headers=headers)
+            response.raise_for_status()
+        after = await get_commands_processed(redis)
+
+    # one command is INFO itself
+    commands = after - before - 1
+    print(f'requests={args.requests} redis commands={commands} '
+          f'per request={commands / args.requests:.3f}')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
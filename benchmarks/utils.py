@@ -0,0 +1,48 @@
+import time
+import typing as tp
+import argparse
+import statistics
+from contextlib import contextmanager
+
+
+def get_parser(description: str) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--base-url', default='http://localhost:8000')
+    parser.add_argument('--username', default='testtest')
+    parser.add_argument('--password', default='testtest')
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--concurrency', type=int, default=10)
+    return parser
+
+
+def percentile(values: tp.Sequence[float], q: float) -> float:
+    if not values:
+        return 0.0
+    data = sorted(values)
+    index = min(len(data) - 1, max(0, round(q / 100 * len(data)) - 1))
+    return data[index]
+
+
+def print_latency(name: str, latencies: tp.Sequence[float]) -> None:
+    """
+    Print count, mean, p50, p99 and max latency in milliseconds
+    """
+    if not latencies:
+        print(f'{name}: no data')
+        return
+
+    ms = [value * 1000 for value in latencies]
+    print(f'{name}: count={len(ms)} '
+          f'mean={statistics.fmean(ms):.2f}ms '
+          f'p50={percentile(ms, 50):.2f}ms '
+          f'p99={percentile(ms, 99):.2f}ms '
+          f'max={max(ms):.2f}ms')
+
+
+@contextmanager
+def timer(latencies: tp.List[float]) -> tp.Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        latencies.append(time.perf_counter() - start)
@@ -1,3 +1,5 @@
+import os
+
 from dependency_injector import (
     containers,
     providers
@@ -27,8 +29,8 @@ class Container(containers.DeclarativeContainer):
     )
     broker: AbstractBroker = providers.Factory(
         RabbitmqBroker,
-        url=config.RABBITMQ.rabbitmq_url
-
+        url=config.RABBITMQ.rabbitmq_url,
+        topology_file=os.path.join(config.DIR, config.RABBITMQ.RABBITMQ_TOPOLOGY_FILE)
     )
 
     # use_case
@@ -25,6 +25,8 @@ class RabbitmqSettings(Settings):
     RABBITMQ_DEFAULT_PASS: str
     RABBITMQ_HOST: str
     RABBITMQ_PORT: int
+    # exchanges, queues and bindings, file is shared with service
+    RABBITMQ_TOPOLOGY_FILE: str = '../rabbitmq/topology.json'
 
     @property
     def rabbitmq_settings(self) -> dict:
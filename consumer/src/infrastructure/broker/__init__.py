@@ -1,6 +1,8 @@
 from .rabbitmq_broker import RabbitmqBroker
+from .topology import RabbitmqTopology
 
 
 __all__ = [
-    'RabbitmqBroker'
+    'RabbitmqBroker',
+    'RabbitmqTopology'
 ]
\ No newline at end of file
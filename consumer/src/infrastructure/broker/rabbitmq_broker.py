@@ -14,12 +14,15 @@ from aio_pika.abc import (
 from src.services import entities as et
 from src.services.abstract_interface import AbstractBroker
 
+from .topology import RabbitmqTopology
+
 
 class RabbitmqBroker(AbstractBroker):
     queues: tp.List[tp.Tuple[AbstractRobustQueue, tp.Callable]] = []
 
-    def __init__(self, url):
+    def __init__(self, url: str, topology_file: str):
         self.url = url
+        self.topology = RabbitmqTopology.from_file(topology_file)
         self.channel = None
         logger.setLevel(logging.ERROR)
 
@@ -27,21 +30,16 @@ class RabbitmqBroker(AbstractBroker):
         connection = await connect_robust(self.url)
         channel = await connection.channel()
 
-        # create queues
-        send_registration_email_queue = await channel.declare_queue(
-            self.send_registration_email_name,
-            durable=True
-        )
-
-        send_update_email_queue = await channel.declare_queue(
-            self.send_update_email_name,
-            durable=True
-        )
+        # declare topology shared with service, robust channel declares it
+        # again after reconnect
+        await self.topology.declare(channel)
 
         # create list
         self.queues = [
-            (send_registration_email_queue, self._callback(functions.send_registration_email_func)),
-            (send_update_email_queue, self._callback(functions.send_update_email_func))
+            (self.topology.queues[self.send_registration_email_name],
+             self._callback(functions.send_registration_email_func)),
+            (self.topology.queues[self.send_update_email_name],
+             self._callback(functions.send_update_email_func))
         ]
 
     async def start_consume(self):
@@ -56,5 +54,7 @@ class RabbitmqBroker(AbstractBroker):
                 await func(message)
                 await message.channel.basic_ack(delivery_tag=message.delivery_tag)
             except Exception as e:
+                # message is moved to dead-letter queue of its queue
+                await message.reject(requeue=False)
                 raise e
         return wrapper
@@ -0,0 +1,77 @@
+import json
+import typing as tp
+from weakref import WeakKeyDictionary
+
+from aio_pika import ExchangeType
+from aio_pika.abc import (
+    AbstractChannel,
+    AbstractExchange,
+    AbstractQueue
+)
+
+
+class RabbitmqTopology:
+    """
+    Exchanges, queues and bindings of broker, definition is read from file
+    'rabbitmq/topology.json', which is shared by service and consumer, how it works:
+    1. 'declare' declares exchanges, durable queues and bindings, it's called
+       on startup and after reconnect. Arguments of existing queue can't be
+       changed by declaration, so dead-letter exchange is set by 'policies',
+       they are applied by 'make rabbitmq_policies'
+    2. 'route' returns exchange and routing key of the first binding of queue,
+       so message for queue is sent by one basic.publish
+    3. 'exchange' returns cached handle of exchange of channel, handle is
+       created without round trip to broker, 'queues' are handles of the last
+       declaration
+    Module is the same in service and consumer, so change it in both.
+    """
+    def __init__(self, definition: dict):
+        self.definition = definition
+        self.routes: tp.Dict[str, tp.Tuple[str, str]] = {}
+        for binding in definition['bindings']:
+            self.routes.setdefault(binding['queue'], (binding['exchange'], binding['routing_key']))
+        self.policies: tp.List[dict] = definition.get('policies', [])
+        self.queues: tp.Dict[str, AbstractQueue] = {}
+        self.exchanges: WeakKeyDictionary = WeakKeyDictionary()
+
+    @classmethod
+    def from_file(cls, path: str) -> tp.Self:
+        with open(path) as file:
+            return cls(json.load(file))
+
+    async def declare(self, channel: AbstractChannel) -> None:
+        exchanges = {}
+        for exchange in self.definition['exchanges']:
+            exchanges[exchange['name']] = await channel.declare_exchange(
+                name=exchange['name'],
+                type=ExchangeType(exchange.get('type', 'direct')),
+                durable=exchange.get('durable', True)
+            )
+
+        queues = {}
+        for queue in self.definition['queues']:
+            queues[queue['name']] = await channel.declare_queue(
+                name=queue['name'],
+                durable=queue.get('durable', True),
+                arguments=queue.get('arguments')
+            )
+
+        for binding in self.definition['bindings']:
+            await queues[binding['queue']].bind(
+                exchange=exchanges[binding['exchange']],
+                routing_key=binding['routing_key']
+            )
+        self.queues = queues
+
+    def route(self, queue_name: str) -> tp.Tuple[str, str]:
+        return self.routes[queue_name]
+
+    async def exchange(self, channel: AbstractChannel, name: str) -> AbstractExchange:
+        handles = self.exchanges.get(channel)
+        if handles is None:
+            handles = self.exchanges[channel] = {}
+
+        handle = handles.get(name)
+        if handle is None:
+            handle = handles[name] = await channel.get_exchange(name, ensure=False)
+        return handle
@@ -8,7 +8,8 @@ from alembic import context
 from src.infrastructure.repository.postgres_models.abstract_model import Base
 from src.infrastructure.repository.postgres_models import (
     User,
-    UserHistory
+    UserHistory,
+    Outbox
 )
 from src.core.sqlalchemy_core import get_sync_postgres_url
 from src.core.config import get_config
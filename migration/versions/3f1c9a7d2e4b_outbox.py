@@ -0,0 +1,52 @@
+"""outbox
+
+Revision ID: 3f1c9a7d2e4b
+Revises: b5298139c9be
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a7d2e4b'
+down_revision: Union[str, None] = 'b5298139c9be'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('outbox',
+    sa.Column('queue', sa.TEXT(), nullable=False),
+    sa.Column('payload', sa.TEXT(), nullable=False),
+    sa.Column('id', sa.UUID(), server_default=sa.text('gen_random_uuid()'), nullable=False),
+    sa.Column('dt_update', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('dt_created', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('id')
+    )
+    op.create_index('ix_outbox_dt_created', 'outbox', ['dt_created'], unique=False)
+
+    # notification is sent on commit of transaction, so relay takes messages
+    # without waiting for poll interval
+    op.execute("""
+        CREATE FUNCTION outbox_notify() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('outbox', '');
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER outbox_notify AFTER INSERT ON outbox
+        FOR EACH STATEMENT EXECUTE FUNCTION outbox_notify()
+    """)
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER outbox_notify ON outbox')
+    op.execute('DROP FUNCTION outbox_notify()')
+    op.drop_index('ix_outbox_dt_created', table_name='outbox')
+    op.drop_table('outbox')
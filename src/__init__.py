@@ -1,10 +1,15 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from starlette.middleware.base import BaseHTTPMiddleware
 
 from src.core.config import DefaultSettings
-from src.core.containers import Container
+from src.core.containers import (
+    Container,
+    RelayContainer
+)
 from src.endpoints.api import routers
 from src.endpoints.middlewares import middlewares
+from src.endpoints.exceptions import exception_handlers
 
 
 def bind_routers(app: FastAPI) -> None:
@@ -14,25 +19,49 @@ def bind_routers(app: FastAPI) -> None:
         )
 
 
+def bind_exception_handlers(app: FastAPI) -> None:
+    for exception, handler in exception_handlers.items():
+        app.add_exception_handler(
+            exc_class_or_status_code=exception,
+            handler=handler
+        )
+
+
 def bind_middlewares(app: FastAPI) -> None:
     for middleware in middlewares:
-        middle = middleware()
         app.add_middleware(
-            middleware_class=BaseHTTPMiddleware,
-            dispatch=middle
+            middleware_class=middleware
         )
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    relay = app.container.config.OUTBOX_RELAY()
+    await app.container.init_resources()
+    if relay:
+        await app.relay_container.init_resources()
+    yield
+    if relay:
+        await app.relay_container.shutdown_resources()
+    await app.container.shutdown_resources()
+
+
 def get_application(settings: DefaultSettings = None) -> FastAPI:
     app = FastAPI(
         title=settings.PROJECT_NAME,
         openapi_url=settings.OPENAPI_URL,
         docs_url=settings.DOCS_URL,
+        lifespan=lifespan
     )
     container = Container()
     container.config.from_dict(settings.model_dump())
+    app.container = container
+    relay_container = RelayContainer(async_session=container.async_session)
+    relay_container.config.from_dict(settings.model_dump())
+    app.relay_container = relay_container
     bind_routers(app)
-    # bind_middlewares(app)
+    bind_exception_handlers(app)
+    bind_middlewares(app)
     return app
 
 
@@ -25,12 +25,45 @@ class API:
     auth_login_v1 = '/v1/auth/login'
     auth_logout_v1 = '/v1/auth/logout'
     auth_refresh_v1 = '/v1/auth/refresh'
+    auth_introspect_v1 = '/v1/auth/introspect'
+
+    jwks = '/.well-known/jwks.json'
+
+    metrics_v1 = '/v1/metrics'
+
+    admin_profile_v1 = '/v1/admin/profile'
 
     health_ping_db_v1 = '/v1/health_ping/db'
     health_ping_app_v1 = '/v1/health_ping/app'
     health_ping_memory_cache_v1 = '/v1/health_ping/memory_cache'
 
 
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    # prefix of route, segment '*' matches any segment
+    path: str
+    # sustained requests per second
+    rate: float
+    # count of requests, which can be sent at once
+    burst: int
+    # authenticated users are limited by user_id, other by ip
+    by_user: bool = False
+
+
+RATE_LIMIT_POLICIES = (
+    RateLimitPolicy(path=API.auth_login_v1, rate=0.2, burst=5),
+    RateLimitPolicy(path=API.auth_refresh_v1, rate=1, burst=5),
+    RateLimitPolicy(path=API.user_registration_v1, rate=0.1, burst=3),
+    RateLimitPolicy(path=API.user_email_verify_v1, rate=0.2, burst=5),
+    RateLimitPolicy(path=API.user_available_v1, rate=2, burst=10),
+    RateLimitPolicy(path=API.user_me_v1, rate=20, burst=40, by_user=True),
+    RateLimitPolicy(path=API.auth_introspect_v1, rate=50, burst=100),
+    RateLimitPolicy(path=API.jwks, rate=5, burst=20),
+    RateLimitPolicy(path=API.metrics_v1, rate=1, burst=10),
+    RateLimitPolicy(path=API.admin_profile_v1, rate=0.1, burst=2, by_user=True),
+)
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         extra='ignore',
@@ -51,6 +84,13 @@ class RedisSettings(Settings):
     REDIS_HOST: str
     REDIS_PORT: int
     REDIS_DB: int
+    # one pool of the worker, command waits for free connection up to
+    # 'REDIS_POOL_TIMEOUT' seconds
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_POOL_TIMEOUT: float = 5
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30
+    REDIS_SOCKET_TIMEOUT: float = 5
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = 5
 
 
 class RabbitmqSettings(Settings):
@@ -58,6 +98,14 @@ class RabbitmqSettings(Settings):
     RABBITMQ_DEFAULT_USER: str
     RABBITMQ_HOST: str
     RABBITMQ_PORT: int
+    # port of management api, policies are applied by 'make rabbitmq_policies'
+    RABBITMQ_WEB_PORT: int = 15672
+    # channels of one connection of the worker, UOW waits for free channel up
+    # to 'RABBITMQ_CHANNEL_TIMEOUT' seconds
+    RABBITMQ_CHANNEL_POOL_SIZE: int = 10
+    RABBITMQ_CHANNEL_TIMEOUT: float = 5
+    # exchanges, queues and bindings, file is shared with consumer
+    RABBITMQ_TOPOLOGY_FILE: str = 'rabbitmq/topology.json'
     RABBITMQ_MESSAGE_TTL: int
 
 
@@ -78,16 +126,94 @@ class DefaultSettings(Settings):
     ACCESS_EXP_TIME: int
     REFRESH_EXP_TIME: int
 
-    # logging
+    # rate limiter, 'REQUEST_PER_SECOND' and 'RATE_LIMIT_BURST' are limits of
+    # routes without policy. If lease size is more than 1, then every worker
+    # leases tokens from redis by chunks, so limit can be exceeded up to
+    # 'lease size' * 'count of workers'. Client ip is taken from 'X-Forwarded-For',
+    # if request is sent by one of 'TRUSTED_PROXIES'
+    RATE_LIMIT_BURST: int = 2
+    RATE_LIMIT_LEASE_SIZE: int = 1
+    RATE_LIMIT_BUCKETS: int = 100_000
+    TRUSTED_PROXIES: tp.List[str] = []
+
+    # password hashing, 'ALGORITHM' is comma separated list of schemes, first
+    # scheme hashes new passwords, others are rehashed on login
+    HASH_ROUNDS: tp.Optional[int] = None
+    HASH_POOL_SIZE: tp.Optional[int] = None
+    HASH_QUEUE_SIZE: int = 64
+
+    # revocation filter
+    REVOCATION_FILTER_CAPACITY: int = 100_000
+    REVOCATION_FILTER_ERROR_RATE: float = 0.001
+    REVOCATION_FILTER_RESYNC_TIME: int = 60
+    TOKEN_GENERATION_CACHE_TTL: float = 10
+    USER_STATUS_EXP_TIME: int = 3600
+
+    # key ring, asymmetric algorithms sign tokens by key 'TOKEN_ACTIVE_KID'
+    # from 'TOKEN_KEYS_DIR'
+    TOKEN_KEYS_DIR: str = 'keys'
+    TOKEN_ACTIVE_KID: tp.Optional[str] = None
+    JWKS_MAX_AGE: int = 300
+
+    # token introspection, caller is service with basic auth by client id and
+    # secret from 'INTROSPECT_CLIENTS' or superuser with access token, one
+    # request checks up to 'INTROSPECT_MAX_TOKENS' tokens
+    INTROSPECT_CLIENTS: tp.Dict[str, str] = {}
+    INTROSPECT_MAX_TOKENS: int = 100
+
+    # payload cache, 0 disables cache
+    PAYLOAD_CACHE_SIZE: int = 10_000
+
+    # logging, records are written to files by background thread in batches
+    # of 'LOG_BATCH_SIZE' at least every 'LOG_FLUSH_INTERVAL' seconds, if queue
+    # has 'LOG_QUEUE_SIZE' records, then new records are dropped
     LOG_DIR: str
     HTTP_LOG_NAME: str
     BUSINESS_LOGIC_LOG_NAME: str
+    LOG_QUEUE_SIZE: int = 10_000
+    LOG_BATCH_SIZE: int = 256
+    LOG_FLUSH_INTERVAL: float = 0.5
+    # access log, successful requests are sampled by 'LOG_SAMPLE_RATE' or by
+    # rate of route template from 'LOG_SAMPLE_RATES', errors and requests longer
+    # than 'LOG_SLOW_REQUEST_TIME' seconds aren't sampled. Sampled records are
+    # limited by 'LOG_LINES_PER_SECOND' per worker, errors and slow requests
+    # have own limit 'LOG_IMPORTANT_LINES_PER_SECOND'
+    LOG_SAMPLE_RATE: float = 1.0
+    LOG_SAMPLE_RATES: tp.Dict[str, float] = {}
+    LOG_SLOW_REQUEST_TIME: float = 1.0
+    LOG_LINES_PER_SECOND: float = 1000
+    LOG_IMPORTANT_LINES_PER_SECOND: float = 1000
 
     # fastapi
     DOCS_URL: str
     OPENAPI_URL: str
     PROJECT_NAME: str
 
+    # stage timing, durations of db, redis, broker, hash and uow stages are
+    # always observed in histograms, 'SERVER_TIMING' adds header 'Server-Timing'
+    SERVER_TIMING: bool = False
+
+    # metrics, every worker writes snapshot of metrics to 'METRICS_DIR' every
+    # 'METRICS_FLUSH_INTERVAL' seconds. Snapshot of dead worker, which hasn't
+    # been updated for 'METRICS_STALE_INTERVALS' intervals, is folded into
+    # snapshot 'dead.json' without gauges, so directory doesn't have to be
+    # cleaned before start and counters don't go down
+    METRICS_DIR: str = 'metrics'
+    METRICS_FLUSH_INTERVAL: float = 5
+    METRICS_STALE_INTERVALS: int = 3
+
+    # profiler, stack of event loop is taken every 'PROFILER_INTERVAL' seconds
+    PROFILER_INTERVAL: float = 0.005
+
+    # outbox, messages of broker are saved in table 'outbox' in transaction of
+    # request. If 'OUTBOX_RELAY', then relay of the worker publishes them by
+    # batches of 'OUTBOX_BATCH_SIZE' after notification of insert or every
+    # 'OUTBOX_POLL_INTERVAL' seconds, else worker doesn't connect to broker and
+    # relay is run by 'make run_outbox_relay'
+    OUTBOX_RELAY: bool = True
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_INTERVAL: float = 5
+
     # uvicorn
     UVICORN_HOST: str
     UVICORN_PORT: int
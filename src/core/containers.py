@@ -1,21 +1,49 @@
 from dependency_injector import containers, providers
-from passlib.context import CryptContext
 
 from src.services.uow import (
     RedisUOW,
     RabbitmqUOW,
+    OutboxRepositoryUOW,
     AuthServiceRepositoryUOW,
     UserServiceRepositoryUOW
 )
 from src.services.use_case import (
     AuthService,
     UserService,
+    OutboxRelay,
+    PolicyMatcher,
     RateLimiterService
 )
 
-from .redis_core import get_async_redis_client
-from .rabbitmq_core import get_rabbitmq_channel
-from .sqlalchemy_core import get_engine, get_async_session
+from src.infrastructure.key_ring import JWTKeyRing
+from src.infrastructure.repository import (
+    OutboxRepository,
+    PostgresNotificationListener
+)
+from src.infrastructure.memory_storage import (
+    LRUPayloadCache,
+    LocalTokenBuckets
+)
+
+from .config import RATE_LIMIT_POLICIES
+from .crypt_core import get_password_hasher
+from .redis_core import (
+    get_redis_client,
+    get_redis_scripts,
+    get_revocation_filter
+)
+from .rabbitmq_core import (
+    get_rabbitmq_topology,
+    get_rabbitmq_channel_pool
+)
+from .outbox_core import get_outbox_relay
+from .metrics_core import get_metrics_exporter
+from .profiler_core import StackSampler
+from .sqlalchemy_core import (
+    get_engine,
+    get_async_session,
+    get_sync_postgres_url
+)
 
 
 class Container(containers.DeclarativeContainer):
@@ -24,20 +52,64 @@ class Container(containers.DeclarativeContainer):
     wiring_config = containers.WiringConfiguration(
         packages=['src.endpoints']
     )
-    crypt_context = providers.Singleton(
-        CryptContext,
+    crypt_context = providers.Resource(
+        get_password_hasher,
         schemes=config.ALGORITHM,
-        deprecated='auto'
+        rounds=config.HASH_ROUNDS,
+        max_workers=config.HASH_POOL_SIZE,
+        max_queue_size=config.HASH_QUEUE_SIZE
+    )
+
+    metrics_exporter = providers.Resource(
+        get_metrics_exporter,
+        base_dir=config.BASE_DIR,
+        directory=config.METRICS_DIR,
+        interval=config.METRICS_FLUSH_INTERVAL,
+        stale_intervals=config.METRICS_STALE_INTERVALS
+    )
+
+    stack_sampler = providers.Singleton(
+        StackSampler,
+        interval=config.PROFILER_INTERVAL
     )
 
     # connection to interface
-    redis_client = providers.Factory(
-        get_async_redis_client,
+    redis_client = providers.Resource(
+        get_redis_client,
         redis_settings=config.REDIS
     )
-    rabbitmq_channel = providers.Factory(
-        get_rabbitmq_channel,
-        rabbitmq_settings=config.RABBITMQ
+    redis_scripts = providers.Resource(
+        get_redis_scripts,
+        redis=redis_client
+    )
+    revocation_filter = providers.Resource(
+        get_revocation_filter,
+        redis=redis_client,
+        capacity=config.REVOCATION_FILTER_CAPACITY,
+        error_rate=config.REVOCATION_FILTER_ERROR_RATE,
+        resync_time=config.REVOCATION_FILTER_RESYNC_TIME,
+        generation_ttl=config.TOKEN_GENERATION_CACHE_TTL
+    )
+    key_ring = providers.Singleton(
+        JWTKeyRing,
+        algorithm=config.TOKEN_ALGORITHM,
+        secret_key=config.SECRET_KEY,
+        keys_dir=config.TOKEN_KEYS_DIR,
+        active_kid=config.TOKEN_ACTIVE_KID
+    )
+    payload_cache = providers.Singleton(
+        LRUPayloadCache,
+        size=config.PAYLOAD_CACHE_SIZE
+    )
+    token_buckets = providers.Singleton(
+        LocalTokenBuckets,
+        capacity=config.RATE_LIMIT_BUCKETS
+    )
+    policy_matcher = providers.Singleton(
+        PolicyMatcher,
+        policies=RATE_LIMIT_POLICIES,
+        default_rate=config.REQUEST_PER_SECOND,
+        default_burst=config.RATE_LIMIT_BURST
     )
     engine = providers.Singleton(
         get_engine,
@@ -51,11 +123,8 @@ class Container(containers.DeclarativeContainer):
     # uow
     redis_uow = providers.Factory(
         RedisUOW,
-        redis=redis_client
-    )
-    rabbitmq_uow = providers.Factory(
-        RabbitmqUOW,
-        channel=rabbitmq_channel
+        redis=redis_client,
+        scripts=redis_scripts
     )
     user_repository_uow = providers.Factory(
         UserServiceRepositoryUOW,
@@ -71,19 +140,76 @@ class Container(containers.DeclarativeContainer):
         UserService,
         config=config,
         crypt_context=crypt_context,
+        revocation_filter=revocation_filter,
         memory_uow=redis_uow,
-        repository_uow=user_repository_uow,
-        broker_uow=rabbitmq_uow
+        repository_uow=user_repository_uow
     )
-    rate_limiter_service = providers.Singleton(
+    rate_limiter_service = providers.Factory(
         RateLimiterService,
         config=config,
+        policy_matcher=policy_matcher,
+        key_ring=key_ring,
+        payload_cache=payload_cache,
+        token_buckets=token_buckets,
         memory_uow=redis_uow,
     )
     auth_service = providers.Factory(
         AuthService,
         config=config,
         crypt_context=crypt_context,
+        revocation_filter=revocation_filter,
+        key_ring=key_ring,
+        payload_cache=payload_cache,
         memory_uow=redis_uow,
         repository_uow=user_repository_uow,
     )
+
+
+class RelayContainer(containers.DeclarativeContainer):
+    """
+    Broker and outbox relay, they aren't used by requests, so resources are
+    initialized only in worker with 'OUTBOX_RELAY' or by 'src.outbox_relay'
+    and application starts without broker
+    """
+    config = providers.Configuration()
+    async_session = providers.Dependency()
+
+    # connection to interface
+    rabbitmq_channel_pool = providers.Resource(
+        get_rabbitmq_channel_pool,
+        rabbitmq_settings=config.RABBITMQ
+    )
+    rabbitmq_topology = providers.Resource(
+        get_rabbitmq_topology,
+        channel_pool=rabbitmq_channel_pool,
+        base_dir=config.BASE_DIR,
+        rabbitmq_settings=config.RABBITMQ
+    )
+    outbox_listener = providers.Factory(
+        PostgresNotificationListener,
+        dsn=providers.Callable(get_sync_postgres_url, postgres_settings=config.POSTGRES),
+        channel=OutboxRepository.channel_name
+    )
+
+    # uow
+    rabbitmq_uow = providers.Factory(
+        RabbitmqUOW,
+        channel_pool=rabbitmq_channel_pool,
+        topology=rabbitmq_topology
+    )
+    outbox_repository_uow = providers.Factory(
+        OutboxRepositoryUOW,
+        async_session=async_session
+    )
+
+    # use case
+    outbox_relay = providers.Resource(
+        get_outbox_relay,
+        relay=providers.Factory(
+            OutboxRelay,
+            config=config,
+            listener=outbox_listener,
+            broker_uow=rabbitmq_uow,
+            repository_uow=outbox_repository_uow
+        )
+    )
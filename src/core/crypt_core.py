@@ -0,0 +1,23 @@
+import typing as tp
+
+from src.infrastructure.password_hasher import ProcessPoolPasswordHasher
+
+from .metrics_core import (
+    metrics,
+    PASSWORD_HASHER_PENDING_NAME
+)
+
+
+def get_password_hasher(schemes: str,
+                        rounds: tp.Optional[int],
+                        max_workers: tp.Optional[int],
+                        max_queue_size: int) -> tp.Iterator[ProcessPoolPasswordHasher]:
+    hasher = ProcessPoolPasswordHasher(
+        schemes=schemes,
+        rounds=rounds,
+        max_workers=max_workers,
+        max_queue_size=max_queue_size
+    )
+    metrics.gauge(PASSWORD_HASHER_PENDING_NAME, 'Count of pending hash calls', lambda: hasher.pending)
+    yield hasher
+    hasher.close()
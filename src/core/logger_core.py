@@ -0,0 +1,200 @@
+import queue
+import hashlib
+import logging
+import threading
+import time
+import typing as tp
+from datetime import (
+    datetime,
+    timezone
+)
+
+import orjson
+
+
+class LineBucket:
+    """
+    Token bucket of log lines, it's refilled by 'lines_per_second' tokens
+    per second up to 'lines_per_second' tokens
+    """
+    def __init__(self,
+                 lines_per_second: float,
+                 clock: tp.Callable[[], float]):
+        self.lines_per_second = lines_per_second
+        self.clock = clock
+        self.tokens = lines_per_second
+        self.updated = clock()
+
+    def take(self) -> bool:
+        now = self.clock()
+        self.tokens = min(self.lines_per_second, self.tokens + (now - self.updated) * self.lines_per_second)
+        self.updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class LogSampler:
+    """
+    Decide if access log record is written, how it works:
+    1. Errors (status 500 and more) and requests longer than 'slow_time'
+       seconds are always logged
+    2. Other requests are sampled by rate of route template from 'route_rates'
+       or by default 'rate'. Sampling is head-based: hash of request id is
+       compared with rate, so request is logged by every service or by none
+    3. Sampled record takes token from bucket with 'lines_per_second' tokens
+       per second, if bucket is empty, then record is dropped, so log storm
+       doesn't increase load
+    4. Errors and slow requests take tokens from reserved bucket with
+       'important_lines_per_second' tokens per second, so sampled records
+       don't crowd them out. Dropped records are counted in 'rate_limited'
+       and 'important_rate_limited'
+    """
+    def __init__(self,
+                 rate: float,
+                 route_rates: tp.Dict[str, float],
+                 slow_time: float,
+                 lines_per_second: float,
+                 important_lines_per_second: float,
+                 clock: tp.Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.route_rates = route_rates
+        self.slow_time = slow_time
+        self.bucket = LineBucket(lines_per_second, clock)
+        self.important_bucket = LineBucket(important_lines_per_second, clock)
+        self.sampled_out = 0
+        self.rate_limited = 0
+        self.important_rate_limited = 0
+
+    def should_log(self,
+                   request_id: str,
+                   route: tp.Optional[str],
+                   status_code: tp.Optional[int],
+                   latency: float) -> bool:
+        important = status_code is None or status_code >= 500 or latency >= self.slow_time
+        if important:
+            if not self.important_bucket.take():
+                self.important_rate_limited += 1
+                return False
+            return True
+
+        if not self._sample(request_id, self.route_rates.get(route, self.rate)):
+            self.sampled_out += 1
+            return False
+
+        if not self.bucket.take():
+            self.rate_limited += 1
+            return False
+        return True
+
+    @staticmethod
+    def _sample(request_id: str, rate: float) -> bool:
+        if rate >= 1:
+            return True
+        if rate <= 0:
+            return False
+        digest = hashlib.blake2b(request_id.encode(), digest_size=8).digest()
+        return int.from_bytes(digest, 'big') < rate * 2 ** 64
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Format record as one json line, if message of record is dict, then its
+    keys are fields of the line, else text is saved in field 'message'
+    """
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            '@timestamp': datetime.fromtimestamp(record.created, timezone.utc),
+            'level': record.levelname,
+            'logger': record.name
+        }
+        if isinstance(record.msg, dict):
+            data.update(record.msg)
+        else:
+            data['message'] = record.getMessage()
+        if record.exc_info:
+            data['exc_info'] = self.formatException(record.exc_info)
+        return orjson.dumps(data, default=str).decode()
+
+
+class BatchFileHandler(logging.Handler):
+    """
+    Log handler, which doesn't block the event loop, how it works:
+    1. 'emit' puts record in bounded queue without waiting, if queue is full,
+       then record is dropped and counted in 'dropped'
+    2. Background thread formats records and keeps them in buffer
+    3. Buffer is written to file by one 'write', when it has 'batch_size'
+       records or 'flush_interval' seconds have passed since the first record
+    4. 'close' writes all queued records and stops the thread
+    """
+    def __init__(self,
+                 filename: str,
+                 queue_size: int,
+                 batch_size: int,
+                 flush_interval: float):
+        super().__init__()
+        self.filename = filename
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue: queue.Queue = queue.Queue(queue_size)
+        self.emitted = 0
+        self.dropped = 0
+        self.written = 0
+        self.thread = threading.Thread(target=self._write_loop, name=f'log-writer-{filename}', daemon=True)
+        self.thread.start()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+            self.emitted += 1
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self) -> None:
+        if self.thread.is_alive():
+            # sentinel is put with waiting, so it isn't dropped
+            self.queue.put(None)
+            self.thread.join()
+        super().close()
+
+    def _write_loop(self) -> None:
+        with open(self.filename, 'a', encoding='utf-8') as stream:
+            buffer: tp.List[str] = []
+            deadline = None
+            while True:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    record = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    buffer = self._write(stream, buffer)
+                    deadline = None
+                    continue
+
+                if record is None:
+                    self._write(stream, buffer)
+                    return
+
+                try:
+                    buffer.append(self.format(record))
+                except Exception:
+                    self.handleError(record)
+
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(buffer) >= self.batch_size:
+                    buffer = self._write(stream, buffer)
+                    deadline = None
+
+    def _write(self, stream: tp.TextIO, buffer: tp.List[str]) -> tp.List[str]:
+        """
+        Write buffer by one call, return new empty buffer
+        """
+        if buffer:
+            try:
+                stream.write('\n'.join(buffer) + '\n')
+                stream.flush()
+                self.written += len(buffer)
+            except OSError:
+                self.dropped += len(buffer)
+        return []
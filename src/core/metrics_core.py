@@ -0,0 +1,357 @@
+import os
+import time
+import fcntl
+import asyncio
+import logging
+import typing as tp
+from contextlib import contextmanager
+
+import orjson
+from prometheus_client import (
+    CollectorRegistry,
+    generate_latest
+)
+from prometheus_client.core import (
+    CounterMetricFamily,
+    GaugeMetricFamily,
+    HistogramMetricFamily
+)
+
+from .timing_core import (
+    DEFAULT_BUCKETS,
+    Histogram,
+    stage_histograms
+)
+
+
+logger = logging.getLogger(__name__)
+
+STAGE_DURATION_NAME = 'petchat_stage_duration_seconds'
+HTTP_REQUEST_DURATION_NAME = 'petchat_http_request_duration_seconds'
+RATE_LIMITER_DECISIONS_NAME = 'petchat_rate_limiter_decisions_total'
+PASSWORD_HASHER_PENDING_NAME = 'petchat_password_hasher_pending'
+DB_POOL_CHECKED_OUT_NAME = 'petchat_db_pool_checked_out'
+REDIS_POOL_IN_USE_NAME = 'petchat_redis_pool_in_use'
+REDIS_POOL_CONNECTIONS_NAME = 'petchat_redis_pool_connections'
+RABBITMQ_CHANNELS_IN_USE_NAME = 'petchat_rabbitmq_channels_in_use'
+
+
+class MetricsRegistry:
+    """
+    Metrics of the worker, they are recorded in process without locks and
+    files, so recording costs only dict lookup and addition. Durations of
+    stages are taken from 'stage_histograms' of timing_core
+    """
+    def __init__(self, buckets: tp.Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        # name -> (type, documentation, label names)
+        self.descriptions: tp.Dict[str, tp.Tuple[str, str, tp.Tuple[str, ...]]] = {
+            STAGE_DURATION_NAME: ('histogram', 'Duration of request stages', ('stage',))
+        }
+        self.counters: tp.Dict[tp.Tuple[str, tp.Tuple[str, ...]], float] = {}
+        self.histograms: tp.Dict[tp.Tuple[str, tp.Tuple[str, ...]], Histogram] = {}
+        self.gauges: tp.Dict[str, tp.Callable[[], float]] = {}
+
+    def counter(self, name: str, documentation: str, labelnames: tp.Tuple[str, ...] = ()) -> None:
+        self.descriptions[name] = ('counter', documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: tp.Tuple[str, ...] = ()) -> None:
+        self.descriptions[name] = ('histogram', documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, func: tp.Callable[[], float]) -> None:
+        self.descriptions[name] = ('gauge', documentation, ())
+        self.gauges[name] = func
+
+    def inc(self, name: str, labels: tp.Tuple[str, ...] = (), value: float = 1) -> None:
+        key = (name, labels)
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, labels: tp.Tuple[str, ...], value: float) -> None:
+        key = (name, labels)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram(self.buckets)
+        histogram.observe(value)
+
+    def snapshot(self, with_gauges: bool = True) -> dict:
+        histograms = [
+            [name, labels, list(histogram.counts), histogram.sum]
+            for (name, labels), histogram in self.histograms.items()
+        ]
+        histograms.extend(
+            [STAGE_DURATION_NAME, (stage,), list(histogram.counts), histogram.sum]
+            for stage, histogram in stage_histograms.histograms.items()
+        )
+        gauges = []
+        if with_gauges:
+            for name, func in self.gauges.items():
+                try:
+                    gauges.append([name, func()])
+                except Exception as e:
+                    logger.error('gauge %s failed: %s', name, e)
+        return {
+            'buckets': self.buckets,
+            'descriptions': self.descriptions,
+            'counters': [[name, labels, value] for (name, labels), value in self.counters.items()],
+            'histograms': histograms,
+            'gauges': gauges
+        }
+
+
+metrics = MetricsRegistry()
+metrics.histogram(
+    HTTP_REQUEST_DURATION_NAME,
+    'Duration of HTTP requests by route template',
+    ('method', 'route', 'status')
+)
+metrics.counter(
+    RATE_LIMITER_DECISIONS_NAME,
+    'Decisions of rate limiter, source is local bucket or memory storage',
+    ('policy', 'decision', 'source')
+)
+
+
+class MultiprocessCollector:
+    """
+    Collector of snapshots of all workers, counters and histograms are summed,
+    gauges are labeled by pid of worker. The first snapshot is snapshot of the
+    worker, snapshots with other histogram buckets are skipped
+    """
+    def __init__(self, snapshots: tp.List[tp.Tuple[int, dict]]):
+        self.snapshots = snapshots
+
+    def collect(self) -> tp.Iterator:
+        descriptions, counters, histograms, gauges = {}, {}, {}, []
+        buckets = list(self.snapshots[0][1]['buckets'])
+        for pid, snapshot in self.snapshots:
+            if list(snapshot['buckets']) != buckets:
+                logger.error('metrics snapshot of %s has other buckets', pid)
+                continue
+            descriptions.update(snapshot['descriptions'])
+            for name, labels, value in snapshot['counters']:
+                key = (name, tuple(labels))
+                counters[key] = counters.get(key, 0) + value
+            for name, labels, counts, total in snapshot['histograms']:
+                key = (name, tuple(labels))
+                item = histograms.setdefault(key, [[0] * len(counts), 0.0])
+                item[0] = [a + b for a, b in zip(item[0], counts)]
+                item[1] += total
+            gauges.extend((name, str(pid), value) for name, value in snapshot['gauges'])
+
+        families = {}
+        for name, (metric_type, documentation, labelnames) in descriptions.items():
+            if metric_type == 'counter':
+                families[name] = CounterMetricFamily(name, documentation, labels=labelnames)
+            elif metric_type == 'histogram':
+                families[name] = HistogramMetricFamily(name, documentation, labels=labelnames)
+            else:
+                families[name] = GaugeMetricFamily(name, documentation, labels=['pid'])
+
+        for (name, labels), value in counters.items():
+            families[name].add_metric(labels, value)
+        for (name, labels), (counts, total) in histograms.items():
+            cumulative, value = [], 0
+            for bound, count in zip([*map(str, buckets), '+Inf'], counts):
+                value += count
+                cumulative.append((bound, value))
+            families[name].add_metric(labels, cumulative, total)
+        for name, pid, value in gauges:
+            families[name].add_metric([pid], value)
+
+        yield from families.values()
+
+
+def merge_snapshots(aggregate: tp.Optional[dict], snapshot: dict) -> tp.Optional[dict]:
+    """
+    Add counters and histograms of snapshot to aggregate snapshot, gauges are
+    dropped. Snapshot with other histogram buckets can't be added, it's lost
+    """
+    if aggregate is None:
+        aggregate = {
+            'buckets': snapshot['buckets'],
+            'descriptions': {},
+            'counters': [],
+            'histograms': [],
+            'gauges': []
+        }
+    if list(aggregate['buckets']) != list(snapshot['buckets']):
+        logger.error('metrics snapshot with other buckets is not merged')
+        return aggregate
+
+    descriptions = {**aggregate['descriptions'], **snapshot['descriptions']}
+    counters = {(name, tuple(labels)): value for name, labels, value in aggregate['counters']}
+    for name, labels, value in snapshot['counters']:
+        key = (name, tuple(labels))
+        counters[key] = counters.get(key, 0) + value
+    histograms = {(name, tuple(labels)): [counts, total] for name, labels, counts, total in aggregate['histograms']}
+    for name, labels, counts, total in snapshot['histograms']:
+        item = histograms.setdefault((name, tuple(labels)), [[0] * len(counts), 0.0])
+        item[0] = [a + b for a, b in zip(item[0], counts)]
+        item[1] += total
+
+    return {
+        'buckets': aggregate['buckets'],
+        'descriptions': descriptions,
+        'counters': [[name, labels, value] for (name, labels), value in counters.items()],
+        'histograms': [[name, labels, counts, total] for (name, labels), (counts, total) in histograms.items()],
+        'gauges': []
+    }
+
+
+class MetricsExporter:
+    """
+    Exporter of metrics of workers, how it works:
+    1. Every 'interval' seconds snapshot of 'metrics' of the worker is written
+       to file '<pid>.json' of 'directory', file is replaced atomically
+    2. Endpoint '/v1/metrics' reads snapshots of other workers from files,
+       takes current snapshot of the worker and renders them together
+    3. On stop the last snapshot is written without gauges, so counters of
+       stopped worker are kept, but its gauges aren't exported
+    4. Snapshot is stale, if its worker isn't alive and file hasn't been
+       updated for 'stale_intervals' intervals. On start and by render stale
+       snapshots are folded into snapshot 'dead.json' and removed, so files
+       of dead workers don't accumulate, but counters and histograms never
+       go down and prometheus doesn't see reset of counter
+    5. Folding and reading of files are done under exclusive lock of file
+       '.lock', so render doesn't see snapshot twice or miss it
+    """
+    aggregate_filename = 'dead.json'
+    lock_filename = '.lock'
+
+    def __init__(self,
+                 directory: str,
+                 interval: float,
+                 stale_intervals: int,
+                 registry: MetricsRegistry = metrics):
+        self.directory = directory
+        self.interval = interval
+        self.stale_time = stale_intervals * interval
+        self.registry = registry
+        self.pid = os.getpid()
+        self.task: tp.Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock():
+            self._fold_stale()
+        self.task = asyncio.create_task(self._write_loop())
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.wait([self.task])
+        self.write(self.registry.snapshot(with_gauges=False))
+
+    def write(self, snapshot: dict) -> None:
+        path = os.path.join(self.directory, f'{self.pid}.json')
+        self._write_file(path, snapshot)
+
+    def render(self, snapshot: dict) -> bytes:
+        """
+        Render metrics of all workers in prometheus text format, snapshot of
+        the worker is passed by caller, files are read in thread
+        """
+        snapshots = [(self.pid, snapshot)]
+        with self._lock():
+            self._fold_stale()
+            for filename in os.listdir(self.directory):
+                name, ext = os.path.splitext(filename)
+                if ext != '.json' or name == str(self.pid):
+                    continue
+                try:
+                    pid = 0 if filename == self.aggregate_filename else int(name)
+                    snapshots.append((pid, self._read_file(os.path.join(self.directory, filename))))
+                except (OSError, ValueError) as e:
+                    logger.error('metrics snapshot %s is skipped: %s', filename, e)
+
+        registry = CollectorRegistry(auto_describe=False)
+        registry.register(MultiprocessCollector(snapshots))
+        return generate_latest(registry)
+
+    def _fold_stale(self) -> None:
+        """
+        Add stale snapshots to aggregate snapshot and remove them, caller
+        holds lock
+        """
+        stale = [filename for filename in os.listdir(self.directory) if self._is_stale(filename)]
+        if not stale:
+            return
+
+        aggregate_path = os.path.join(self.directory, self.aggregate_filename)
+        aggregate = None
+        if os.path.exists(aggregate_path):
+            try:
+                aggregate = self._read_file(aggregate_path)
+            except (OSError, ValueError) as e:
+                logger.error('aggregate metrics snapshot is replaced: %s', e)
+        for filename in stale:
+            try:
+                aggregate = merge_snapshots(aggregate, self._read_file(os.path.join(self.directory, filename)))
+            except (OSError, ValueError) as e:
+                logger.error('stale metrics snapshot %s is not merged: %s', filename, e)
+
+        if aggregate is not None:
+            self._write_file(aggregate_path, aggregate)
+        for filename in stale:
+            os.remove(os.path.join(self.directory, filename))
+
+    def _is_stale(self, filename: str) -> bool:
+        name, ext = os.path.splitext(filename)
+        if ext != '.json' or not name.isdigit() or int(name) == self.pid or self._is_alive(int(name)):
+            return False
+        try:
+            return time.time() - os.path.getmtime(os.path.join(self.directory, filename)) >= self.stale_time
+        except OSError:
+            return False
+
+    @contextmanager
+    def _lock(self) -> tp.Iterator[None]:
+        with open(os.path.join(self.directory, self.lock_filename), 'a') as file:
+            fcntl.flock(file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _read_file(path: str) -> dict:
+        with open(path, 'rb') as file:
+            return orjson.loads(file.read())
+
+    @staticmethod
+    def _write_file(path: str, snapshot: dict) -> None:
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'wb') as file:
+            file.write(orjson.dumps(snapshot))
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _is_alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    async def _write_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            snapshot = self.registry.snapshot()
+            try:
+                await asyncio.to_thread(self.write, snapshot)
+            except OSError as e:
+                logger.error('metrics snapshot is not written: %s', e)
+
+
+async def get_metrics_exporter(base_dir: str,
+                               directory: str,
+                               interval: float,
+                               stale_intervals: int) -> tp.AsyncIterator[MetricsExporter]:
+    exporter = MetricsExporter(directory=os.path.join(base_dir, directory),
+                               interval=interval,
+                               stale_intervals=stale_intervals)
+    await exporter.start()
+    yield exporter
+    await exporter.stop()
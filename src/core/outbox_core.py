@@ -0,0 +1,9 @@
+import typing as tp
+
+from src.services.use_case import OutboxRelay
+
+
+async def get_outbox_relay(relay: OutboxRelay) -> tp.AsyncIterator[OutboxRelay]:
+    await relay.start()
+    yield relay
+    await relay.stop()
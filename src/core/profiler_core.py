@@ -0,0 +1,72 @@
+import os
+import random
+import signal
+import asyncio
+import threading
+import typing as tp
+from collections import Counter
+
+
+class StackSampler:
+    """
+    Statistical profiler of the worker, how it works:
+    1. 'profile' starts timer of CPU time, signal SIGPROF is sent every
+       'interval' seconds, while 'duration' seconds pass
+    2. Requests are sampled by ProfilerMiddleware with probability 'fraction',
+       signal handler counts stack of interrupted frame only if task of
+       sampled request is running
+    3. Counted stacks are returned in collapsed format 'frame;frame;frame count',
+       which is read by flamegraph.pl and speedscope
+    Signal handler is called in the event loop thread, so the event loop has to
+    run in the main thread. If profiler isn't running, then there are no timer
+    and handler, middleware checks only 'running'
+    """
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.running = False
+        self.fraction = 1.0
+        self.tasks: tp.Set[asyncio.Task] = set()
+        self.stacks: tp.Counter[str] = Counter()
+
+    def is_sampled(self) -> bool:
+        return random.random() < self.fraction
+
+    async def profile(self, duration: float, fraction: float) -> str:
+        if self.running:
+            raise RuntimeError('profiler is already running')
+        if threading.current_thread() is not threading.main_thread():
+            raise RuntimeError('profiler runs only in the main thread')
+
+        self.running = True
+        self.fraction = fraction
+        self.stacks = Counter()
+        previous_handler = signal.signal(signal.SIGPROF, self._on_signal)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, previous_handler)
+            self.running = False
+            self.tasks.clear()
+        return self.collapse()
+
+    def collapse(self) -> str:
+        return ''.join(f'{stack} {count}\n' for stack, count in self.stacks.most_common())
+
+    def _on_signal(self, signum: int, frame) -> None:
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            return
+        if task is not None and task in self.tasks:
+            self.stacks[self._collapse_frame(frame)] += 1
+
+    @staticmethod
+    def _collapse_frame(frame) -> str:
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f'{os.path.basename(code.co_filename)}:{code.co_qualname}')
+            frame = frame.f_back
+        return ';'.join(reversed(names))
@@ -1,4 +1,22 @@
+import os
+import logging
+import typing as tp
+
 from aio_pika import connect_robust
+from aio_pika.abc import AbstractRobustConnection
+
+from src.infrastructure.broker import (
+    RabbitmqTopology,
+    RabbitmqChannelPool
+)
+
+from .metrics_core import (
+    metrics,
+    RABBITMQ_CHANNELS_IN_USE_NAME
+)
+
+
+logger = logging.getLogger(__name__)
 
 
 def get_rabbitmq_url(rabbitmq_settings: dict):
@@ -6,6 +24,53 @@ def get_rabbitmq_url(rabbitmq_settings: dict):
            '{RABBITMQ_HOST}:{RABBITMQ_PORT}/'.format(**rabbitmq_settings)
 
 
-async def get_rabbitmq_channel(rabbitmq_settings: dict):
-    connect = await connect_robust(get_rabbitmq_url(rabbitmq_settings))
-    return await connect.channel(publisher_confirms=False)
+def on_reconnect(connection: AbstractRobustConnection) -> None:
+    logger.warning('rabbitmq connection is restored')
+
+
+async def get_rabbitmq_channel_pool(rabbitmq_settings: dict) -> tp.AsyncIterator[RabbitmqChannelPool]:
+    """
+    One robust connection of the worker and pool of its channels, connection
+    is opened on startup and closed on shutdown
+    """
+    connection = await connect_robust(get_rabbitmq_url(rabbitmq_settings))
+    connection.reconnect_callbacks.add(on_reconnect)
+    pool = RabbitmqChannelPool(
+        connection=connection,
+        max_size=rabbitmq_settings['RABBITMQ_CHANNEL_POOL_SIZE'],
+        timeout=rabbitmq_settings['RABBITMQ_CHANNEL_TIMEOUT']
+    )
+    metrics.gauge(RABBITMQ_CHANNELS_IN_USE_NAME, 'Count of used rabbitmq channels', lambda: pool.in_use)
+    yield pool
+    await pool.close()
+    await connection.close()
+
+
+async def get_rabbitmq_topology(channel_pool: RabbitmqChannelPool,
+                                base_dir: str,
+                                rabbitmq_settings: dict) -> tp.AsyncIterator[RabbitmqTopology]:
+    """
+    Topology of broker, it's declared on startup and after every reconnect
+    of connection, so publishers don't declare queues
+    """
+    topology = RabbitmqTopology.from_file(
+        os.path.join(base_dir, rabbitmq_settings['RABBITMQ_TOPOLOGY_FILE'])
+    )
+
+    async def declare() -> None:
+        channel = await channel_pool.acquire()
+        try:
+            await topology.declare(channel)
+        finally:
+            await channel_pool.release(channel)
+
+    async def redeclare(connection: AbstractRobustConnection) -> None:
+        try:
+            await declare()
+        except Exception as e:
+            logger.error('rabbitmq topology is not declared: %s', e)
+
+    await declare()
+    channel_pool.connection.reconnect_callbacks.add(redeclare)
+    yield topology
+    channel_pool.connection.reconnect_callbacks.discard(redeclare)
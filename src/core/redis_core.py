@@ -1,4 +1,51 @@
-from redis.asyncio import from_url
+import time
+import typing as tp
+
+from redis.asyncio import (
+    Redis,
+    BlockingConnectionPool,
+    from_url
+)
+
+from src.infrastructure.memory_storage import (
+    RedisScripts,
+    RedisRevocationFilter
+)
+
+from .metrics_core import (
+    metrics,
+    REDIS_POOL_IN_USE_NAME,
+    REDIS_POOL_CONNECTIONS_NAME
+)
+from .timing_core import observe
+
+
+class TimedBlockingConnectionPool(BlockingConnectionPool):
+    """
+    Pool, which observes waiting for connection as stage 'redis.pool_checkout'
+    and counts created and used connections
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.created_connections = 0
+        self.in_use_connections = 0
+
+    def make_connection(self):
+        self.created_connections += 1
+        return super().make_connection()
+
+    async def get_connection(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            connection = await super().get_connection(*args, **kwargs)
+        finally:
+            observe('redis.pool_checkout', time.perf_counter() - start)
+        self.in_use_connections += 1
+        return connection
+
+    async def release(self, connection) -> None:
+        self.in_use_connections -= 1
+        await super().release(connection)
 
 
 def get_redis_url(redis_settings: dict) -> str:
@@ -7,3 +54,48 @@ def get_redis_url(redis_settings: dict) -> str:
 
 def get_async_redis_client(redis_settings: dict):
     return from_url(get_redis_url(redis_settings))
+
+
+async def get_redis_client(redis_settings: dict) -> tp.AsyncIterator[Redis]:
+    """
+    Client with one connection pool of the worker, pool is closed on shutdown.
+    If all 'REDIS_MAX_CONNECTIONS' are used, then command waits for connection
+    up to 'REDIS_POOL_TIMEOUT' seconds
+    """
+    pool = TimedBlockingConnectionPool.from_url(
+        get_redis_url(redis_settings),
+        max_connections=redis_settings['REDIS_MAX_CONNECTIONS'],
+        timeout=redis_settings['REDIS_POOL_TIMEOUT'],
+        health_check_interval=redis_settings['REDIS_HEALTH_CHECK_INTERVAL'],
+        socket_timeout=redis_settings['REDIS_SOCKET_TIMEOUT'],
+        socket_connect_timeout=redis_settings['REDIS_SOCKET_CONNECT_TIMEOUT']
+    )
+    metrics.gauge(REDIS_POOL_IN_USE_NAME, 'Count of used redis connections', lambda: pool.in_use_connections)
+    metrics.gauge(REDIS_POOL_CONNECTIONS_NAME, 'Count of created redis connections', lambda: pool.created_connections)
+    redis = Redis(connection_pool=pool)
+    yield redis
+    await redis.aclose()
+    await pool.disconnect()
+
+
+async def get_revocation_filter(redis: Redis,
+                                capacity: int,
+                                error_rate: float,
+                                resync_time: int,
+                                generation_ttl: float) -> tp.AsyncIterator[RedisRevocationFilter]:
+    revocation_filter = RedisRevocationFilter(
+        redis=redis,
+        capacity=capacity,
+        error_rate=error_rate,
+        resync_time=resync_time,
+        generation_ttl=generation_ttl
+    )
+    await revocation_filter.start()
+    yield revocation_filter
+    await revocation_filter.stop()
+
+
+async def get_redis_scripts(redis: Redis) -> tp.AsyncIterator[RedisScripts]:
+    scripts = RedisScripts(redis)
+    await scripts.load()
+    yield scripts
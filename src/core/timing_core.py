@@ -0,0 +1,142 @@
+import time
+import bisect
+import inspect
+import functools
+import typing as tp
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+# upper bounds of histogram buckets in seconds
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+class Histogram:
+    """
+    Count of durations by buckets, sum and count of all durations
+    """
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets: tp.Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        # the last count is bucket '+Inf'
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """
+        Upper bound of bucket, which contains quantile 'q'
+        """
+        rank = q * self.count
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            if total >= rank:
+                return bound
+        return float('inf')
+
+
+class StageHistograms:
+    """
+    Histograms of durations of stages in the worker
+    """
+    def __init__(self, buckets: tp.Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.histograms: tp.Dict[str, Histogram] = {}
+
+    def observe(self, stage: str, value: float) -> None:
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            histogram = self.histograms[stage] = Histogram(self.buckets)
+        histogram.observe(value)
+
+    def clear(self) -> None:
+        self.histograms.clear()
+
+
+class StageTimings:
+    """
+    Sum and count of durations of every stage of one request
+    """
+    __slots__ = ('stages',)
+
+    def __init__(self):
+        self.stages: tp.Dict[str, tp.List[float]] = {}
+
+    def add(self, stage: str, value: float) -> None:
+        item = self.stages.get(stage)
+        if item is None:
+            self.stages[stage] = [value, 1]
+        else:
+            item[0] += value
+            item[1] += 1
+
+    def server_timing(self) -> str:
+        """
+        Value of header 'Server-Timing', durations are in milliseconds
+        """
+        return ', '.join(
+            f'{stage};dur={value * 1000:.3f};desc="{count}"'
+            for stage, (value, count) in self.stages.items()
+        )
+
+    def as_dict(self) -> tp.Dict[str, float]:
+        return {stage: round(value * 1000, 3) for stage, (value, _) in self.stages.items()}
+
+
+stage_histograms = StageHistograms()
+request_timings: ContextVar[tp.Optional[StageTimings]] = ContextVar('request_timings', default=None)
+
+
+def observe(stage: str, value: float) -> None:
+    stage_histograms.observe(stage, value)
+    timings = request_timings.get()
+    if timings is not None:
+        timings.add(stage, value)
+
+
+@contextmanager
+def stage_timer(stage: str) -> tp.Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - start)
+
+
+def timed(stage: str) -> tp.Callable:
+    """
+    Decorator of coroutine function, duration of every call is observed as 'stage'
+    """
+    def decorator(func: tp.Callable) -> tp.Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                observe(stage, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def timed_methods(prefix: str) -> tp.Callable:
+    """
+    Decorator of class, every public coroutine method defined in class is
+    observed as stage '<prefix>.<method name>'
+    """
+    def decorator(cls: type) -> type:
+        for name, value in list(vars(cls).items()):
+            if not name.startswith('_') and inspect.iscoroutinefunction(value):
+                setattr(cls, name, timed(f'{prefix}.{name}')(value))
+        return cls
+    return decorator
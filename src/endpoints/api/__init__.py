@@ -2,13 +2,17 @@ from .v1 import (
     user_api,
     health_api,
     auth_api,
+    metrics_api,
+    admin_api
 )
 
 
 routers = [
     user_api.router,
     health_api.router,
-    auth_api.router
+    auth_api.router,
+    metrics_api.router,
+    admin_api.router
 ]
 
 
@@ -0,0 +1,37 @@
+from fastapi import (
+    APIRouter,
+    Depends,
+    Query
+)
+from fastapi.responses import PlainTextResponse
+from dependency_injector.wiring import (
+    inject,
+    Provide
+)
+
+from src.core.config import API
+from src.core.containers import Container
+from src.core.profiler_core import StackSampler
+from src.endpoints.dependencies import AdminUser
+from src.endpoints.exceptions import ServiceUnavailableHTTPException
+
+
+router = APIRouter(
+    tags=['admin']
+)
+
+
+@router.post(path=API.admin_profile_v1)
+@inject
+async def profile(admin_user: AdminUser,
+                  duration: float = Query(default=10, gt=0, le=60),
+                  fraction: float = Query(default=1, gt=0, le=1),
+                  sampler: StackSampler = Depends(Provide[Container.stack_sampler])):
+    """
+    Run profiler of the worker for 'duration' seconds, 'fraction' of requests
+    is sampled. Response is collapsed stacks for flamegraph
+    """
+    if sampler.running:
+        raise ServiceUnavailableHTTPException
+    stacks = await sampler.profile(duration, fraction)
+    return PlainTextResponse(content=stacks)
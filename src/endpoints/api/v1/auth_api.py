@@ -1,21 +1,36 @@
 
-from fastapi.responses import JSONResponse
+from fastapi.responses import (
+    Response,
+    JSONResponse
+)
 from fastapi import (
     APIRouter,
+    Request,
+    Depends,
     status
 )
-from dependency_injector.wiring import inject
+from dependency_injector.wiring import (
+    inject,
+    Provide
+)
 
 from src.core.config import API
+from src.core.containers import Container
 from src.endpoints.dependencies import (
     auth_depends,
-    AuthUser
+    key_ring_depends,
+    AuthUser,
+    IntrospectClient
 )
 from src.services.entities import (
     JWTToken,
     LoginType,
-    JWTRefreshToken
+    JWTRefreshToken,
+    JWTIntrospectRequest,
+    JWTIntrospectResult,
+    JWTIntrospectResponse
 )
+from src.endpoints.exceptions import AbstractHTTPException
 
 
 router = APIRouter(tags=['auth'])
@@ -48,3 +63,36 @@ async def logout(jwt_token: JWTToken,
         content={'msg': 'successful logout'},
         status_code=status.HTTP_200_OK
     )
+
+
+@router.post(path=API.auth_introspect_v1,
+             response_model=JWTIntrospectResponse)
+@inject
+async def introspect(data: JWTIntrospectRequest,
+                     client: IntrospectClient,
+                     auth_service=auth_depends):
+    results = []
+    for result in await auth_service.verify_tokens(data.tokens):
+        if isinstance(result, AbstractHTTPException):
+            results.append(JWTIntrospectResult(active=False, detail=result.detail_message))
+        else:
+            results.append(JWTIntrospectResult(active=True, user_id=result.user_id, exp=result.exp))
+    return JWTIntrospectResponse(results=results)
+
+
+@router.get(path=API.jwks)
+@inject
+async def jwks(request: Request,
+               key_ring=key_ring_depends,
+               max_age: int = Depends(Provide[Container.config.JWKS_MAX_AGE])):
+    headers = {
+        'Cache-Control': f'public, max-age={max_age}',
+        'ETag': key_ring.jwks_etag
+    }
+    if request.headers.get('if-none-match') == key_ring.jwks_etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(
+        content=key_ring.jwks_json,
+        media_type='application/json',
+        headers=headers
+    )
@@ -0,0 +1,28 @@
+from fastapi import (
+    APIRouter,
+    Depends,
+    Response
+)
+from fastapi.concurrency import run_in_threadpool
+from prometheus_client import CONTENT_TYPE_LATEST
+from dependency_injector.wiring import (
+    inject,
+    Provide
+)
+
+from src.core.config import API
+from src.core.containers import Container
+from src.core.metrics_core import MetricsExporter
+
+
+router = APIRouter(
+    tags=['metrics']
+)
+
+
+@router.get(path=API.metrics_v1, include_in_schema=False)
+@inject
+async def get_metrics(exporter: MetricsExporter = Depends(Provide[Container.metrics_exporter])):
+    snapshot = exporter.registry.snapshot()
+    content = await run_in_threadpool(exporter.render, snapshot)
+    return Response(content=content, headers={'Content-Type': CONTENT_TYPE_LATEST})
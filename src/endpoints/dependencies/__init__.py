@@ -1,12 +1,18 @@
 from .dependencies import (
     user_depends,
     auth_depends,
-    AuthUser
+    key_ring_depends,
+    AuthUser,
+    AdminUser,
+    IntrospectClient
 )
 
 
 __all__ = [
     'user_depends',
     'auth_depends',
-    'AuthUser'
+    'key_ring_depends',
+    'AuthUser',
+    'AdminUser',
+    'IntrospectClient'
 ]
@@ -7,8 +7,13 @@ from fastapi import Depends
 from dependency_injector.wiring import Provide
 
 from src.core.containers import Container
-from src.endpoints.middlewares import AuthMiddleware
+from src.endpoints.middlewares import (
+    AuthMiddleware,
+    AdminMiddleware,
+    IntrospectClientMiddleware
+)
 from src.services.entities import JWTPayload
+from src.services.abstract_interface import AbstractKeyRing
 from src.services.use_case import (
     UserService,
     AuthService
@@ -19,4 +24,10 @@ user_depends: UserService = Depends(Provide[Container.user_service])
 
 auth_depends: AuthService = Depends(Provide[Container.auth_service])
 
+key_ring_depends: AbstractKeyRing = Depends(Provide[Container.key_ring])
+
 AuthUser = Annotated[Tuple[str, JWTPayload], Depends(AuthMiddleware())]
+
+AdminUser = Annotated[Tuple[str, JWTPayload], Depends(AdminMiddleware())]
+
+IntrospectClient = Annotated[str, Depends(IntrospectClientMiddleware())]
@@ -1,3 +1,4 @@
+from .abstract_exception import AbstractHTTPException
 from .bad_request_exception import (
     BadRequestHTTPException,
     TokenTypeInvalidHTTPException,
@@ -13,14 +14,19 @@ from .bad_request_exception import (
     UsernameBusyHTTPException
 )
 from .many_request_exception import ManyRequestsHTTPException
+from .service_unavailable_exception import ServiceUnavailableHTTPException
 from .duplicate_exception import (
     DuplicateUserEmailHTTPException,
     DuplicateUserUsernameHTTPException
 )
 from .unauthorized_exception import UnauthorizedHTTPException
+from .forbidden_exception import ForbiddenHTTPException
+from .exception_handlers import exception_handlers
 
 
 __all__ = [
+    'exception_handlers',
+    'AbstractHTTPException',
     'BadRequestHTTPException',
     'TokenTypeInvalidHTTPException',
     'TokenExpiredHTTPException',
@@ -33,8 +39,10 @@ __all__ = [
     'EmailBusyHTTPException',
     'UsernameBusyHTTPException',
     'ManyRequestsHTTPException',
+    'ServiceUnavailableHTTPException',
     'DuplicateUserEmailHTTPException',
     'DuplicateUserUsernameHTTPException',
     'UnauthorizedHTTPException',
+    'ForbiddenHTTPException',
     'InvalidLinkHTTPException'
 ]
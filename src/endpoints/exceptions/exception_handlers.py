@@ -0,0 +1,19 @@
+from fastapi import Request
+from fastapi.responses import Response
+from fastapi.exception_handlers import http_exception_handler
+
+from src.services.abstract_interface import PasswordHasherBusyError
+from .service_unavailable_exception import ServiceUnavailableHTTPException
+
+
+async def service_unavailable_handler(request: Request, exc: Exception) -> Response:
+    """
+    Errors of overloaded services are answered by '503' like
+    ServiceUnavailableHTTPException
+    """
+    return await http_exception_handler(request, ServiceUnavailableHTTPException())
+
+
+exception_handlers = {
+    PasswordHasherBusyError: service_unavailable_handler
+}
@@ -0,0 +1,8 @@
+from fastapi import status
+
+from .abstract_exception import AbstractHTTPException
+
+
+class ForbiddenHTTPException(AbstractHTTPException):
+    status_code: int = status.HTTP_403_FORBIDDEN
+    detail_message = 'Permission denied!'
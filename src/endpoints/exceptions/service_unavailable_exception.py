@@ -0,0 +1,9 @@
+from fastapi import status
+
+from .abstract_exception import AbstractHTTPException
+
+
+class ServiceUnavailableHTTPException(AbstractHTTPException):
+    status_code: int = status.HTTP_503_SERVICE_UNAVAILABLE
+    detail_message = 'Service is busy, try again later!'
+    headers = {'Retry-After': '1'}
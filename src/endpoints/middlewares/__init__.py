@@ -1,14 +1,28 @@
 from .rate_limiter_middleware import RateLimiterMiddleware
-from .auth_middleware import AuthMiddleware
+from .auth_middleware import (
+    AuthMiddleware,
+    AdminMiddleware,
+    IntrospectClientMiddleware
+)
 from .logger_middleware import LoggerMiddleware
+from .timing_middleware import TimingMiddleware
+from .profiler_middleware import ProfilerMiddleware
 
 
 middlewares = [
-    # RateLimiterMiddleware,
+    ProfilerMiddleware,
+    RateLimiterMiddleware,
+    TimingMiddleware,
     LoggerMiddleware
 ]
 
 __all__ = [
     'middlewares',
     'AuthMiddleware',
+    'AdminMiddleware',
+    'IntrospectClientMiddleware',
+    'LoggerMiddleware',
+    'RateLimiterMiddleware',
+    'TimingMiddleware',
+    'ProfilerMiddleware'
 ]
@@ -1,27 +1,92 @@
-from typing import Tuple
+import hmac
+from typing import (
+    Dict,
+    Tuple,
+    Optional
+)
 
-from fastapi import Depends
-from fastapi.security import OAuth2PasswordBearer
+from fastapi import (
+    Depends,
+    Request
+)
+from fastapi.security import (
+    HTTPBasic,
+    HTTPBasicCredentials,
+    OAuth2PasswordBearer
+)
 from dependency_injector.wiring import (
     inject,
     Provide
 )
 
 from src.core.containers import Container
+from src.endpoints.exceptions import UnauthorizedHTTPException
 from src.services.entities import JWTPayload
 from src.services.use_case import AuthService
 
 
 oauth2_schema = OAuth2PasswordBearer(tokenUrl='')
 
+optional_oauth2_schema = OAuth2PasswordBearer(tokenUrl='', auto_error=False)
+
+basic_schema = HTTPBasic(auto_error=False)
+
 
 class AuthMiddleware:
     @inject
     async def __call__(self,
+                       request: Request,
+                       auth_service: AuthService = Depends(Provide[Container.auth_service]),
+                       token: str = Depends(oauth2_schema)) -> Tuple[str, JWTPayload]:
+        """
+        The AuthMiddleware check token, user_id is saved in 'request.state'
+        for LoggerMiddleware
+        """
+        payload = await auth_service.verify_token(token)
+        request.state.user_id = payload.user_id
+        return token, payload
+
+
+class AdminMiddleware:
+    @inject
+    async def __call__(self,
+                       request: Request,
                        auth_service: AuthService = Depends(Provide[Container.auth_service]),
                        token: str = Depends(oauth2_schema)) -> Tuple[str, JWTPayload]:
         """
-        The AuthMiddleware check token
+        The AdminMiddleware check token like AuthMiddleware and check that
+        user is superuser
         """
         payload = await auth_service.verify_token(token)
+        request.state.user_id = payload.user_id
+        await auth_service.verify_superuser(payload.user_id)
         return token, payload
+
+
+class IntrospectClientMiddleware:
+    @inject
+    async def __call__(self,
+                       request: Request,
+                       auth_service: AuthService = Depends(Provide[Container.auth_service]),
+                       clients: Dict[str, str] = Depends(Provide[Container.config.INTROSPECT_CLIENTS]),
+                       credentials: Optional[HTTPBasicCredentials] = Depends(basic_schema),
+                       token: Optional[str] = Depends(optional_oauth2_schema)) -> str:
+        """
+        The IntrospectClientMiddleware authenticates caller of introspection:
+        1. Service sends client id and secret from 'INTROSPECT_CLIENTS' by
+           basic auth, secret is compared in constant time
+        2. Superuser sends access token like AdminMiddleware
+        3. Else call error 'Invalid client credentials!'
+        Client id or user id is returned
+        """
+        if credentials is not None:
+            secret = clients.get(credentials.username)
+            if secret is not None and hmac.compare_digest(secret.encode(), credentials.password.encode()):
+                return credentials.username
+        elif token is not None:
+            payload = await auth_service.verify_token(token)
+            request.state.user_id = payload.user_id
+            await auth_service.verify_superuser(payload.user_id)
+            return payload.user_id.hex
+        raise UnauthorizedHTTPException(detail_message='Invalid client credentials!',
+                                        headers={'WWW-Authenticate': 'Basic'})
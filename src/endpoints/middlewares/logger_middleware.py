@@ -1,43 +1,99 @@
 import os
+import time
+import uuid
 import logging
-from typing import Callable
+import typing as tp
 
-from starlette.middleware.base import StreamingResponse
 from fastapi import Request
+from starlette.types import (
+    ASGIApp,
+    Message,
+    Scope,
+    Receive,
+    Send
+)
 from dependency_injector.wiring import inject, Provide
 
 from src.core.containers import Container
+from src.core.logger_core import (
+    BatchFileHandler,
+    JSONFormatter,
+    LogSampler
+)
+
+
+REQUEST_ID_HEADER = 'x-request-id'
 
 
 class LoggerMiddleware:
     @inject
-    def __init__(self, config: dict = Provide[Container.config]):
+    def __init__(self,
+                 app: ASGIApp,
+                 config: dict = Provide[Container.config]):
+        self.app = app
         self.config = config
         self.http_log = logging.getLogger(config['HTTP_LOG_NAME'])
         self.business_logic_log = logging.getLogger(config['BUSINESS_LOGIC_LOG_NAME'])
+        self.sampler = LogSampler(
+            rate=config['LOG_SAMPLE_RATE'],
+            route_rates=config['LOG_SAMPLE_RATES'],
+            slow_time=config['LOG_SLOW_REQUEST_TIME'],
+            lines_per_second=config['LOG_LINES_PER_SECOND'],
+            important_lines_per_second=config['LOG_IMPORTANT_LINES_PER_SECOND']
+        )
         self.set_loggers()
 
-    async def __call__(self,
-                       request: Request,
-                       call_next: Callable):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Pure ASGI middleware, status code is taken from message
+        'http.response.start', response isn't wrapped. How it works:
+        1. Request id is taken from header 'X-Request-ID' or generated, it's
+           saved in 'request.state' and returned in response header
+        2. After response is sent, one json record with request id, route
+           template, latency, status and user_id is logged, user_id is saved
+           in 'request.state' by AuthMiddleware. Record is sampled and limited
+           by LogSampler, record is built only if it's logged. Durations of
+           stages are taken from TimingMiddleware
+        3. If application raises exception, then type of exception is logged
+        """
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        request = Request(scope)
+        request.state.request_id = self.get_request_id(request)
+        request_id_header = (REQUEST_ID_HEADER.encode(), request.state.request_id.encode())
+        status_code = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+                message['headers'] = [*message.get('headers', ()), request_id_header]
+            await send(message)
+
         try:
-            response: StreamingResponse = await call_next(request)
-            self.http_log.info(self.http_message_log(request, response))
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
-            self.business_logic_log.error(self.business_logic_message_log(request, e))
+            latency = time.perf_counter() - start
+            if self.sampler.should_log(request.state.request_id, self.get_route(request), None, latency):
+                self.business_logic_log.error(self.business_logic_message_log(request, e, latency))
             raise e
 
-        return response
+        latency = time.perf_counter() - start
+        if self.sampler.should_log(request.state.request_id, self.get_route(request), status_code, latency):
+            self.http_log.info(self.http_message_log(request, status_code, latency))
 
     def set_loggers(self) -> None:
-        formatter = logging.Formatter(
-            '"TIME": %(asctime)s - "LEVEL": %(levelname)s - %(message)s'
-        )
+        formatter = JSONFormatter()
 
         dir_path = os.path.join(self.config['BASE_DIR'], self.config['LOG_DIR'])
         if not os.path.exists(dir_path):
             os.mkdir(dir_path)
 
+        for handler in self.http_log.handlers + self.business_logic_log.handlers:
+            handler.close()
         self.http_log.handlers.clear()
         self.business_logic_log.handlers.clear()
 
@@ -45,36 +101,62 @@ class LoggerMiddleware:
         self.business_logic_log.setLevel(logging.ERROR)
 
         http_path = os.path.join(dir_path, self.config['HTTP_LOG_NAME'])
-        http_handler = logging.FileHandler(http_path)
+        http_handler = self.get_handler(http_path)
         http_handler.setFormatter(formatter)
 
         business_logic_path = os.path.join(dir_path, self.config['BUSINESS_LOGIC_LOG_NAME'])
-        business_logic_handler = logging.FileHandler(business_logic_path)
+        business_logic_handler = self.get_handler(business_logic_path)
         business_logic_handler.setFormatter(formatter)
 
         self.http_log.addHandler(http_handler)
         self.business_logic_log.addHandler(business_logic_handler)
 
+    def get_handler(self, path: str) -> BatchFileHandler:
+        return BatchFileHandler(
+            filename=path,
+            queue_size=self.config['LOG_QUEUE_SIZE'],
+            batch_size=self.config['LOG_BATCH_SIZE'],
+            flush_interval=self.config['LOG_FLUSH_INTERVAL']
+        )
+
     @staticmethod
-    def http_message_log(request: Request, response: StreamingResponse) -> str:
-        data = {
-            'IP': request.client.host,
-            'API': request.url.path,
-            'METHOD': request.method,
-            'PATH PARAMS': request.path_params,
-            'QUERY PARAMS': request.query_params,
-            'STATUS CODE': response.status_code
-        }
-        return ' - '.join([f'"{key}": {value}' for key, value in data.items()])
+    def get_request_id(request: Request) -> str:
+        request_id = request.headers.get(REQUEST_ID_HEADER)
+        if request_id and len(request_id) <= 64 and request_id.isascii():
+            return request_id
+        return uuid.uuid4().hex
 
     @staticmethod
-    def business_logic_message_log(request: Request, e: Exception):
-        data = {
-            'IP': request.client.host,
-            'API': request.url.path,
-            'METHOD': request.method,
-            'PATH PARAMS': request.path_params,
-            'QUERY PARAMS': request.query_params,
-            'exc': e
+    def get_route(request: Request) -> tp.Optional[str]:
+        route = request.scope.get('route')
+        return route.path if route is not None else None
+
+    @classmethod
+    def request_log(cls, request: Request, latency: float) -> tp.Dict[str, tp.Any]:
+        timings = getattr(request.state, 'timings', None)
+        return {
+            'request_id': request.state.request_id,
+            'ip': request.client.host if request.client else None,
+            'method': request.method,
+            'path': request.url.path,
+            'route': cls.get_route(request),
+            'path_params': request.path_params,
+            'query_params': dict(request.query_params),
+            'user_id': getattr(request.state, 'user_id', None),
+            'timings': timings.as_dict() if timings is not None else None,
+            'latency_ms': round(latency * 1000, 3)
         }
-        return ' - '.join([f'"{key}": {value}' for key, value in data.items()])
\ No newline at end of file
+
+    @classmethod
+    def http_message_log(cls, request: Request, status_code: int, latency: float) -> tp.Dict[str, tp.Any]:
+        data = cls.request_log(request, latency)
+        data['status'] = status_code
+        return data
+
+    @classmethod
+    def business_logic_message_log(cls, request: Request, e: Exception, latency: float) -> tp.Dict[str, tp.Any]:
+        data = cls.request_log(request, latency)
+        data['status'] = 500
+        data['exception'] = type(e).__name__
+        data['exception_message'] = str(e)
+        return data
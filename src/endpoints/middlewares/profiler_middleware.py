@@ -0,0 +1,37 @@
+import asyncio
+
+from starlette.types import (
+    ASGIApp,
+    Scope,
+    Receive,
+    Send
+)
+from dependency_injector.wiring import inject, Provide
+
+from src.core.containers import Container
+from src.core.profiler_core import StackSampler
+
+
+class ProfilerMiddleware:
+    @inject
+    def __init__(self,
+                 app: ASGIApp,
+                 sampler: StackSampler = Provide[Container.stack_sampler]):
+        self.app = app
+        self.sampler = sampler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Pure ASGI middleware, if profiler is running, then task of sampled
+        request is registered in StackSampler, else request is passed as is
+        """
+        if not self.sampler.running or scope['type'] != 'http' or not self.sampler.is_sampled():
+            await self.app(scope, receive, send)
+            return
+
+        task = asyncio.current_task()
+        self.sampler.tasks.add(task)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.sampler.tasks.discard(task)
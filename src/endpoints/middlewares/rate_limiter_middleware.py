@@ -1,7 +1,12 @@
-from typing import Callable
+import json
 
 from fastapi import Request
-from fastapi.responses import JSONResponse
+from starlette.types import (
+    ASGIApp,
+    Scope,
+    Receive,
+    Send
+)
 from dependency_injector.wiring import inject, Provide
 
 from src.core.containers import Container
@@ -9,17 +14,39 @@ from src.endpoints.exceptions import ManyRequestsHTTPException
 
 
 class RateLimiterMiddleware:
-    @inject
-    async def __call__(self,
-                       request: Request,
-                       call_next: Callable,
-                       rate_limiter_service=Provide[Container.rate_limiter_service]):
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Pure ASGI middleware, if client has exceeded allowed number of requests,
+        then response '429' is sent at once, without calling the application
+        """
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
         try:
-            await rate_limiter_service(request)
-            response = await call_next(request)
+            await self.check(Request(scope))
         except ManyRequestsHTTPException as e:
-            response = JSONResponse(e.detail, e.status_code, e.headers)
-        except Exception as e:
-            raise e
+            await self.send_error(send, e)
+            return
+
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    @inject
+    async def check(request: Request,
+                    rate_limiter_service=Provide[Container.rate_limiter_service]) -> None:
+        await rate_limiter_service(request)
 
-        return response
+    @staticmethod
+    async def send_error(send: Send, e: ManyRequestsHTTPException) -> None:
+        body = json.dumps(e.detail).encode()
+        headers = [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode())
+        ]
+        headers.extend((key.lower().encode(), value.encode()) for key, value in (e.headers or {}).items())
+        await send({'type': 'http.response.start', 'status': e.status_code, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': body})
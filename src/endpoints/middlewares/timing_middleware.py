@@ -0,0 +1,65 @@
+import time
+
+from starlette.types import (
+    ASGIApp,
+    Message,
+    Scope,
+    Receive,
+    Send
+)
+from dependency_injector.wiring import inject, Provide
+
+from src.core.containers import Container
+from src.core.metrics_core import (
+    metrics,
+    HTTP_REQUEST_DURATION_NAME
+)
+from src.core.timing_core import (
+    StageTimings,
+    request_timings
+)
+
+
+class TimingMiddleware:
+    @inject
+    def __init__(self,
+                 app: ASGIApp,
+                 config: dict = Provide[Container.config]):
+        self.app = app
+        self.server_timing = config['SERVER_TIMING']
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Pure ASGI middleware, durations of stages of request (db, redis, broker,
+        hash, uow) are collected in StageTimings. Timings are saved in
+        'request.state' for LoggerMiddleware and, if 'SERVER_TIMING' is enabled,
+        sent in header 'Server-Timing'. Duration of request is observed in
+        histogram by route template
+        """
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        timings = StageTimings()
+        scope.setdefault('state', {})['timings'] = timings
+        token = request_timings.set(timings)
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+                if self.server_timing and timings.stages:
+                    header = (b'server-timing', timings.server_timing().encode())
+                    message['headers'] = [*message.get('headers', ()), header]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_timings.reset(token)
+            # path of unmatched route isn't used as label, so count of series is limited
+            route = scope.get('route')
+            labels = (scope['method'], route.path if route is not None else 'unmatched', str(status_code))
+            metrics.observe(HTTP_REQUEST_DURATION_NAME, labels, time.perf_counter() - start)
@@ -0,0 +1,33 @@
+"""
+Make user superuser, superuser can call admin endpoints:
+
+    python -m src.grant_superuser --username <username>
+
+The flag isn't accepted from requests, so it's set only by this command
+"""
+import asyncio
+import argparse
+
+from src.core.config import get_config
+from src.core.containers import Container
+from src.services.entities import UserUsernameDTO
+
+
+async def main(username: str) -> None:
+    settings = get_config()
+    container = Container()
+    container.config.from_dict(settings.model_dump())
+
+    user_service = await container.user_service()
+    try:
+        user = await user_service.grant_superuser(UserUsernameDTO(username=username))
+        print(f'user {user.username} ({user.id}) is superuser')
+    finally:
+        await container.shutdown_resources()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Make user superuser')
+    parser.add_argument('--username', required=True)
+    args = parser.parse_args()
+    asyncio.run(main(args.username))
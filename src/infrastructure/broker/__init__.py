@@ -1,6 +1,14 @@
 from .rabbitmq_broker import RabbitmqBroker
+from .channel_pool import (
+    RabbitmqChannelPool,
+    ChannelPoolTimeoutError
+)
+from .topology import RabbitmqTopology
 
 
 __all__ = [
-    'RabbitmqBroker'
+    'RabbitmqBroker',
+    'RabbitmqChannelPool',
+    'ChannelPoolTimeoutError',
+    'RabbitmqTopology'
 ]
\ No newline at end of file
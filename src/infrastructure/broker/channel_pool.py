@@ -0,0 +1,75 @@
+import time
+import asyncio
+import typing as tp
+from collections import deque
+
+from aio_pika.abc import (
+    AbstractRobustChannel,
+    AbstractRobustConnection
+)
+
+from src.core.timing_core import observe
+
+
+class ChannelPoolTimeoutError(TimeoutError):
+    """
+    Channel isn't returned to pool in time
+    """
+
+
+class RabbitmqChannelPool:
+    """
+    Bounded pool of channels of one robust connection, how it works:
+    1. 'acquire' takes idle channel, if there is no idle channel and less than
+       'max_size' channels are used, then new channel is opened, else it waits
+       for returned channel up to 'timeout' seconds, then raise
+       ChannelPoolTimeoutError
+    2. 'release' returns channel to idle channels, closed channel is dropped,
+       so new channel is opened instead of it
+    3. Channels are opened in publisher confirm mode, channels of robust
+       connection are restored after reconnect
+    """
+    def __init__(self,
+                 connection: AbstractRobustConnection,
+                 max_size: int,
+                 timeout: float):
+        self.connection = connection
+        self.max_size = max_size
+        self.timeout = timeout
+        self.in_use = 0
+        self.idle: tp.Deque[AbstractRobustChannel] = deque()
+        self.semaphore = asyncio.Semaphore(max_size)
+
+    async def acquire(self) -> AbstractRobustChannel:
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            raise ChannelPoolTimeoutError(f'no channel is returned in {self.timeout} seconds') from None
+        finally:
+            observe('broker.channel_checkout', time.perf_counter() - start)
+
+        try:
+            channel = None
+            while self.idle and channel is None:
+                channel = self.idle.pop()
+                if channel.is_closed:
+                    channel = None
+            if channel is None:
+                channel = await self.connection.channel(publisher_confirms=True)
+        except BaseException:
+            self.semaphore.release()
+            raise
+
+        self.in_use += 1
+        return channel
+
+    async def release(self, channel: AbstractRobustChannel) -> None:
+        if not channel.is_closed:
+            self.idle.append(channel)
+        self.in_use -= 1
+        self.semaphore.release()
+
+    async def close(self) -> None:
+        while self.idle:
+            await self.idle.pop().close()
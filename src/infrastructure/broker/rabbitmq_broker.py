@@ -1,41 +1,44 @@
-import json
+import asyncio
+import typing as tp
 
-from aio_pika import (
-    Message,
-    RobustChannel,
+from aio_pika import Message
+from aio_pika.abc import AbstractChannel
 
-)
-from aio_pika.abc import AbstractRobustQueue
-
-from src.services.entities import (
-    BrokerUserReg,
-    BrokerUserEmailUpdate
-)
+from src.core.timing_core import timed
 from src.services.abstract_interface import AbstractBroker
 
+from .topology import RabbitmqTopology
+
 
 class RabbitmqBroker(AbstractBroker):
-    def __init__(self, channel: RobustChannel):
-        self.channel = channel
-
-    async def email_reg(self, schema: BrokerUserReg) -> None:
-        message = json.dumps(schema.model_dump())
-        queue = await self.channel.declare_queue(
-            name=self.user_reg_queue_name,
-            durable=True
-        )
-        await self._send(message, queue)
-
-    async def email_upd(self, schema: BrokerUserEmailUpdate) -> None:
-        message = json.dumps(schema.model_dump())
-        queue = await self.channel.declare_queue(
-            name=self.user_email_upd_queue_name,
-            durable=True
-        )
-        await self._send(message, queue)
-
-    async def _send(self, message: str, queue: AbstractRobustQueue) -> None:
-        await self.channel.default_exchange.publish(
-            message=Message(message.encode()),
-            routing_key=queue.name
-        )
+    """
+    Broker of unit of work, messages are buffered and sent only by 'publish',
+    which is called on commit of unit of work. Queues are declared by
+    'topology' on startup, so message is sent to exchange of queue binding
+    """
+    def __init__(self, topology: RabbitmqTopology):
+        self.topology = topology
+        self.messages: tp.List[tp.Tuple[str, bytes]] = []
+
+    async def send(self, queue_name: str, message: str) -> None:
+        self.messages.append((queue_name, message.encode()))
+
+    def clear(self) -> None:
+        self.messages.clear()
+
+    @timed('broker.publish')
+    async def publish(self, channel: AbstractChannel) -> None:
+        """
+        Publish buffered messages, how it works:
+        1. Publish all messages at once to exchanges of their queues,
+           channel is in confirm mode, so every publish waits for confirm of
+           the broker, confirms are awaited together
+        2. If any message isn't confirmed, then error is raised
+        """
+        publishes = []
+        for queue_name, body in self.messages:
+            exchange_name, routing_key = self.topology.route(queue_name)
+            exchange = await self.topology.exchange(channel, exchange_name)
+            publishes.append(exchange.publish(message=Message(body), routing_key=routing_key))
+        await asyncio.gather(*publishes)
+        self.messages.clear()
@@ -0,0 +1,6 @@
+from .jwt_key_ring import JWTKeyRing
+
+
+__all__ = [
+    'JWTKeyRing'
+]
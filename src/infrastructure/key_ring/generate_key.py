@@ -0,0 +1,53 @@
+"""
+Generate private key of key ring:
+
+    python -m src.infrastructure.key_ring.generate_key --keys-dir keys --algorithm EdDSA
+
+File name is id of key, set it in 'TOKEN_ACTIVE_KID' to start signing tokens
+"""
+import argparse
+from uuid import uuid4
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import (
+    ec,
+    rsa,
+    ed25519
+)
+
+
+def generate_private_key(algorithm: str):
+    if algorithm.startswith(('RS', 'PS')):
+        return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    if algorithm == 'ES256':
+        return ec.generate_private_key(ec.SECP256R1())
+    if algorithm == 'ES384':
+        return ec.generate_private_key(ec.SECP384R1())
+    if algorithm == 'EdDSA':
+        return ed25519.Ed25519PrivateKey.generate()
+    raise ValueError(f'Unsupported algorithm: {algorithm}')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--keys-dir', default='keys')
+    parser.add_argument('--algorithm', default='EdDSA')
+    parser.add_argument('--kid', default=None)
+    args = parser.parse_args()
+
+    key = generate_private_key(args.algorithm)
+    pem = key.private_bytes(encoding=serialization.Encoding.PEM,
+                            format=serialization.PrivateFormat.PKCS8,
+                            encryption_algorithm=serialization.NoEncryption())
+
+    kid = args.kid or uuid4().hex
+    path = Path(args.keys_dir) / f'{kid}.pem'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(pem)
+    path.chmod(0o600)
+    print(kid)
+
+
+if __name__ == '__main__':
+    main()
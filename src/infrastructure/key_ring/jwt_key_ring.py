@@ -0,0 +1,75 @@
+import json
+import hashlib
+import typing as tp
+from pathlib import Path
+
+import jwt
+from jwt.exceptions import InvalidSignatureError
+
+from src.services.abstract_interface import AbstractKeyRing
+
+
+class JWTKeyRing(AbstractKeyRing):
+    """
+    Key ring of jwt tokens, how it works:
+    1. If algorithm is symmetric (HS256, ...), then tokens are signed and
+       verified by 'secret_key' and ring doesn't publish keys
+    2. Else every '{kid}.pem' file of 'keys_dir' is key of ring. Private key
+       'active_kid' signs new tokens and its id is sent in 'kid' header
+    3. Other keys are retiring, they only verify tokens issued before rotation.
+       Private part of retiring key can be replaced by public one, file can be
+       removed when 'REFRESH_EXP_TIME' passes after rotation
+    4. Keys are parsed once, encode and decode get ready key objects
+    """
+    def __init__(self,
+                 algorithm: str,
+                 secret_key: str,
+                 keys_dir: tp.Optional[str] = None,
+                 active_kid: tp.Optional[str] = None):
+        self.algorithm = algorithm
+        self.active_kid: tp.Optional[str] = None
+        self.signing_key: tp.Any = secret_key
+        self.verify_keys: tp.Dict[tp.Optional[str], tp.Any] = {None: secret_key}
+        jwks = {'keys': []}
+
+        if not algorithm.startswith('HS'):
+            self.verify_keys = {}
+            self._load_keys(Path(keys_dir), active_kid, jwks)
+
+        self.jwks_json = json.dumps(jwks).encode()
+        self.jwks_etag = '"' + hashlib.blake2b(self.jwks_json, digest_size=16).hexdigest() + '"'
+
+    def encode(self, payload: dict) -> str:
+        headers = None if self.active_kid is None else {'kid': self.active_kid}
+        return jwt.encode(payload=payload,
+                          key=self.signing_key,
+                          algorithm=self.algorithm,
+                          headers=headers)
+
+    def decode(self, token: tp.Union[str, bytes]) -> dict:
+        kid = jwt.get_unverified_header(token).get('kid')
+        key = self.verify_keys.get(kid)
+        if key is None:
+            raise InvalidSignatureError(f'Unknown key: {kid}')
+        return jwt.decode(jwt=token, key=key, algorithms=[self.algorithm])
+
+    def _load_keys(self, keys_dir: Path, active_kid: tp.Optional[str], jwks: dict) -> None:
+        algorithm = jwt.get_algorithm_by_name(self.algorithm)
+        for path in sorted(keys_dir.glob('*.pem')):
+            kid = path.stem
+            key = algorithm.prepare_key(path.read_bytes())
+            public_key = key.public_key() if hasattr(key, 'public_key') else key
+
+            if kid == active_kid:
+                if public_key is key:
+                    raise ValueError(f'Active key {kid} must be private key')
+                self.active_kid = kid
+                self.signing_key = key
+
+            self.verify_keys[kid] = public_key
+            jwk = algorithm.to_jwk(public_key, as_dict=True)
+            jwk.update(kid=kid, alg=self.algorithm, use='sig')
+            jwks['keys'].append(jwk)
+
+        if self.active_kid is None:
+            raise ValueError(f'Active key {active_kid} is not found in {keys_dir}')
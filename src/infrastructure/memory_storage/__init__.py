@@ -1,6 +1,14 @@
+from .redis_scripts import RedisScripts
 from .redis_memory_storage import RedisMemoryStorage
+from .revocation_filter import RedisRevocationFilter
+from .payload_cache import LRUPayloadCache
+from .token_buckets import LocalTokenBuckets
 
 
 __all__ = [
-    'RedisMemoryStorage'
+    'RedisScripts',
+    'RedisMemoryStorage',
+    'RedisRevocationFilter',
+    'LRUPayloadCache',
+    'LocalTokenBuckets'
 ]
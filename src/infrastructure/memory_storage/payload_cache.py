@@ -0,0 +1,56 @@
+import time
+import hashlib
+import typing as tp
+from collections import OrderedDict
+
+from src.services.entities import JWTPayload
+from src.services.abstract_interface import AbstractPayloadCache
+
+
+class LRUPayloadCache(AbstractPayloadCache):
+    """
+    LRU cache of jwt payloads, how it works:
+    1. Key is digest of token, so cache doesn't keep full tokens
+    2. Entry expires at 'exp' of token, expired entry is removed on 'get',
+       then token is decoded again and decoder raises error of expired token
+    3. If cache is full, then least recently used entry is removed
+    4. If 'size' is 0, then cache is disabled
+    """
+    def __init__(self, size: int):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self.entries: tp.OrderedDict[bytes, tp.Tuple[JWTPayload, float]] = OrderedDict()
+
+    def get(self, token: str) -> tp.Optional[JWTPayload]:
+        key = self._get_key(token)
+        item = self.entries.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+
+        payload, expire = item
+        if expire <= time.time():
+            del self.entries[key]
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return payload
+
+    def set(self, token: str, payload: JWTPayload) -> None:
+        if self.size <= 0:
+            return
+
+        key = self._get_key(token)
+        self.entries[key] = (payload, payload.exp.timestamp())
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    @staticmethod
+    def _get_key(token: str) -> bytes:
+        if isinstance(token, str):
+            token = token.encode()
+        return hashlib.blake2b(token, digest_size=16).digest()
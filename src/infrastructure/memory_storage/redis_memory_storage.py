@@ -1,11 +1,22 @@
+import time
+import logging
+import typing as tp
+
 from redis.asyncio import Redis
 from redis.asyncio.client import Pipeline
 
+from src.core.timing_core import timed_methods
+from src.services.entities import UserStatus
 from src.services.abstract_interface import (
     SetType,
     AbstractMemoryStorage,
     AbstractReadlockMemoryStorage
 )
+from .redis_scripts import RedisScripts
+from .revocation_filter import get_key_id
+
+
+logger = logging.getLogger(__name__)
 
 
 class ReadlockMemoryStorage(AbstractReadlockMemoryStorage):
@@ -20,10 +31,17 @@ class ReadlockMemoryStorage(AbstractReadlockMemoryStorage):
         await self.lock.release()
 
 
+@timed_methods('redis')
 class RedisMemoryStorage(AbstractMemoryStorage):
-    def __init__(self, redis: Redis, pipeline: Pipeline):
+    # flags of user status
+    ACTIVE = 1
+    DELETED = 2
+    SUPERUSER = 4
+
+    def __init__(self, redis: Redis, pipeline: Pipeline, scripts: RedisScripts):
         self.redis = redis
         self.pipeline = pipeline
+        self.scripts = scripts
 
     async def get_time(self) -> float:
         t = await self.redis.time()
@@ -41,5 +59,122 @@ class RedisMemoryStorage(AbstractMemoryStorage):
     async def delete_one(self, key: str) -> None:
         await self.pipeline.delete(key)
 
+    async def consume(self, key: str) -> bool:
+        return bool(await self.redis.delete(key))
+
+    async def add_session(self, user_id: str, session_id: str, token: str, ex: int) -> None:
+        await self.scripts.add_session(
+            keys=[self._sessions_key(user_id)],
+            args=[session_id, self._session_value(token, ex), ex, int(time.time())],
+            client=self.pipeline
+        )
+
+    async def rotate_session(self,
+                             user_id: str,
+                             session_id: str,
+                             token: str,
+                             new_token: str,
+                             ex: int) -> bool:
+        result = await self.scripts.rotate_session(
+            keys=[self._sessions_key(user_id)],
+            args=[session_id, get_key_id(token), self._session_value(new_token, ex), ex, int(time.time())],
+            client=self.redis
+        )
+        if result < 0:
+            logger.warning('refresh-token is reused, session %s of user %s is revoked', session_id, user_id)
+        return result > 0
+
+    async def delete_session(self, user_id: str, session_id: str, token: str) -> bool:
+        result = await self.scripts.delete_session(
+            keys=[self._sessions_key(user_id)],
+            args=[session_id, get_key_id(token)],
+            client=self.redis
+        )
+        return bool(result)
+
+    async def delete_sessions(self, user_id: str) -> None:
+        await self.pipeline.delete(self._sessions_key(user_id))
+
+    async def revoke(self, key: str, value: SetType, ex: int) -> None:
+        key_id = get_key_id(key)
+        await self.set(key, value, ex)
+        await self.pipeline.zadd(self.revoked_keys_name, {key_id: time.time() + ex})
+        await self.pipeline.publish(self.revoked_keys_name, key_id)
+
+    async def get_generation(self, user_id: str) -> int:
+        value = await self.redis.get(self._generation_key(user_id))
+        return 0 if value is None else int(value)
+
+    async def get_user_status(self, user_id: str) -> tp.Optional[UserStatus]:
+        value = await self.redis.get(self._user_status_key(user_id))
+        if value is None:
+            return None
+
+        flags, version = map(int, value.split(b':'))
+        return UserStatus(is_active=bool(flags & self.ACTIVE),
+                          is_deleted=bool(flags & self.DELETED),
+                          is_superuser=bool(flags & self.SUPERUSER),
+                          version=version)
+
+    async def add_user_status(self, user_id: str, status: UserStatus, ex: int) -> None:
+        value = f'{self._get_flags(status)}:{status.version}'
+        await self.redis.set(self._user_status_key(user_id), value, ex=ex, nx=True)
+
+    async def set_user_status(self, user_id: str, status: UserStatus, ex: int) -> int:
+        return await self.scripts.set_user_status(
+            keys=[self._user_status_key(user_id)],
+            args=[self._get_flags(status), ex, self.user_status_name, user_id],
+            client=self.redis
+        )
+
+    async def throttle(self,
+                       key: str,
+                       interval: float,
+                       tolerance: float,
+                       quantity: int = 1) -> tp.Tuple[int, float]:
+        granted, retry_after = await self.scripts.throttle(
+            keys=[f'{self.rate_limiter_name}:{key}'],
+            args=[interval, tolerance, quantity],
+            client=self.redis
+        )
+        return int(granted), float(retry_after)
+
+    async def get_revocation_state(self,
+                                   user_ids: tp.List[str],
+                                   keys: tp.List[str]) -> tp.Tuple[tp.List[int], tp.List[bool]]:
+        names = [self._generation_key(user_id) for user_id in user_ids] + keys
+        values = await self.redis.mget(names)
+        generations = [int(value) if value is not None else 0 for value in values[:len(user_ids)]]
+        revoked = [value is not None for value in values[len(user_ids):]]
+        return generations, revoked
+
+    async def bump_generation(self, user_id: str, ex: int) -> None:
+        key = self._generation_key(user_id)
+        await self.pipeline.incr(key)
+        await self.pipeline.expire(key, ex)
+        await self.pipeline.publish(self.token_generation_name, user_id)
+
+    async def touch_generation(self, user_id: str, ex: int) -> None:
+        await self.pipeline.expire(self._generation_key(user_id), ex)
+
     def readlock(self, name: str, timeout: int = 2) -> ReadlockMemoryStorage:
         return ReadlockMemoryStorage(self.redis, name, timeout)
+
+    def _generation_key(self, user_id: str) -> str:
+        return f'{self.token_generation_name}:{user_id}'
+
+    def _user_status_key(self, user_id: str) -> str:
+        return f'{self.user_status_name}:{user_id}'
+
+    @classmethod
+    def _get_flags(cls, status: UserStatus) -> int:
+        return (cls.ACTIVE * status.is_active
+                | cls.DELETED * status.is_deleted
+                | cls.SUPERUSER * status.is_superuser)
+
+    def _sessions_key(self, user_id: str) -> str:
+        return f'{self.sessions_name}:{user_id}'
+
+    @staticmethod
+    def _session_value(token: str, ex: int) -> str:
+        return f'{get_key_id(token)}:{int(time.time()) + ex}'
@@ -0,0 +1,134 @@
+import logging
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+
+logger = logging.getLogger(__name__)
+
+
+# Sessions of user are stored in one hash, field is session id and value is
+# '{fingerprint of current refresh-token}:{expire timestamp}'. Expired sessions
+# are pruned, when session is added or rotated, so hash doesn't grow
+#
+# KEYS[1] - sessions of user, local 'now' - now timestamp
+PRUNE_SESSIONS = """
+local sessions = redis.call('HGETALL', KEYS[1])
+for i = 1, #sessions, 2 do
+    local expire = tonumber(string.match(sessions[i + 1], ':(%d+)$'))
+    if expire ~= nil and expire < now then
+        redis.call('HDEL', KEYS[1], sessions[i])
+    end
+end
+"""
+
+# KEYS[1] - sessions of user, ARGV[1] - session id, ARGV[2] - value,
+# ARGV[3] - expire time of hash, ARGV[4] - now timestamp
+ADD_SESSION = """
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+local now = tonumber(ARGV[4])
+""" + PRUNE_SESSIONS + """
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+
+# KEYS[1] - sessions of user, ARGV[1] - session id, ARGV[2] - old fingerprint,
+# ARGV[3] - new value, ARGV[4] - expire time of hash, ARGV[5] - now timestamp
+# returns 1 if session is rotated, 0 if session doesn't exist and -1 if old
+# refresh-token is reused, then the whole session is revoked
+ROTATE_SESSION = """
+local current = redis.call('HGET', KEYS[1], ARGV[1])
+if current == false then
+    return 0
+end
+if string.match(current, '^[^:]*') ~= ARGV[2] then
+    redis.call('HDEL', KEYS[1], ARGV[1])
+    return -1
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[3])
+local now = tonumber(ARGV[5])
+""" + PRUNE_SESSIONS + """
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return 1
+"""
+
+# KEYS[1] - sessions of user, ARGV[1] - session id, ARGV[2] - fingerprint
+# returns 1 if session is deleted, 0 if session doesn't exist or refresh-token
+# isn't current refresh-token of session
+DELETE_SESSION = """
+local current = redis.call('HGET', KEYS[1], ARGV[1])
+if current == false or string.match(current, '^[^:]*') ~= ARGV[2] then
+    return 0
+end
+redis.call('HDEL', KEYS[1], ARGV[1])
+return 1
+"""
+
+# KEYS[1] - status of user, ARGV[1] - flags, ARGV[2] - expire time,
+# ARGV[3] - channel, ARGV[4] - user id
+# returns new version of status
+SET_USER_STATUS = """
+local current = redis.call('GET', KEYS[1])
+local version = 1
+if current then
+    version = tonumber(string.match(current, ':(%d+)$')) + 1
+end
+redis.call('SET', KEYS[1], ARGV[1] .. ':' .. version, 'EX', ARGV[2])
+redis.call('PUBLISH', ARGV[3], ARGV[4])
+return version
+"""
+
+# Generic cell rate algorithm, KEYS[1] - theoretical arrival time of next
+# request, ARGV[1] - emission interval, ARGV[2] - tolerance of burst in seconds,
+# ARGV[3] - count of requested tokens
+# returns count of granted tokens, it can be less than requested, and seconds
+# until next token is allowed if nothing is granted
+THROTTLE = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local interval = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local quantity = tonumber(ARGV[3])
+
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then
+    tat = now
+end
+
+local granted = math.min(quantity, math.floor((now + tolerance - tat) / interval) + 1)
+if granted < 1 then
+    return {0, tostring(tat - tolerance - now)}
+end
+
+tat = tat + granted * interval
+redis.call('SET', KEYS[1], tostring(tat), 'PX', math.ceil((tat - now) * 1000))
+return {granted, '0'}
+"""
+
+
+class RedisScripts:
+    """
+    Lua scripts of memory storage. Scripts are called by EVALSHA, they are
+    loaded once at startup and are reloaded if redis lost them
+    """
+    def __init__(self, redis: Redis):
+        self.redis = redis
+        self.add_session = redis.register_script(ADD_SESSION)
+        self.rotate_session = redis.register_script(ROTATE_SESSION)
+        self.delete_session = redis.register_script(DELETE_SESSION)
+        self.set_user_status = redis.register_script(SET_USER_STATUS)
+        self.throttle = redis.register_script(THROTTLE)
+
+    async def load(self) -> None:
+        try:
+            scripts = (
+                self.add_session,
+                self.rotate_session,
+                self.delete_session,
+                self.set_user_status,
+                self.throttle
+            )
+            for script in scripts:
+                script.sha = await self.redis.script_load(script.script)
+        except RedisError as e:
+            logger.error('redis scripts are not loaded: %s', e)
@@ -0,0 +1,213 @@
+import math
+import time
+import asyncio
+import hashlib
+import logging
+import typing as tp
+
+from redis.asyncio import Redis
+from redis.exceptions import (
+    ConnectionError,
+    TimeoutError
+)
+
+from src.services.entities import UserStatus
+from src.services.abstract_interface import (
+    AbstractMemoryStorage,
+    AbstractRevocationFilter
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_key_id(key: str) -> str:
+    """
+    Short id of the revoked key, it's stored in sorted set and sent via pub/sub
+    instead of the full jwt token
+    """
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def add(self, key_id: str) -> None:
+        for index in self._indexes(key_id):
+            self.bits[index >> 3] |= 1 << (index & 7)
+
+    def __contains__(self, key_id: str) -> bool:
+        return all(self.bits[index >> 3] & (1 << (index & 7)) for index in self._indexes(key_id))
+
+    def _indexes(self, key_id: str):
+        # double hashing: index_i = h1 + i * h2
+        digest = bytes.fromhex(key_id)
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+
+class TTLCache:
+    """
+    Dict with expire time of items, if dict is full, then the oldest item is removed
+    """
+    def __init__(self, capacity: int, ttl: float):
+        self.capacity = capacity
+        self.ttl = ttl
+        self.items: tp.Dict[str, tp.Tuple[tp.Any, float]] = {}
+
+    def get(self, key: str) -> tp.Any:
+        item = self.items.get(key)
+        if item is None:
+            return None
+
+        value, expire = item
+        if expire < time.monotonic():
+            del self.items[key]
+            return None
+        return value
+
+    def set(self, key: str, value: tp.Any) -> None:
+        if key not in self.items and len(self.items) >= self.capacity:
+            del self.items[next(iter(self.items))]
+        self.items[key] = (value, time.monotonic() + self.ttl)
+
+    def discard(self, key: str) -> None:
+        self.items.pop(key, None)
+
+    def clear(self) -> None:
+        self.items.clear()
+
+
+class RedisRevocationFilter(AbstractRevocationFilter):
+    """
+    Bloom filter of revoked keys and cache of token generations and user
+    statuses, how it works:
+    1. Subscribe to channels 'revoked_keys_name', 'token_generation_name'
+       and 'user_status_name'
+    2. Load all not expired ids from sorted set 'revoked_keys_name' in new filter
+       and clear caches
+    3. Add every id from channel 'revoked_keys_name' to filter, discard cached
+       generation of every user from channel 'token_generation_name' and
+       cached status of every user from channel 'user_status_name'
+    4. Repeat step 2 every 'resync_time' seconds, because bloom filter can't
+       remove expired ids
+    5. If connection is lost, then filter isn't ready, every key
+       'might be revoked' and nothing is cached until resync is done
+    """
+    name: str = AbstractMemoryStorage.revoked_keys_name
+    generation_name: str = AbstractMemoryStorage.token_generation_name
+    user_status_name: str = AbstractMemoryStorage.user_status_name
+
+    def __init__(self,
+                 redis: Redis,
+                 capacity: int,
+                 error_rate: float,
+                 resync_time: int,
+                 generation_ttl: float,
+                 reconnect_time: float = 1):
+        self.redis = redis
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.resync_time = resync_time
+        self.generation_ttl = generation_ttl
+        self.reconnect_time = reconnect_time
+        self.ready = False
+        self.running = False
+        self.bloom_filter = BloomFilter(capacity, error_rate)
+        self.generations = TTLCache(capacity, generation_ttl)
+        self.user_statuses = TTLCache(capacity, generation_ttl)
+        self.task: tp.Optional[asyncio.Task] = None
+
+    def might_be_revoked(self, key: str) -> bool:
+        if not self.ready:
+            return True
+        return get_key_id(key) in self.bloom_filter
+
+    def add(self, key: str) -> None:
+        self.bloom_filter.add(get_key_id(key))
+
+    def get_generation(self, user_id: str) -> tp.Optional[int]:
+        if not self.ready:
+            return None
+        return self.generations.get(user_id)
+
+    def set_generation(self, user_id: str, generation: int) -> None:
+        self.generations.set(user_id, generation)
+
+    def discard_generation(self, user_id: str) -> None:
+        self.generations.discard(user_id)
+
+    def get_user_status(self, user_id: str) -> tp.Optional[UserStatus]:
+        if not self.ready:
+            return None
+        return self.user_statuses.get(user_id)
+
+    def set_user_status(self, user_id: str, status: UserStatus) -> None:
+        current = self.user_statuses.get(user_id)
+        if current is None or current.version <= status.version:
+            self.user_statuses.set(user_id, status)
+
+    def discard_user_status(self, user_id: str) -> None:
+        self.user_statuses.discard(user_id)
+
+    async def start(self) -> None:
+        self.running = True
+        self.task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        # cancellation can be lost inside 'get_message', so listener also
+        # checks 'running' after every message timeout
+        self.running = False
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.wait([self.task], timeout=self.reconnect_time + 1)
+        self.ready = False
+
+    async def _listen(self) -> None:
+        while self.running:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.name, self.generation_name, self.user_status_name)
+                await self._resync()
+                next_resync = time.monotonic() + self.resync_time
+                while self.running:
+                    message = await pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        self._on_message(message['channel'].decode(), message['data'].decode())
+
+                    if time.monotonic() >= next_resync:
+                        await self._resync()
+                        next_resync = time.monotonic() + self.resync_time
+
+            except (ConnectionError, TimeoutError, OSError) as e:
+                self.ready = False
+                self.generations.clear()
+                self.user_statuses.clear()
+                logger.error('revocation filter lost connection: %s', e)
+                await asyncio.sleep(self.reconnect_time)
+
+            finally:
+                await pubsub.aclose()
+
+    async def _resync(self) -> None:
+        bloom_filter = BloomFilter(self.capacity, self.error_rate)
+        await self.redis.zremrangebyscore(self.name, '-inf', time.time())
+        for key_id in await self.redis.zrange(self.name, 0, -1):
+            bloom_filter.add(key_id.decode())
+
+        self.bloom_filter = bloom_filter
+        self.generations.clear()
+        self.user_statuses.clear()
+        self.ready = True
+
+    def _on_message(self, channel: str, data: str) -> None:
+        if channel == self.generation_name:
+            self.discard_generation(data)
+        elif channel == self.user_status_name:
+            self.discard_user_status(data)
+        else:
+            self.bloom_filter.add(data)
@@ -0,0 +1,51 @@
+import time
+import typing as tp
+
+from src.services.abstract_interface import AbstractTokenBuckets
+
+
+class LocalTokenBuckets(AbstractTokenBuckets):
+    """
+    Token buckets of the worker, how it works:
+    1. Worker leases chunk of tokens from memory storage and puts them in bucket
+       of key, tokens expire after 'ttl', so unused quota isn't kept
+    2. Every request of key takes token from bucket without memory storage
+    3. If lease is denied, then bucket keeps denial until 'retry_after' passes,
+       so requests over limit are rejected without memory storage
+    4. If count of buckets is equal 'capacity', then the oldest bucket is removed
+    """
+    def __init__(self, capacity: int, clock: tp.Callable[[], float] = time.monotonic):
+        self.capacity = capacity
+        self.clock = clock
+        # key -> (tokens, expire time of tokens or denial)
+        self.buckets: tp.Dict[str, tp.Tuple[int, float]] = {}
+
+    def take(self, key: str) -> tp.Optional[float]:
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            return None
+
+        tokens, expire = bucket
+        now = self.clock()
+        if expire <= now:
+            del self.buckets[key]
+            return None
+
+        if tokens == 0:
+            return expire - now
+
+        if tokens == 1:
+            del self.buckets[key]
+        else:
+            self.buckets[key] = (tokens - 1, expire)
+        return 0
+
+    def put(self, key: str, tokens: int, retry_after: float, ttl: float) -> None:
+        tokens = max(tokens, 0)
+        if tokens == 0 and retry_after <= 0:
+            self.buckets.pop(key, None)
+            return
+
+        if key not in self.buckets and len(self.buckets) >= self.capacity:
+            del self.buckets[next(iter(self.buckets))]
+        self.buckets[key] = (tokens, self.clock() + (ttl if tokens > 0 else retry_after))
@@ -0,0 +1,6 @@
+from .process_pool_password_hasher import ProcessPoolPasswordHasher
+
+
+__all__ = [
+    'ProcessPoolPasswordHasher'
+]
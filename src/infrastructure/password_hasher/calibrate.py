@@ -0,0 +1,60 @@
+"""
+Measure cost of password hashing on this host and recommend rounds of the
+default scheme for target login latency:
+
+    python -m src.infrastructure.password_hasher.calibrate --schemes sha256_crypt --target-ms 250
+
+Set result in 'HASH_ROUNDS', existing hashes are updated on next login
+"""
+import math
+import time
+import argparse
+import statistics
+
+from .process_pool_password_hasher import get_crypt_context
+
+
+def measure(schemes: str, rounds: int, samples: int) -> float:
+    crypt_context = get_crypt_context(schemes, rounds)
+    hashed = crypt_context.hash('calibrate-password')
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        crypt_context.verify('calibrate-password', hashed)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def recommend(schemes: str, target: float, samples: int) -> int:
+    """
+    Cost of linear schemes (sha256_crypt, pbkdf2) grows with rounds,
+    cost of log2 schemes (bcrypt) grows with 2 ** rounds
+    """
+    handler = get_crypt_context(schemes).handler()
+    rounds = handler.default_rounds
+    elapsed = measure(schemes, rounds, samples)
+
+    if handler.rounds_cost == 'log2':
+        rounds = rounds + math.floor(math.log2(target / elapsed))
+    else:
+        rounds = math.floor(rounds * target / elapsed)
+    return max(handler.min_rounds, min(rounds, handler.max_rounds or rounds))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--schemes', default='sha256_crypt')
+    parser.add_argument('--target-ms', type=float, default=250)
+    parser.add_argument('--samples', type=int, default=5)
+    parser.add_argument('--pool-size', type=int, default=1)
+    args = parser.parse_args()
+
+    rounds = recommend(args.schemes, args.target_ms / 1000, args.samples)
+    elapsed = measure(args.schemes, rounds, args.samples)
+    print(f'HASH_ROUNDS={rounds}')
+    print(f'verify={elapsed * 1000:.1f}ms '
+          f'max logins={args.pool_size / elapsed:.1f}/s with {args.pool_size} workers')
+
+
+if __name__ == '__main__':
+    main()
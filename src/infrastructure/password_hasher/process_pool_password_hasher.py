@@ -0,0 +1,101 @@
+import asyncio
+import typing as tp
+from concurrent.futures import ProcessPoolExecutor
+
+from passlib.context import CryptContext
+
+from src.core.timing_core import timed_methods
+from src.services.abstract_interface import (
+    AbstractPasswordHasher,
+    PasswordHasherBusyError
+)
+
+
+# crypt context of the worker process, it's created once by the pool initializer
+_crypt_context: tp.Optional[CryptContext] = None
+
+
+def get_crypt_context(schemes: str, rounds: tp.Optional[int] = None) -> CryptContext:
+    """
+    First scheme of 'schemes' is default, other schemes are deprecated. If
+    'rounds' is set, then hashes of default scheme with other rounds need update
+    """
+    settings = {}
+    if rounds is not None:
+        scheme = schemes.split(',')[0].strip()
+        for option in ('default_rounds', 'min_rounds', 'max_rounds'):
+            settings[f'{scheme}__{option}'] = rounds
+    return CryptContext(schemes=schemes, deprecated='auto', **settings)
+
+
+def _init_crypt_context(schemes: str, rounds: tp.Optional[int]) -> None:
+    global _crypt_context
+    _crypt_context = get_crypt_context(schemes, rounds)
+
+
+def _hash(secret: str) -> str:
+    return _crypt_context.hash(secret)
+
+
+def _verify(secret: str, hashed: str) -> bool:
+    return _crypt_context.verify(secret, hashed)
+
+
+def _verify_and_update(secret: str, hashed: str) -> tp.Tuple[bool, tp.Optional[str]]:
+    return _crypt_context.verify_and_update(secret, hashed)
+
+
+@timed_methods('hash')
+class ProcessPoolPasswordHasher(AbstractPasswordHasher):
+    """
+    Password hasher, that runs passlib in the process pool, so bcrypt/argon2
+    don't block event loop. If count of pending calls is equal 'max_queue_size',
+    then raise PasswordHasherBusyError, it's answered by '503'
+    """
+    def __init__(self,
+                 schemes: str,
+                 rounds: tp.Optional[int] = None,
+                 max_workers: tp.Optional[int] = None,
+                 max_queue_size: int = 64):
+        self.max_queue_size = max_queue_size
+        self.pending = 0
+        self.executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_crypt_context,
+            initargs=(schemes, rounds)
+        )
+
+    async def hash(self, secret: str) -> str:
+        return await self._submit(_hash, secret)
+
+    async def verify(self, secret: str, hashed: str) -> bool:
+        return await self._submit(_verify, secret, hashed)
+
+    async def verify_and_update(self, secret: str, hashed: str) -> tp.Tuple[bool, tp.Optional[str]]:
+        return await self._submit(_verify_and_update, secret, hashed)
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    async def _submit(self, func: tp.Callable, *args) -> tp.Any:
+        """
+        Place in queue is released by callback of the job, not by the caller,
+        so cancelled caller doesn't release place of the job, which is still
+        running or waiting in the pool
+        """
+        if self.pending >= self.max_queue_size:
+            raise PasswordHasherBusyError(f'{self.pending} calls are pending')
+
+        loop = asyncio.get_running_loop()
+        future = self.executor.submit(func, *args)
+        self.pending += 1
+        future.add_done_callback(lambda _: self._release(loop))
+        return await asyncio.wrap_future(future)
+
+    def _release(self, loop: asyncio.AbstractEventLoop) -> None:
+        # callback is called by thread of the pool, counter is changed by event loop
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(self._decrement)
+
+    def _decrement(self) -> None:
+        self.pending -= 1
@@ -1,10 +1,14 @@
 from .postgres_repository import (
     UserRepository,
-    UserHistoryRepository
+    UserHistoryRepository,
+    OutboxRepository
 )
+from .notification_listener import PostgresNotificationListener
 
 
 __all__ = [
     'UserRepository',
-    'UserHistoryRepository'
+    'UserHistoryRepository',
+    'OutboxRepository',
+    'PostgresNotificationListener'
 ]
@@ -22,6 +22,7 @@ from sqlalchemy.exc import (
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
+from src.core.timing_core import timed_methods
 from src.endpoints.exceptions import (
     DuplicateUserEmailHTTPException,
     DuplicateUserUsernameHTTPException
@@ -29,6 +30,7 @@ from src.endpoints.exceptions import (
 from src.services.abstract_interface import AbstractRepository
 
 
+@timed_methods('db')
 class SQLAlchemyAdapter(AbstractRepository, abc.ABC):
     pydantic_model: BaseModel
     pydantic_create_model: BaseModel
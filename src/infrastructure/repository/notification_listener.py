@@ -0,0 +1,58 @@
+import asyncio
+import logging
+import typing as tp
+
+import asyncpg
+
+from src.services.abstract_interface import AbstractNotificationListener
+
+
+logger = logging.getLogger(__name__)
+
+
+class PostgresNotificationListener(AbstractNotificationListener):
+    """
+    Listener of channel 'channel' of postgres, how it works:
+    1. 'start' opens separate connection and runs 'LISTEN channel'
+    2. Every notification sets event, 'wait' waits for event up to 'timeout'
+       seconds and clears it
+    3. If connection is lost, then 'wait' returns True, so caller checks
+       table without notification, and the next 'wait' opens new connection
+    """
+    def __init__(self, dsn: str, channel: str):
+        self.dsn = dsn
+        self.channel = channel
+        self.event = asyncio.Event()
+        self.connection: tp.Optional[asyncpg.Connection] = None
+
+    async def start(self) -> None:
+        try:
+            self.connection = await asyncpg.connect(self.dsn)
+            self.connection.add_termination_listener(self._on_termination)
+            await self.connection.add_listener(self.channel, self._on_notification)
+        except (OSError, asyncpg.PostgresError) as e:
+            logger.error('listener of %s is not connected: %s', self.channel, e)
+            await self.stop()
+
+    async def stop(self) -> None:
+        connection, self.connection = self.connection, None
+        if connection is not None and not connection.is_closed():
+            await connection.close()
+
+    async def wait(self, timeout: float) -> bool:
+        if self.connection is None or self.connection.is_closed():
+            await self.start()
+
+        try:
+            await asyncio.wait_for(self.event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self.event.clear()
+        return True
+
+    def _on_notification(self, connection, pid, channel, payload) -> None:
+        self.event.set()
+
+    def _on_termination(self, connection) -> None:
+        logger.error('listener of %s lost connection', self.channel)
+        self.event.set()
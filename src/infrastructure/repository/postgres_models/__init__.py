@@ -1,8 +1,10 @@
 from .user_model import User
 from .user_history_model import UserHistory
+from .outbox_model import Outbox
 
 
 __all__ = [
     'User',
-    'UserHistory'
+    'UserHistory',
+    'Outbox'
 ]
@@ -0,0 +1,25 @@
+from sqlalchemy import (
+    TEXT,
+    Index
+)
+from sqlalchemy.orm import mapped_column
+
+from .abstract_model import AbstractBase
+
+
+class Outbox(AbstractBase):
+    __tablename__ = 'outbox'
+    __table_args__ = (
+        Index('ix_outbox_dt_created', 'dt_created'),
+    )
+
+    queue = mapped_column(
+        TEXT,
+        nullable=False,
+        doc='queue of broker, which message is sent to'
+    )
+    payload = mapped_column(
+        TEXT,
+        nullable=False,
+        doc='body of message'
+    )
@@ -2,10 +2,7 @@ from sqlalchemy import (
     TEXT,
     BOOLEAN,
 )
-from sqlalchemy.orm import (
-    Mapped,
-    mapped_column
-)
+from sqlalchemy.orm import mapped_column
 from sqlalchemy.dialects.postgresql import CITEXT
 
 from .abstract_model import AbstractBase
@@ -43,4 +40,9 @@ class User(AbstractBase):
         default=False,
         doc="If true then the user is deleted your account"
     )
-    is_superuser: Mapped[bool]
+    is_superuser = mapped_column(
+        BOOLEAN,
+        nullable=False,
+        default=False,
+        doc="If true then the user is administrator, it's set only by 'make grant_superuser'"
+    )
@@ -1,17 +1,57 @@
+import typing as tp
+
+from sqlalchemy import (
+    select,
+    delete,
+    update
+)
+
+from src.core.timing_core import timed_methods
 from src.services.abstract_interface import (
     AbstractUserRepository,
-    AbstractUserHistoryRepository
+    AbstractUserHistoryRepository,
+    AbstractOutboxRepository
 )
 from src.infrastructure.repository.adapters import SQLAlchemyAdapter
 from src.infrastructure.repository.postgres_models import (
     User,
-    UserHistory
+    UserHistory,
+    Outbox
 )
 
 
+@timed_methods('db')
 class UserRepository(AbstractUserRepository, SQLAlchemyAdapter):
     model = User
 
+    async def replace_password_hash(self, pk: tp.Any, old_hash: str, new_hash: str) -> bool:
+        response = await self.async_session.execute(
+            update(self.model)
+            .where(self.model.id.__eq__(pk), self.model.hashed_password.__eq__(old_hash))
+            .values(hashed_password=new_hash)
+        )
+        return response.rowcount > 0
+
 
 class UserHistoryRepository(AbstractUserHistoryRepository, SQLAlchemyAdapter):
     model = UserHistory
+
+
+@timed_methods('db')
+class OutboxRepository(AbstractOutboxRepository, SQLAlchemyAdapter):
+    model = Outbox
+
+    async def take(self, limit: int) -> tp.List[AbstractOutboxRepository.pydantic_model]:
+        response = await self.async_session.execute(
+            select(self.model)
+            .order_by(self.model.dt_created)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return [self.pydantic_model.model_validate(obj) for obj in response.scalars()]
+
+    async def remove_many(self, pks: tp.List[tp.Any]) -> None:
+        await self.async_session.execute(
+            delete(self.model)
+            .where(self.model.id.in_(pks))
+        )
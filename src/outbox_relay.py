@@ -0,0 +1,36 @@
+import signal
+import asyncio
+import logging
+
+from src.core.config import get_config
+from src.core.containers import (
+    Container,
+    RelayContainer
+)
+
+
+async def main() -> None:
+    """
+    Outbox relay without application, so publishing is scaled independently
+    of workers, which are run with 'OUTBOX_RELAY=False'. Relay is stopped by
+    SIGINT or SIGTERM
+    """
+    settings = get_config()
+    container = Container()
+    container.config.from_dict(settings.model_dump())
+    relay_container = RelayContainer(async_session=container.async_session)
+    relay_container.config.from_dict(settings.model_dump())
+
+    stopped = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stopped.set)
+
+    await relay_container.outbox_relay.init()
+    await stopped.wait()
+    await relay_container.shutdown_resources()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
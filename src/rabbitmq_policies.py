@@ -0,0 +1,44 @@
+"""
+Apply policies of broker from 'RABBITMQ_TOPOLOGY_FILE' by management api:
+
+    python -m src.rabbitmq_policies
+
+Arguments of existing queue can't be changed by declaration, policy is
+applied to existing and new queues, so dead-letter exchange is set by this
+command like migration, it's run by 'make docker_run'
+"""
+import os
+import asyncio
+from urllib.parse import quote
+
+from httpx import AsyncClient
+
+from src.core.config import get_config
+from src.infrastructure.broker import RabbitmqTopology
+
+
+async def main() -> None:
+    settings = get_config()
+    rabbitmq = settings.RABBITMQ
+    topology = RabbitmqTopology.from_file(os.path.join(settings.BASE_DIR, rabbitmq.RABBITMQ_TOPOLOGY_FILE))
+
+    async with AsyncClient(
+        base_url=f'http://{rabbitmq.RABBITMQ_HOST}:{rabbitmq.RABBITMQ_WEB_PORT}',
+        auth=(rabbitmq.RABBITMQ_DEFAULT_USER, rabbitmq.RABBITMQ_DEFAULT_PASS)
+    ) as client:
+        for policy in topology.policies:
+            response = await client.put(
+                f'/api/policies/{quote("/", safe="")}/{quote(policy["name"], safe="")}',
+                json={
+                    'pattern': policy['pattern'],
+                    'definition': policy['definition'],
+                    'priority': policy.get('priority', 0),
+                    'apply-to': policy.get('apply-to', 'queues')
+                }
+            )
+            response.raise_for_status()
+            print(f'policy {policy["name"]} is applied')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
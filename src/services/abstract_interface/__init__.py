@@ -1,4 +1,13 @@
 from .abstract_broker import AbstractBroker
+from .abstract_key_ring import AbstractKeyRing
+from .abstract_password_hasher import (
+    AbstractPasswordHasher,
+    PasswordHasherBusyError
+)
+from .abstract_payload_cache import AbstractPayloadCache
+from .abstract_revocation_filter import AbstractRevocationFilter
+from .abstract_token_buckets import AbstractTokenBuckets
+from .abstract_notification_listener import AbstractNotificationListener
 from .abstract_memory_storage import (
     SetType,
     AbstractMemoryStorage,
@@ -7,16 +16,25 @@ from .abstract_memory_storage import (
 from .abstract_repository import (
     AbstractRepository,
     AbstractUserRepository,
-    AbstractUserHistoryRepository
+    AbstractUserHistoryRepository,
+    AbstractOutboxRepository
 )
 
 
 __all__ = [
     'SetType',
     'AbstractBroker',
+    'AbstractKeyRing',
+    'AbstractPasswordHasher',
+    'PasswordHasherBusyError',
+    'AbstractPayloadCache',
+    'AbstractRevocationFilter',
+    'AbstractTokenBuckets',
+    'AbstractNotificationListener',
     'AbstractMemoryStorage',
     'AbstractReadlockMemoryStorage',
     'AbstractRepository',
     'AbstractUserRepository',
-    'AbstractUserHistoryRepository'
+    'AbstractUserHistoryRepository',
+    'AbstractOutboxRepository'
 ]
@@ -0,0 +1,20 @@
+import abc
+import typing as tp
+
+
+class AbstractKeyRing(abc.ABC):
+    """
+    Keys of jwt tokens. Active key signs new tokens, all keys of ring verify
+    tokens. Public keys are published as JWKS, so other services can verify
+    tokens without calls to this service
+    """
+    jwks_json: bytes
+    jwks_etag: str
+
+    @abc.abstractmethod
+    def encode(self, payload: dict) -> str:
+        pass
+
+    @abc.abstractmethod
+    def decode(self, token: tp.Union[str, bytes]) -> dict:
+        pass
@@ -1,6 +1,8 @@
 import abc
 import typing as tp
 
+from src.services import entities as et
+
 
 SetType = tp.Union[int, float, str, bytes, bytearray]
 
@@ -16,6 +18,11 @@ class AbstractReadlockMemoryStorage(abc.ABC):
 
 
 class AbstractMemoryStorage(abc.ABC):
+    revoked_keys_name: str = 'revoked_keys'
+    token_generation_name: str = 'token_generation'
+    sessions_name: str = 'sessions'
+    user_status_name: str = 'user_status'
+    rate_limiter_name: str = 'rate_limiter'
 
     @abc.abstractmethod
     async def get_time(self) -> float:
@@ -33,6 +40,99 @@ class AbstractMemoryStorage(abc.ABC):
     async def delete_one(self, key: str) -> None:
         pass
 
+    @abc.abstractmethod
+    async def consume(self, key: str) -> bool:
+        """
+        Atomically delete 'key', returns False if 'key' doesn't exist
+        """
+        pass
+
+    @abc.abstractmethod
+    async def add_session(self, user_id: str, session_id: str, token: str, ex: int) -> None:
+        pass
+
+    @abc.abstractmethod
+    async def rotate_session(self,
+                             user_id: str,
+                             session_id: str,
+                             token: str,
+                             new_token: str,
+                             ex: int) -> bool:
+        """
+        Atomically replace current 'token' of session by 'new_token', returns
+        False if session doesn't exist. If 'token' isn't current token of
+        session, then it's reused and the whole session is revoked
+        """
+        pass
+
+    @abc.abstractmethod
+    async def delete_session(self, user_id: str, session_id: str, token: str) -> bool:
+        pass
+
+    @abc.abstractmethod
+    async def delete_sessions(self, user_id: str) -> None:
+        pass
+
+    @abc.abstractmethod
+    async def revoke(self, key: str, value: SetType, ex: int) -> None:
+        pass
+
+    @abc.abstractmethod
+    async def get_generation(self, user_id: str) -> int:
+        pass
+
+    @abc.abstractmethod
+    async def get_user_status(self, user_id: str) -> tp.Optional[et.UserStatus]:
+        pass
+
+    @abc.abstractmethod
+    async def add_user_status(self, user_id: str, status: et.UserStatus, ex: int) -> None:
+        """
+        Save status loaded from repository, if status already exists, then
+        it isn't changed, because it's saved by writer and can be newer
+        """
+        pass
+
+    @abc.abstractmethod
+    async def set_user_status(self, user_id: str, status: et.UserStatus, ex: int) -> int:
+        """
+        Save status after user update, increase version of status and
+        notify revocation filters, returns new version
+        """
+        pass
+
+    @abc.abstractmethod
+    async def throttle(self,
+                       key: str,
+                       interval: float,
+                       tolerance: float,
+                       quantity: int = 1) -> tp.Tuple[int, float]:
+        """
+        Take up to 'quantity' tokens of 'key', one token is allowed every
+        'interval' seconds with burst up to 'tolerance' seconds. Returns count
+        of granted tokens and seconds until next token is allowed, if nothing
+        is granted
+        """
+        pass
+
+    @abc.abstractmethod
+    async def get_revocation_state(self,
+                                   user_ids: tp.List[str],
+                                   keys: tp.List[str]) -> tp.Tuple[tp.List[int], tp.List[bool]]:
+        """
+        Get generations of 'user_ids' and flags of revoked 'keys' by one
+        request to memory storage
+        """
+        pass
+
+    @abc.abstractmethod
+    async def bump_generation(self, user_id: str, ex: int) -> None:
+        pass
+
+    @abc.abstractmethod
+    async def touch_generation(self, user_id: str, ex: int) -> None:
+        pass
+
     @abc.abstractmethod
     def readlock(self, name: str, timeout: int = 5) -> AbstractReadlockMemoryStorage:
         pass
@@ -0,0 +1,20 @@
+import abc
+
+
+class AbstractNotificationListener(abc.ABC):
+    """
+    Listener of notifications of one channel of database. 'wait' returns
+    True, if notification was received, or False after 'timeout' seconds,
+    notifications received while nobody waits are merged into one
+    """
+    @abc.abstractmethod
+    async def start(self) -> None:
+        pass
+
+    @abc.abstractmethod
+    async def stop(self) -> None:
+        pass
+
+    @abc.abstractmethod
+    async def wait(self, timeout: float) -> bool:
+        pass
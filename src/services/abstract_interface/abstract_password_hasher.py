@@ -0,0 +1,30 @@
+import abc
+import typing as tp
+
+
+class PasswordHasherBusyError(TimeoutError):
+    """
+    Hasher can't take new call, because too many calls are pending
+    """
+
+
+class AbstractPasswordHasher(abc.ABC):
+    @abc.abstractmethod
+    async def hash(self, secret: str) -> str:
+        pass
+
+    @abc.abstractmethod
+    async def verify(self, secret: str, hashed: str) -> bool:
+        pass
+
+    @abc.abstractmethod
+    async def verify_and_update(self, secret: str, hashed: str) -> tp.Tuple[bool, tp.Optional[str]]:
+        """
+        Verify secret, if hash is valid, but it's deprecated or has other
+        rounds, then also return new hash, else None
+        """
+        pass
+
+    @abc.abstractmethod
+    def close(self) -> None:
+        pass
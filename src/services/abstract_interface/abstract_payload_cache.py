@@ -0,0 +1,21 @@
+import abc
+import typing as tp
+
+from src.services import entities as et
+
+
+class AbstractPayloadCache(abc.ABC):
+    """
+    In-process cache of decoded and validated jwt payloads. If 'get' returns
+    None, then token need to be decoded and result can be saved by 'set'
+    """
+    hits: int
+    misses: int
+
+    @abc.abstractmethod
+    def get(self, token: str) -> tp.Optional[et.JWTPayload]:
+        pass
+
+    @abc.abstractmethod
+    def set(self, token: str, payload: et.JWTPayload) -> None:
+        pass
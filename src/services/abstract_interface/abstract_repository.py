@@ -5,6 +5,8 @@ from pydantic import BaseModel
 
 from src.services import entities as et
 
+from .abstract_broker import AbstractBroker
+
 
 class AbstractRepository(abc.ABC):
     pydantic_model: BaseModel
@@ -42,6 +44,14 @@ class AbstractUserRepository(AbstractRepository, abc.ABC):
     pydantic_model = et.UserDTO
     pydantic_create_model = et.UserRequestDTO
 
+    @abc.abstractmethod
+    async def replace_password_hash(self, pk: tp.Any, old_hash: str, new_hash: str) -> bool:
+        """
+        Replace hash of password, only if user still has 'old_hash', so hash
+        of changed password isn't overwritten. Return True, if hash is replaced
+        """
+        pass
+
 
 class AbstractUserHistoryRepository(AbstractRepository, abc.ABC):
     pydantic_model = et.UserHistory
@@ -60,3 +70,37 @@ class AbstractUserHistoryRepository(AbstractRepository, abc.ABC):
                 )
             )
         return await self.add_many(result)
+
+
+class AbstractOutboxRepository(AbstractRepository, abc.ABC):
+    """
+    Messages of broker, they are saved in transaction of business data and
+    published by outbox relay. Every insert notifies channel 'channel_name'
+    """
+    pydantic_model = et.OutboxMessage
+    pydantic_create_model = et.OutboxMessageDTO
+    channel_name: str = 'outbox'
+
+    async def email_reg(self, schema: et.BrokerUserReg) -> pydantic_model:
+        return await self.add(self.pydantic_create_model(
+            queue=AbstractBroker.user_reg_queue_name,
+            payload=schema.model_dump_json()
+        ))
+
+    async def email_upd(self, schema: et.BrokerUserEmailUpdate) -> pydantic_model:
+        return await self.add(self.pydantic_create_model(
+            queue=AbstractBroker.user_email_upd_queue_name,
+            payload=schema.model_dump_json()
+        ))
+
+    @abc.abstractmethod
+    async def take(self, limit: int) -> tp.List[pydantic_model]:
+        """
+        Lock up to 'limit' the oldest messages, messages locked by other
+        transactions are skipped
+        """
+        pass
+
+    @abc.abstractmethod
+    async def remove_many(self, pks: tp.List[tp.Any]) -> None:
+        pass
@@ -0,0 +1,53 @@
+import abc
+import typing as tp
+
+from src.services import entities as et
+
+
+class AbstractRevocationFilter(abc.ABC):
+    """
+    In-process filter of revoked keys. If 'might_be_revoked' returns False,
+    then key is not revoked for sure, else need to check memory storage.
+    Also it's short-lived cache of users token generations, if 'get_generation'
+    returns None, then need to get generation from memory storage. The same
+    for statuses of users.
+    """
+    @abc.abstractmethod
+    def might_be_revoked(self, key: str) -> bool:
+        pass
+
+    @abc.abstractmethod
+    def add(self, key: str) -> None:
+        pass
+
+    @abc.abstractmethod
+    def get_generation(self, user_id: str) -> tp.Optional[int]:
+        pass
+
+    @abc.abstractmethod
+    def set_generation(self, user_id: str, generation: int) -> None:
+        pass
+
+    @abc.abstractmethod
+    def discard_generation(self, user_id: str) -> None:
+        pass
+
+    @abc.abstractmethod
+    def get_user_status(self, user_id: str) -> tp.Optional[et.UserStatus]:
+        pass
+
+    @abc.abstractmethod
+    def set_user_status(self, user_id: str, status: et.UserStatus) -> None:
+        pass
+
+    @abc.abstractmethod
+    def discard_user_status(self, user_id: str) -> None:
+        pass
+
+    @abc.abstractmethod
+    async def start(self) -> None:
+        pass
+
+    @abc.abstractmethod
+    async def stop(self) -> None:
+        pass
@@ -0,0 +1,20 @@
+import abc
+import typing as tp
+
+
+class AbstractTokenBuckets(abc.ABC):
+    """
+    In-process buckets of tokens leased from memory storage. If 'take'
+    returns None, then bucket is empty and need to lease new tokens
+    """
+    @abc.abstractmethod
+    def take(self, key: str) -> tp.Optional[float]:
+        """
+        Returns 0 if token is taken, seconds until next token is allowed if
+        lease was denied, None if bucket is empty
+        """
+        pass
+
+    @abc.abstractmethod
+    def put(self, key: str, tokens: int, retry_after: float, ttl: float) -> None:
+        pass
@@ -10,11 +10,16 @@ from .user_entity import (
     UserUpdatePassword,
     UserEmailPasswordDTO,
     UserUsernamePasswordDTO,
+    UserStatus,
 )
 from .user_history_entity import (
     UserHistory,
     UserHistoryDTO
 )
+from .outbox_entity import (
+    OutboxMessage,
+    OutboxMessageDTO
+)
 from .broker_entity import (
     BrokerUserReg,
     BrokerUserEmailUpdate
@@ -23,7 +28,10 @@ from .auth_entity import (
     JWTToken,
     JWTRefreshToken,
     JWTTypeToken,
-    JWTPayload
+    JWTPayload,
+    JWTIntrospectRequest,
+    JWTIntrospectResult,
+    JWTIntrospectResponse
 )
 
 
@@ -44,12 +52,18 @@ __all__ = [
     'UserUpdatePassword',
     'UserEmailPasswordDTO',
     'UserUsernamePasswordDTO',
+    'UserStatus',
+    'OutboxMessage',
+    'OutboxMessageDTO',
     'BrokerUserReg',
     'BrokerUserEmailUpdate',
     'JWTToken',
     'JWTRefreshToken',
     'JWTTypeToken',
     'JWTPayload',
+    'JWTIntrospectRequest',
+    'JWTIntrospectResult',
+    'JWTIntrospectResponse',
 
     'LoginType',
     'UserUpdateType'
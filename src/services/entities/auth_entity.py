@@ -1,13 +1,20 @@
 from datetime import datetime
 from uuid import UUID
 from enum import Enum
+from typing import (
+    List,
+    Optional
+)
 
 from pydantic import (
+    Field,
     BaseModel,
     field_validator,
     ConfigDict
 )
 
+from src.core.config import get_config
+
 
 class JWTToken(BaseModel):
     access_token: str
@@ -30,8 +37,38 @@ class JWTPayload(BaseModel):
     type: JWTTypeToken
     exp: datetime
     iat: float
+    # generation of user tokens, tokens issued before generations don't have it
+    gen: Optional[int] = None
+    # session of refresh-tokens, tokens issued before sessions don't have it
+    sid: Optional[str] = None
 
     def model_payload(self) -> dict:
         data = self.model_dump()
         data['user_id'] = data['user_id'].hex
         return data
+
+
+class JWTIntrospectRequest(BaseModel):
+    tokens: List[str] = Field(min_length=1)
+
+    @field_validator('tokens', mode='before')
+    @classmethod
+    def check_count(cls, value):
+        """
+        Count of tokens is checked before tokens are validated, limit is
+        'INTROSPECT_MAX_TOKENS'
+        """
+        if isinstance(value, list) and len(value) > get_config().INTROSPECT_MAX_TOKENS:
+            raise ValueError('Too many tokens!')
+        return value
+
+
+class JWTIntrospectResult(BaseModel):
+    active: bool
+    user_id: Optional[UUID] = None
+    exp: Optional[datetime] = None
+    detail: Optional[str] = None
+
+
+class JWTIntrospectResponse(BaseModel):
+    results: List[JWTIntrospectResult]
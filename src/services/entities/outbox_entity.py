@@ -0,0 +1,22 @@
+import datetime
+import typing as tp
+from uuid import UUID
+
+from pydantic import (
+    BaseModel,
+    ConfigDict
+)
+
+
+class OutboxMessage(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: tp.Optional[UUID] = None
+    queue: tp.Optional[str] = None
+    payload: tp.Optional[str] = None
+    dt_update: tp.Optional[datetime.datetime] = None
+    dt_created: tp.Optional[datetime.datetime] = None
+
+
+class OutboxMessageDTO(BaseModel):
+    queue: str
+    payload: str
@@ -84,9 +84,6 @@ class UserRequestDTO(UserEmailDTO, UserUsernameDTO):
         min_length=min_len_pass,
         max_length=max_len_pass
     )
-    is_superuser: Optional[bool] = Field(
-        default=False
-    )
 
 
 class UserResponseDTO(UserEmailDTO, UserUsernameDTO):
@@ -103,3 +100,19 @@ class UserUpdatePassword(BaseModel):
         min_length=min_len_pass,
         max_length=max_len_pass
     )
+
+
+class UserStatus(BaseModel):
+    is_active: bool
+    is_deleted: bool
+    is_superuser: bool
+    # count of status updates, it's increased by memory storage
+    version: int = 0
+
+    @classmethod
+    def from_user(cls, user: UserDTO) -> 'UserStatus':
+        return cls(
+            is_active=bool(user.is_active),
+            is_deleted=bool(user.is_deleted),
+            is_superuser=bool(user.is_superuser)
+        )
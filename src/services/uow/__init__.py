@@ -2,7 +2,8 @@ from .redis_uow import RedisUOW
 from .rabbitmq_uow import RabbitmqUOW
 from .repository_uow import (
     UserServiceRepositoryUOW,
-    AuthServiceRepositoryUOW
+    AuthServiceRepositoryUOW,
+    OutboxRepositoryUOW
 )
 
 
@@ -10,5 +11,6 @@ __all__ = [
     'RedisUOW',
     'RabbitmqUOW',
     'UserServiceRepositoryUOW',
-    'AuthServiceRepositoryUOW'
+    'AuthServiceRepositoryUOW',
+    'OutboxRepositoryUOW'
 ]
@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker
 )
 
+from src.core.timing_core import stage_timer
 from src.services import abstract_interface
 
 
@@ -15,11 +16,12 @@ class AbstractUOW(abc.ABC):
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if exc_type:
-            await self.rollback()
-        else:
-            await self.commit()
-        await self.close()
+        with stage_timer(f'uow.{type(self).__name__}'):
+            if exc_type:
+                await self.rollback()
+            else:
+                await self.commit()
+            await self.close()
 
     @abc.abstractmethod
     async def commit(self) -> None:
@@ -59,7 +61,12 @@ class AbstractBrokerUOW(AbstractUOW, abc.ABC):
 class AbstractUserServiceRepositoryUOW(SQLAlchemyAdapterUOW, abc.ABC):
     user: abstract_interface.AbstractUserRepository
     user_history: abstract_interface.AbstractUserHistoryRepository
+    outbox: abstract_interface.AbstractOutboxRepository
 
 
 class AbstractAuthServiceRepositoryUOW(SQLAlchemyAdapterUOW, abc.ABC):
     user: abstract_interface.AbstractUserRepository
+
+
+class AbstractOutboxRepositoryUOW(SQLAlchemyAdapterUOW, abc.ABC):
+    outbox: abstract_interface.AbstractOutboxRepository
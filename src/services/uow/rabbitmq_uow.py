@@ -1,26 +1,43 @@
 import typing as tp
 
-from aio_pika import RobustChannel
-
-from src.infrastructure.broker import RabbitmqBroker
+from src.infrastructure.broker import (
+    RabbitmqBroker,
+    RabbitmqTopology,
+    RabbitmqChannelPool
+)
 from src.services.uow.abstract_uow import AbstractBrokerUOW
 
 
 class RabbitmqUOW(AbstractBrokerUOW):
-    def __init__(self, channel: RobustChannel):
-        self.channel = channel
-        self.tx = channel.transaction()
+    """
+    Unit of work of broker, how it works:
+    1. Messages are buffered by broker, no channel is used until commit
+    2. On commit channel in confirm mode is taken from pool, buffered messages
+       are published and confirms are awaited in bulk
+    3. On rollback buffered messages are dropped
+    Outbox relay enters unit of work after transaction of outbox, so messages
+    are confirmed before they are removed from outbox
+    """
+    def __init__(self, channel_pool: RabbitmqChannelPool, topology: RabbitmqTopology):
+        self.channel_pool = channel_pool
+        self.topology = topology
 
     async def __aenter__(self) -> tp.Self:
-        await self.tx.select()
-        self.broker = RabbitmqBroker(self.channel)
+        self.broker = RabbitmqBroker(self.topology)
         return self
 
     async def commit(self) -> None:
-        await self.tx.commit()
+        if not self.broker.messages:
+            return
+
+        channel = await self.channel_pool.acquire()
+        try:
+            await self.broker.publish(channel)
+        finally:
+            await self.channel_pool.release(channel)
 
     async def rollback(self) -> None:
-        await self.tx.rollback()
+        self.broker.clear()
 
     async def close(self) -> None:
-        await self.channel.close()
+        self.broker.clear()
@@ -2,20 +2,25 @@ import typing as tp
 
 from redis.asyncio import Redis
 
-from src.infrastructure.memory_storage import RedisMemoryStorage
+from src.infrastructure.memory_storage import (
+    RedisScripts,
+    RedisMemoryStorage
+)
 from src.services.uow.abstract_uow import AbstractMemoryStorageUOW
 
 
 class RedisUOW(AbstractMemoryStorageUOW):
 
-    def __init__(self, redis: Redis):
+    def __init__(self, redis: Redis, scripts: RedisScripts):
         self.redis = redis
+        self.scripts = scripts
         self.pipeline = redis.pipeline(transaction=True)
 
     async def __aenter__(self) -> tp.Self:
         self.storage = RedisMemoryStorage(
             redis=self.redis,
-            pipeline=self.pipeline
+            pipeline=self.pipeline,
+            scripts=self.scripts
         )
         return self
 
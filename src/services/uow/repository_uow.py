@@ -2,11 +2,13 @@ import typing as tp
 
 from src.infrastructure.repository import (
     UserRepository,
-    UserHistoryRepository
+    UserHistoryRepository,
+    OutboxRepository
 )
 from src.services.uow.abstract_uow import (
     AbstractUserServiceRepositoryUOW,
-    AbstractAuthServiceRepositoryUOW
+    AbstractAuthServiceRepositoryUOW,
+    AbstractOutboxRepositoryUOW
 )
 
 
@@ -14,6 +16,7 @@ class UserServiceRepositoryUOW(AbstractUserServiceRepositoryUOW):
     async def __aenter__(self) -> tp.Self:
         self.user = UserRepository(self.session)
         self.user_history = UserHistoryRepository(self.session)
+        self.outbox = OutboxRepository(self.session)
         return self
 
 
@@ -21,3 +24,9 @@ class AuthServiceRepositoryUOW(AbstractAuthServiceRepositoryUOW):
     async def __aenter__(self) -> tp.Self:
         self.user = UserRepository(self.session)
         return self
+
+
+class OutboxRepositoryUOW(AbstractOutboxRepositoryUOW):
+    async def __aenter__(self) -> tp.Self:
+        self.outbox = OutboxRepository(self.session)
+        return self
@@ -1,9 +1,15 @@
 from .user_use_case import UserService
-from .rate_limiter_use_case import RateLimiterService
+from .rate_limiter_use_case import (
+    PolicyMatcher,
+    RateLimiterService
+)
 from .auth_use_case import AuthService
+from .outbox_relay_use_case import OutboxRelay
 
 __all__ = [
     'UserService',
+    'PolicyMatcher',
     'RateLimiterService',
-    'AuthService'
+    'AuthService',
+    'OutboxRelay'
 ]
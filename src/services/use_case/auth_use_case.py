@@ -1,21 +1,33 @@
 import asyncio
-import inspect
+import logging
+import secrets
 from uuid import UUID
-from typing import Union
+from typing import (
+    Set,
+    Dict,
+    List,
+    Union,
+    Optional
+)
 from datetime import (
     datetime,
     timedelta
 )
 
-import jwt
 from jwt.exceptions import (
     ExpiredSignatureError,
-    InvalidSignatureError
+    InvalidTokenError
 )
-from passlib.context import CryptContext
 
 from src.core.config import DefaultSettings
+from src.services.abstract_interface import (
+    AbstractKeyRing,
+    AbstractPayloadCache,
+    AbstractPasswordHasher,
+    AbstractRevocationFilter
+)
 from src.endpoints.exceptions import (
+    AbstractHTTPException,
     UnauthorizedHTTPException,
     UserNotFoundHTTPException,
     TokenInvalidHTTPException,
@@ -24,6 +36,7 @@ from src.endpoints.exceptions import (
     TokenLogoutHTTPException,
     TokenTypeInvalidHTTPException,
     NeedEmailVerifyHTTPException,
+    ForbiddenHTTPException,
 )
 from src.services.entities import (
     UserDTO,
@@ -31,6 +44,7 @@ from src.services.entities import (
     JWTPayload,
     JWTTypeToken,
     JWTRefreshToken,
+    UserStatus,
     LoginType,
 )
 from src.services.uow.abstract_uow import (
@@ -39,14 +53,26 @@ from src.services.uow.abstract_uow import (
 )
 
 
+logger = logging.getLogger(__name__)
+
+
 class AuthService:
+    # references of running background tasks, event loop keeps only weak ones
+    background_tasks: Set[asyncio.Task] = set()
+
     def __init__(self,
                  config: DefaultSettings,
-                 crypt_context: CryptContext,
+                 crypt_context: AbstractPasswordHasher,
+                 revocation_filter: AbstractRevocationFilter,
+                 key_ring: AbstractKeyRing,
+                 payload_cache: AbstractPayloadCache,
                  memory_uow: AbstractMemoryStorageUOW,
                  repository_uow: AbstractAuthServiceRepositoryUOW) -> None:
         self.config = config
         self.crypt_context = crypt_context
+        self.revocation_filter = revocation_filter
+        self.key_ring = key_ring
+        self.payload_cache = payload_cache
         self.memory_uow = memory_uow
         self.repository_uow = repository_uow
 
@@ -60,9 +86,13 @@ class AuthService:
         3. If user isn't active, then we check time registration, if less
            'REG_EXP_TIME', then call error 'Need verify email!', else
            'Incorrect username or password!'
-        4. Create access and refresh token
-        5. Save refresh-token in memory storage
-        6. Return token
+        4. Create access and refresh token with current generation of user tokens
+           and new session
+        5. Save session with refresh-token in memory storage, prolong generation
+        6. If password hash is deprecated, then save new hash in background task,
+           so response doesn't wait for it. Hash is saved only if it wasn't
+           changed after login
+        7. Return token
         """
         async with self.repository_uow as repo, self.memory_uow as mem:
             credentials = schema.model_dump(exclude={'password'})
@@ -71,7 +101,8 @@ class AuthService:
             if not user or user.is_deleted:
                 raise UserNotFoundHTTPException
 
-            if not self.crypt_context.verify(schema.password, user.hashed_password):
+            valid, new_hash = await self.crypt_context.verify_and_update(schema.password, user.hashed_password)
+            if not valid:
                 raise UnauthorizedHTTPException
 
             if not user.is_active:
@@ -79,12 +110,23 @@ class AuthService:
                 if expire.total_seconds() < self.config['REG_EXP_TIME']:
                     raise NeedEmailVerifyHTTPException
                 raise UnauthorizedHTTPException
-            token = self._get_access_and_refresh_token(user.id)
+            generation = await mem.storage.get_generation(user.id.hex)
+            session_id = self._get_session_id()
+            token = self._get_access_and_refresh_token(user.id, generation, session_id)
+
+            await asyncio.gather(
+                mem.storage.add_session(user_id=user.id.hex,
+                                        session_id=session_id,
+                                        token=token.refresh_token,
+                                        ex=self.config['REFRESH_EXP_TIME']),
+                mem.storage.touch_generation(user.id.hex, self.config['ACCESS_EXP_TIME'])
+            )
 
-            await mem.storage.set(name=token.refresh_token,
-                                  value=user.id.hex,
-                                  ex=self.config['REFRESH_EXP_TIME'])
-            return token
+        if new_hash is not None:
+            task = asyncio.create_task(self._update_password_hash(user.id, user.hashed_password, new_hash))
+            self.background_tasks.add(task)
+            task.add_done_callback(self.background_tasks.discard)
+        return token
 
     async def verify_token(self, token: str) -> JWTPayload:
         """
@@ -92,55 +134,134 @@ class AuthService:
         1. Get payload
         2. Check token type if type isn't access, then call error
            'Bad jwt token!'
-        3. Get value in memory storage, if value isn't none, then call
-           error 'Bad jwt token!'
-        4. Return payload
+        3. If token has generation, then compare it with current generation
+           of user tokens, if it is less, then call error 'Bad jwt token!'
+        4. If token was issued before generations, then check token in
+           revocation filter, if token might be revoked, then get value in
+           memory storage, if value isn't none, then call error 'Bad jwt token!'
+        5. Return payload
+        """
+        result, = await self.verify_tokens([token])
+        if isinstance(result, AbstractHTTPException):
+            raise result
+        return result
+
+    async def verify_superuser(self, user_id: UUID) -> None:
+        """
+        Check status of user from caches, if user isn't superuser or is deleted,
+        then call error 'Permission denied!'
         """
         async with self.memory_uow as mem:
-            payload = self._get_payload(token)
-            if payload.type != JWTTypeToken.access:
-                raise TokenTypeInvalidHTTPException
+            status = await self._get_user_status(mem, user_id)
+        if status is None or status.is_deleted or not status.is_superuser:
+            raise ForbiddenHTTPException
 
-            value = await mem.storage.get(token)
-            if value is not None:
-                raise TokenInvalidHTTPException
-            return payload
+    async def verify_tokens(self, tokens: List[str]) -> List[Union[JWTPayload, AbstractHTTPException]]:
+        """
+        Verify batch of tokens like 'verify_token', how it works:
+        1. Get payload and check type of every token, invalid token gets error
+        2. Get generations of users from revocation filter, collect users
+           without cached generation and tokens issued before generations,
+           which might be revoked
+        3. Get collected generations and revoked tokens from memory storage
+           by one request and cache generations
+        4. Return payload or error for every token in the same order
+        """
+        results: List[Union[JWTPayload, AbstractHTTPException]] = []
+        for token in tokens:
+            try:
+                payload = self._get_payload(token)
+                if payload.type != JWTTypeToken.access:
+                    raise TokenTypeInvalidHTTPException
+                results.append(payload)
+            except AbstractHTTPException as e:
+                results.append(e)
+
+        generations: Dict[str, int] = {}
+        user_ids: List[str] = []
+        keys: List[str] = []
+        for token, result in zip(tokens, results):
+            if isinstance(result, AbstractHTTPException):
+                continue
+
+            if result.gen is None:
+                if self.revocation_filter.might_be_revoked(token):
+                    keys.append(token)
+                continue
+
+            user_id = result.user_id.hex
+            if user_id in generations or user_id in user_ids:
+                continue
+            generation = self.revocation_filter.get_generation(user_id)
+            if generation is None:
+                user_ids.append(user_id)
+            else:
+                generations[user_id] = generation
+
+        revoked = set()
+        if user_ids or keys:
+            async with self.memory_uow as mem:
+                loaded, flags = await mem.storage.get_revocation_state(user_ids, keys)
+            for user_id, generation in zip(user_ids, loaded):
+                self.revocation_filter.set_generation(user_id, generation)
+                generations[user_id] = generation
+            revoked = {key for key, flag in zip(keys, flags) if flag}
+
+        for i, (token, result) in enumerate(zip(tokens, results)):
+            if isinstance(result, AbstractHTTPException):
+                continue
+            if result.gen is None:
+                if token in revoked:
+                    results[i] = TokenInvalidHTTPException()
+            elif result.gen < generations[result.user_id.hex]:
+                results[i] = TokenInvalidHTTPException()
+        return results
 
     async def refresh_token(self, token: JWTRefreshToken) -> JWTToken:
         """
         Refresh token, how it works:
         1. Get payload and check your type. If your type isn't refresh-type,
            then call error 'Bad Jwt token!'
-        2. Create readlock for memory storage
-        3. Get from memory storage refresh-token value. If value is None, then
-           call error 'Bad Jwt token!'
-        4. Check value is deleted?. If token is deleted, then call error 'Bad Jwt token!'
-        5. Check user. If user is deleted, then call error 'Token is deleted!'
-        6. Create new access and refresh token
-        7. Delete old refresh-token and save new token
+        2. Check status of user. If user is deleted, then call error 'Token is deleted!'
+        3. Create new access and refresh token with current generation
+           in the same session
+        4. Atomically replace old refresh-token by new one in session.
+           If session doesn't exist (it's logged out or deleted), then call
+           error 'Bad Jwt token!'. If old refresh-token is already used, then
+           it's stolen or replayed, so the whole session is revoked and call
+           error 'Bad Jwt token!'
+        5. If refresh-token was issued before sessions, then delete it
+           and start new session
+        6. Prolong generation
         """
-        async with self.repository_uow as repo, self.memory_uow as mem:
-            payload = self._get_payload(token.refresh_token)
-            user_id = payload.user_id
-            if payload.type != JWTTypeToken.refresh:
-                raise TokenTypeInvalidHTTPException
-
-            func_name = inspect.currentframe().f_code.co_name
-            async with mem.storage.readlock(func_name + user_id.hex):
-                value = await mem.storage.get(token.refresh_token)
-                if value is None:
+        payload = self._get_payload(token.refresh_token)
+        user_id = payload.user_id
+        if payload.type != JWTTypeToken.refresh:
+            raise TokenTypeInvalidHTTPException
+
+        async with self.memory_uow as mem:
+            status = await self._get_user_status(mem, user_id)
+            if status is None or status.is_deleted:
+                raise TokenDeletedHTTPException
+
+            ex = self.config['REFRESH_EXP_TIME']
+            generation = await mem.storage.get_generation(user_id.hex)
+            session_id = payload.sid or self._get_session_id()
+            new_token = self._get_access_and_refresh_token(user_id, generation, session_id)
+
+            if payload.sid is None:
+                if not await mem.storage.consume(token.refresh_token):
                     raise TokenInvalidHTTPException
+                await mem.storage.add_session(user_id.hex, session_id, new_token.refresh_token, ex)
 
-                user = await repo.user.find_by_pk(user_id)
-                if not user or user.is_deleted:
-                    raise TokenDeletedHTTPException
-
-                ex = self.config['REFRESH_EXP_TIME']
-                new_token = self._get_access_and_refresh_token(user_id)
-                await asyncio.gather(
-                    mem.storage.delete_one(token.refresh_token),
-                    mem.storage.set(new_token.refresh_token, user_id.hex, ex)
-                )
+            elif not await mem.storage.rotate_session(user_id=user_id.hex,
+                                                      session_id=session_id,
+                                                      token=token.refresh_token,
+                                                      new_token=new_token.refresh_token,
+                                                      ex=ex):
+                raise TokenInvalidHTTPException
+
+            await mem.storage.touch_generation(user_id.hex, self.config['ACCESS_EXP_TIME'])
         return new_token
 
     async def logout(self, user_id: UUID, token: JWTToken) -> None:
@@ -148,10 +269,11 @@ class AuthService:
         1. Get access-payload and refresh-payload
         2. Check 'access-payload.user_id' == 'user_id' == 'refresh-payload.user_id',
            if they different, then call error 'Invalid logout'
-        3. Create readlock for memory storage
-        4. Check exist refresh-token, if not, then call error 'Bad jwt token!'
-        4. Delete old refresh token
-        5. Save access-token in memory storage
+        3. Delete session of refresh-token, if session doesn't exist or
+           refresh-token isn't current, then call error 'Bad jwt token!'
+        4. Increment generation of user tokens, so all issued access-tokens
+           are revoked. If access-token was issued before generations, then
+           save it in memory storage and revocation filter
         """
         async with self.memory_uow as mem:
             refresh_payload = self._get_payload(token.refresh_token)
@@ -160,19 +282,67 @@ class AuthService:
             if refresh_payload.user_id != access_payload.user_id != user_id:
                 raise TokenLogoutHTTPException
 
-            func_name = inspect.currentframe().f_code.co_name
-            async with mem.storage.readlock(func_name + user_id.hex):
-                if await mem.storage.get(token.refresh_token) is None:
-                    raise TokenInvalidHTTPException
+            if refresh_payload.sid is None:
+                deleted = await mem.storage.consume(token.refresh_token)
+            else:
+                deleted = await mem.storage.delete_session(user_id.hex, refresh_payload.sid, token.refresh_token)
+            if not deleted:
+                raise TokenInvalidHTTPException
 
+            tasks = [mem.storage.bump_generation(user_id.hex, self.config['ACCESS_EXP_TIME'])]
+            if access_payload.gen is None:
                 dt_ex = access_payload.exp - datetime.now(tz=access_payload.exp.tzinfo)
                 ex = int(dt_ex.total_seconds())
-                await asyncio.gather(
-                    mem.storage.delete_one(token.refresh_token),
-                    mem.storage.set(token.access_token, user_id.hex, ex)
-                )
+                tasks.append(mem.storage.revoke(token.access_token, user_id.hex, ex))
+            await asyncio.gather(*tasks)
+
+        self.revocation_filter.discard_generation(user_id.hex)
+        if access_payload.gen is None:
+            self.revocation_filter.add(token.access_token)
+
+    async def _get_user_status(self, mem: AbstractMemoryStorageUOW, user_id: UUID) -> Optional[UserStatus]:
+        """
+        Get status of user from revocation filter, else from memory storage,
+        else from repository. Status is cached on every level it was missed
+        """
+        status = self.revocation_filter.get_user_status(user_id.hex)
+        if status is not None:
+            return status
+
+        status = await mem.storage.get_user_status(user_id.hex)
+        if status is None:
+            async with self.repository_uow as repo:
+                user = await repo.user.find_by_pk(user_id)
+            if user is None:
+                return None
+
+            status = UserStatus.from_user(user)
+            await mem.storage.add_user_status(user_id.hex, status, self.config['USER_STATUS_EXP_TIME'])
 
-    def _get_access_and_refresh_token(self, user_id: UUID) -> JWTToken:
+        self.revocation_filter.set_user_status(user_id.hex, status)
+        return status
+
+    async def _update_password_hash(self, user_id: UUID, old_hash: str, new_hash: str) -> None:
+        """
+        Hash is replaced only if password wasn't changed after login, else
+        new hash of old password would undo the change
+        """
+        try:
+            async with self.repository_uow as repo:
+                if not await repo.user.replace_password_hash(user_id, old_hash, new_hash):
+                    logger.info('password hash of user %s is changed, rehash is skipped', user_id.hex)
+        except Exception as e:
+            # password is verified, old hash is updated on next login
+            logger.error('password hash of user %s is not updated: %s', user_id.hex, e)
+
+    @staticmethod
+    def _get_session_id() -> str:
+        return secrets.token_hex(8)
+
+    def _get_access_and_refresh_token(self,
+                                      user_id: UUID,
+                                      generation: int,
+                                      session_id: str) -> JWTToken:
         now = datetime.utcnow()
         timestamp = now.timestamp()
 
@@ -186,28 +356,37 @@ class AuthService:
             tmp_payload = JWTPayload(user_id=user_id,
                                      type=token_type,
                                      exp=exp,
-                                     iat=timestamp)
+                                     iat=timestamp,
+                                     gen=generation,
+                                     sid=session_id)
             token[token_type.value] = self._encode_token(tmp_payload)
 
         return JWTToken(**token)
 
     def _get_payload(self, token: Union[str | bytes]) -> JWTPayload:
+        """
+        Get payload from cache, else decode token. Only access-tokens are
+        cached, because they are sent with every request until they expire
+        """
+        payload = self.payload_cache.get(token)
+        if payload is not None:
+            return payload
+
         try:
-            payload = self._decode_token(token)
-            return JWTPayload(**payload)
+            payload = JWTPayload(**self._decode_token(token))
 
         except ExpiredSignatureError:
             raise TokenExpiredHTTPException
 
-        except InvalidSignatureError:
+        except InvalidTokenError:
             raise TokenInvalidHTTPException
 
+        if payload.type == JWTTypeToken.access:
+            self.payload_cache.set(token, payload)
+        return payload
+
     def _encode_token(self, payload: JWTPayload) -> str:
-        return jwt.encode(payload=payload.model_payload(),
-                          key=self.config['SECRET_KEY'],
-                          algorithm=self.config['TOKEN_ALGORITHM'])
+        return self.key_ring.encode(payload.model_payload())
 
     def _decode_token(self, jwt_token: Union[str | bytes]) -> dict:
-        return jwt.decode(jwt=jwt_token,
-                          key=self.config['SECRET_KEY'],
-                          algorithms=self.config['TOKEN_ALGORITHM'])
+        return self.key_ring.decode(jwt_token)
@@ -0,0 +1,72 @@
+import asyncio
+import logging
+import typing as tp
+
+from src.services.uow import abstract_uow as uow
+from src.services.abstract_interface import AbstractNotificationListener
+
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxRelay:
+    """
+    Relay of outbox messages to broker, how it works:
+    1. Wait for notification of new messages, trigger of table 'outbox' sends
+       it on commit of transaction, or 'OUTBOX_POLL_INTERVAL' seconds
+    2. Lock up to 'OUTBOX_BATCH_SIZE' the oldest messages with 'SKIP LOCKED',
+       so relays of other workers and processes take other messages
+    3. Publish messages, wait for confirms of broker, remove messages and
+       commit. If publishing fails, then transaction is rolled back and
+       messages are published again later, so delivery is at least once
+    4. Repeat step 2 while batch is full, then step 1
+    """
+    def __init__(self,
+                 config: dict,
+                 listener: AbstractNotificationListener,
+                 broker_uow: uow.AbstractBrokerUOW,
+                 repository_uow: uow.AbstractOutboxRepositoryUOW) -> None:
+        self.config = config
+        self.listener = listener
+        self.broker_uow = broker_uow
+        self.repository_uow = repository_uow
+        self.running = False
+        self.task: tp.Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self.running = True
+        await self.listener.start()
+        self.task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self.running = False
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.wait([self.task])
+        await self.listener.stop()
+
+    async def relay(self) -> int:
+        """
+        Publish one batch of messages, return count of published messages
+        """
+        async with self.repository_uow as repo, self.broker_uow as brok:
+            messages = await repo.outbox.take(self.config['OUTBOX_BATCH_SIZE'])
+            if not messages:
+                return 0
+
+            for message in messages:
+                await brok.broker.send(message.queue, message.payload)
+            await repo.outbox.remove_many([message.id for message in messages])
+        return len(messages)
+
+    async def _run(self) -> None:
+        while self.running:
+            try:
+                while await self.relay() == self.config['OUTBOX_BATCH_SIZE']:
+                    pass
+            except Exception as e:
+                logger.error('outbox relay failed: %s', e)
+                await asyncio.sleep(self.config['OUTBOX_POLL_INTERVAL'])
+                continue
+
+            await self.listener.wait(self.config['OUTBOX_POLL_INTERVAL'])
@@ -1,51 +1,182 @@
-import inspect
+import math
+import ipaddress
+import typing as tp
+from functools import lru_cache
 
 from fastapi import Request
+from pydantic import ValidationError
+from jwt.exceptions import InvalidTokenError
 
-from src.core.config import DefaultSettings
+from src.core.config import (
+    DefaultSettings,
+    RateLimitPolicy
+)
+from src.core.metrics_core import (
+    metrics,
+    RATE_LIMITER_DECISIONS_NAME
+)
 from src.endpoints.exceptions import ManyRequestsHTTPException
+from src.services.entities import (
+    JWTPayload,
+    JWTTypeToken
+)
+from src.services.abstract_interface import (
+    AbstractKeyRing,
+    AbstractPayloadCache,
+    AbstractTokenBuckets
+)
 from src.services.uow.abstract_uow import AbstractMemoryStorageUOW
 
 
+class PolicyNode:
+    __slots__ = ('children', 'policy')
+
+    def __init__(self):
+        self.children: tp.Dict[str, PolicyNode] = {}
+        self.policy: tp.Optional[RateLimitPolicy] = None
+
+
+class PolicyMatcher:
+    """
+    Prefix tree of rate limit policies, how it works:
+    1. Path of every policy is split by segments and added to tree,
+       segment '*' matches any segment
+    2. Lookup walks segments of request path and remembers the last policy,
+       so the longest prefix wins and lookup is O(path length)
+    3. If nothing matches, then default policy is returned
+    """
+    def __init__(self,
+                 policies: tp.Iterable[RateLimitPolicy],
+                 default_rate: float,
+                 default_burst: int):
+        self.default = RateLimitPolicy(path='/', rate=default_rate, burst=default_burst, by_user=True)
+        self.root = PolicyNode()
+        for policy in policies:
+            node = self.root
+            for segment in self._split(policy.path):
+                node = node.children.setdefault(segment, PolicyNode())
+            node.policy = policy
+
+    def match(self, path: str) -> RateLimitPolicy:
+        node, policy = self.root, self.default
+        for segment in self._split(path):
+            node = node.children.get(segment) or node.children.get('*')
+            if node is None:
+                break
+            if node.policy is not None:
+                policy = node.policy
+        return policy
+
+    @staticmethod
+    def _split(path: str) -> tp.List[str]:
+        return [segment for segment in path.split('/') if segment]
+
+
+@lru_cache
+def get_trusted_networks(proxies: tp.Tuple[str, ...]) -> tp.Tuple[ipaddress.IPv4Network, ...]:
+    return tuple(ipaddress.ip_network(proxy, strict=False) for proxy in proxies)
+
+
 class RateLimiterService:
     def __init__(self,
                  config: DefaultSettings,
+                 policy_matcher: PolicyMatcher,
+                 key_ring: AbstractKeyRing,
+                 payload_cache: AbstractPayloadCache,
+                 token_buckets: AbstractTokenBuckets,
                  memory_uow: AbstractMemoryStorageUOW):
-        self.period = 1
         self.config = config
+        self.policy_matcher = policy_matcher
+        self.key_ring = key_ring
+        self.payload_cache = payload_cache
+        self.token_buckets = token_buckets
         self.memory_uow = memory_uow
+        self.lease_size = config['RATE_LIMIT_LEASE_SIZE']
+        self.trusted_networks = get_trusted_networks(tuple(config['TRUSTED_PROXIES']))
 
     async def __call__(self,
                        request: Request,
                        *args,
                        **kwargs) -> None:
         """
-        __call__ makes sure that the user has not exceeded the allowed
-        number of requests per second. If the user has exceeded allowed number request, then
-        an error occurs '429 too many request'.
-        Example: if count request equal 10 and period 60 sec, then rps equal
-        1 request pre 6 second.
-        Period is const and equal to 1
+        __call__ makes sure that the client has not exceeded the allowed
+        number of requests per second. If the client has exceeded allowed number request, then
+        an error occurs '429 too many request' with header 'Retry-After'.
+        Example: if rate of policy equal 5 and burst equal 2, then one request
+        is allowed every 0.2 second and two requests can be sent at once.
+        How it works:
+        1. Match policy of route, client is user_id of access-token if policy
+           limits users, else ip of client
+        2. Take token from bucket of the worker, if token is taken, then request
+           is allowed, if bucket keeps denial, then request is rejected
+        3. Else lease up to 'RATE_LIMIT_LEASE_SIZE' tokens from memory storage by
+           one atomic script, one token is spent by request, other tokens are
+           put in bucket. If nothing is leased, then bucket keeps denial
         """
-        if not self.config['DEBUG']:
+        if self.config['DEBUG']:
+            return
+
+        policy = self.policy_matcher.match(request.url.path)
+        user_id = self._get_user_id(request) if policy.by_user else None
+        client = f'user:{user_id}' if user_id else f'ip:{self._get_client_ip(request)}'
+        key = f'{policy.path}:{client}'
+
+        source = 'local'
+        retry_after = self.token_buckets.take(key)
+        if retry_after is None:
+            source = 'memory_storage'
+            interval = 1 / policy.rate
+            # leased tokens are spent ahead, so burst is increased by size of lease
+            tolerance = interval * (policy.burst + self.lease_size - 2)
             async with self.memory_uow as mem:
-                result = True
-                ip = request.client.host
-                separation = self.period / self.config['REQUEST_PER_SECOND']
-                redis_time = await mem.storage.get_time()
-
-                func_name = inspect.currentframe().f_code.co_name
-                async with mem.storage.readlock(func_name + ip):
-                    last_request = await mem.storage.get(ip)
-                    if last_request is None:
-                        last_request = redis_time
-                    else:
-                        last_request = float(last_request)
-
-                    if last_request - redis_time <= separation:
-                        new_last_request = max(last_request, redis_time) + separation
-                        await mem.storage.set(ip, new_last_request)
-                        result = False
-
-                    if result:
-                        raise ManyRequestsHTTPException
+                granted, retry_after = await mem.storage.throttle(key, interval, tolerance, self.lease_size)
+            self.token_buckets.put(key, granted - 1, retry_after, self.lease_size * interval)
+
+        decision = 'rejected' if retry_after > 0 else 'allowed'
+        metrics.inc(RATE_LIMITER_DECISIONS_NAME, (policy.path, decision, source))
+        if retry_after > 0:
+            raise ManyRequestsHTTPException(headers={'Retry-After': str(math.ceil(retry_after))})
+
+    def _get_client_ip(self, request: Request) -> str:
+        """
+        If request is sent by trusted proxy, then client is the last address
+        of 'X-Forwarded-For', which isn't trusted proxy
+        """
+        ip = request.client.host
+        if not self._is_trusted(ip):
+            return ip
+
+        forwarded = request.headers.get('x-forwarded-for')
+        if forwarded:
+            for value in reversed(forwarded.split(',')):
+                ip = value.strip()
+                if not self._is_trusted(ip):
+                    break
+        return ip
+
+    def _is_trusted(self, ip: str) -> bool:
+        try:
+            address = ipaddress.ip_address(ip)
+        except ValueError:
+            return False
+        return any(address in network for network in self.trusted_networks)
+
+    def _get_user_id(self, request: Request) -> tp.Optional[str]:
+        """
+        Get user_id of access-token without revocation check, revoked token
+        is rejected later by AuthMiddleware
+        """
+        scheme, _, token = request.headers.get('authorization', '').partition(' ')
+        if scheme.lower() != 'bearer' or not token:
+            return None
+
+        payload = self.payload_cache.get(token)
+        if payload is None:
+            try:
+                payload = JWTPayload(**self.key_ring.decode(token))
+            except (InvalidTokenError, ValidationError):
+                return None
+            if payload.type != JWTTypeToken.access:
+                return None
+            self.payload_cache.set(token, payload)
+        return payload.user_id.hex
@@ -8,7 +8,6 @@ from typing import (
 )
 
 from fastapi import Request
-from passlib.context import CryptContext
 
 from src.core.config import API
 from src.services.entities import (
@@ -23,9 +22,14 @@ from src.services.entities import (
     UserUsernamePasswordDTO,
     BrokerUserEmailUpdate,
     BrokerUserReg,
-    JWTPayload
+    JWTPayload,
+    UserStatus
 )
 from src.services.uow import abstract_uow as uow
+from src.services.abstract_interface import (
+    AbstractPasswordHasher,
+    AbstractRevocationFilter
+)
 from src.endpoints.exceptions import (
     BadRequestHTTPException,
     InvalidPasswordHTTPException,
@@ -40,13 +44,13 @@ from src.endpoints.exceptions import (
 class UserService:
     def __init__(self,
                  config: dict,
-                 crypt_context: CryptContext,
-                 broker_uow: uow.AbstractBrokerUOW,
+                 crypt_context: AbstractPasswordHasher,
+                 revocation_filter: AbstractRevocationFilter,
                  memory_uow: uow.AbstractMemoryStorageUOW,
                  repository_uow: uow.AbstractUserServiceRepositoryUOW) -> None:
         self.config = config
         self.crypt_context = crypt_context
-        self.broker_uow = broker_uow
+        self.revocation_filter = revocation_filter
         self.memory_uow = memory_uow
         self.repository_uow = repository_uow
 
@@ -65,22 +69,22 @@ class UserService:
            error 'Username is busy!' or 'Email is busy!'.
         2. Hashed password
         3. Save user in table
-        4. Send email message for verify email
+        4. Save email message for verify email in outbox, it's sent by outbox relay
         5. Save 'is_active{separation}True' in memory storage for verify email
         """
-        async with self.repository_uow as repo, self.memory_uow as mem, self.broker_uow as brok:
+        async with self.repository_uow as repo, self.memory_uow as mem:
             # check data
             await self.available(UserEmailDTO(email=schema.email))
             await self.available(UserUsernameDTO(username=schema.username))
 
             # create user
-            schema.hashed_password = self.crypt_context.hash(schema.hashed_password)
+            schema.hashed_password = await self.crypt_context.hash(schema.hashed_password)
 
             user = await repo.user.add(schema)
             code = secrets.token_urlsafe(self.config['LENGTH_CODE'])
             link = f'{str(request.base_url)[:-1]}{API.user_email_verify_v1}/{user.id}/{code}'
             await asyncio.gather(
-                brok.broker.email_reg(BrokerUserReg(username=user.username,
+                repo.outbox.email_reg(BrokerUserReg(username=user.username,
                                                     email=user.email,
                                                     link=link)),
                 mem.storage.set(name=user.id.hex,
@@ -97,7 +101,8 @@ class UserService:
         2. Parse code 'field {separation} value {separation} code'
         3. Check url parameter 'user_code' with 'code', if they different, then
            call error 'Invalid link!'
-        4.
+        4. Update user and log changes in 'user_history' table
+        5. Save new status of user
         """
         async with self.repository_uow as repo, self.memory_uow as mem:
             code = await mem.storage.get(user_id.hex)
@@ -109,10 +114,11 @@ class UserService:
 
             user = await repo.user.find_by_pk(user_id)
             patch = UserDTO(**{field: value})
-            await asyncio.gather(
+            user_history, user = await asyncio.gather(
                 repo.user_history.patch(user, patch.model_dump(exclude_none=True)),
                 repo.user.update_by_pk(user_id, patch)
             )
+        await self._save_user_status(user)
 
     async def update_username(self,
                               user_id: UUID,
@@ -122,10 +128,11 @@ class UserService:
         2. Check available username
         3. Initialize UserDto() for update username
         4. Update user and log changes in 'user_history' table
+        5. Save new status of user
         """
         async with self.repository_uow as repo:
             user = await repo.user.find_by_pk(user_id)
-            if not self.crypt_context.verify(schema.password, user.hashed_password):
+            if not await self.crypt_context.verify(schema.password, user.hashed_password):
                 raise InvalidPasswordHTTPException
 
             await self.available(UserUsernameDTO(username=schema.username))
@@ -134,6 +141,7 @@ class UserService:
                 repo.user.update_by_pk(user.id, patch),
                 repo.user_history.patch(user, patch.model_dump(exclude_none=True))
             )
+        await self._save_user_status(user)
         return UserResponseDTO.model_validate(user.model_dump())
 
     async def update_email(self,
@@ -144,11 +152,11 @@ class UserService:
         1. Get user, check password
         2. Check available email
         3. Initialize UserDto() for update email
-        4. Send message to email and save 'email{separation}{schema.email}' in memory storage
+        4. Save message to email in outbox and 'email{separation}{schema.email}' in memory storage
         """
-        async with self.repository_uow as repo, self.memory_uow as mem, self.broker_uow as brok:
+        async with self.repository_uow as repo, self.memory_uow as mem:
             user = await repo.user.find_by_pk(user_id)
-            if not self.crypt_context.verify(schema.password, user.hashed_password):
+            if not await self.crypt_context.verify(schema.password, user.hashed_password):
                 raise InvalidPasswordHTTPException
 
             await self.available(UserEmailDTO(email=schema.email))
@@ -159,7 +167,7 @@ class UserService:
             value = self._get_code('email', schema.email, code)
             send_email = BrokerUserEmailUpdate(email=schema.email, link=link)
             await asyncio.gather(
-                brok.broker.email_upd(send_email),
+                repo.outbox.email_upd(send_email),
                 mem.storage.set(user_id.hex, value, ex)
             )
         return UserResponseDTO.model_validate(user.model_dump())
@@ -171,17 +179,19 @@ class UserService:
         1. Get user, check password
         2. Hashed password
         3. Update user and log changes in 'user_history' table
+        4. Save new status of user
         """
         async with self.repository_uow as repo:
             user = await repo.user.find_by_pk(user_id)
-            if not self.crypt_context.verify(schema.password, user.hashed_password):
+            if not await self.crypt_context.verify(schema.password, user.hashed_password):
                 raise InvalidPasswordHTTPException
 
-            patch = UserDTO(hashed_password=self.crypt_context.hash(schema.new_password))
+            patch = UserDTO(hashed_password=await self.crypt_context.hash(schema.new_password))
             user, user_history = await asyncio.gather(
                 repo.user.update_by_pk(user.id, patch),
                 repo.user_history.patch(user, patch.model_dump(exclude_none=True))
             )
+        await self._save_user_status(user)
         return UserResponseDTO.model_validate(user.model_dump())
 
     async def available(self,
@@ -218,7 +228,10 @@ class UserService:
            'User not found!'
         3. Update field 'is_deleted'
         4. Log changes in 'user_history' table
-        5. Save deleted token in memory storage
+        5. Increment generation of user tokens, if access-token was issued
+           before generations, then save it in memory storage and revocation filter
+        6. Delete all sessions of user, so all refresh-tokens are revoked
+        7. Save new status of user
         """
         user_id = payload.user_id
         async with self.repository_uow as repo, self.memory_uow as mem:
@@ -227,19 +240,60 @@ class UserService:
             if user is None or user.is_deleted:
                 raise UserNotFoundHTTPException
 
-            if not self.crypt_context.verify(schema.password, user.hashed_password):
+            if not await self.crypt_context.verify(schema.password, user.hashed_password):
                 raise InvalidPasswordHTTPException
 
             patch = UserDTO(is_deleted=True)
             patch_dict = patch.model_dump(exclude_none=True)
-            dt_ex = payload.exp - datetime.now(tz=payload.exp.tzinfo)
-            total_seconds = int(dt_ex.total_seconds())
-
-            await asyncio.gather(
+            tasks = [
                 repo.user.update_by_pk(user_id, patch),
                 repo.user_history.patch(user, patch_dict),
-                mem.storage.set(access_token, user_id.hex, total_seconds)
+                mem.storage.bump_generation(user_id.hex, self.config['ACCESS_EXP_TIME']),
+                mem.storage.delete_sessions(user_id.hex)
+            ]
+            if payload.gen is None:
+                dt_ex = payload.exp - datetime.now(tz=payload.exp.tzinfo)
+                total_seconds = int(dt_ex.total_seconds())
+                tasks.append(mem.storage.revoke(access_token, user_id.hex, total_seconds))
+            user, *_ = await asyncio.gather(*tasks)
+
+        await self._save_user_status(user)
+        self.revocation_filter.discard_generation(user_id.hex)
+        if payload.gen is None:
+            self.revocation_filter.add(access_token)
+
+    async def grant_superuser(self,
+                              schema: UserUsernameDTO) -> UserResponseDTO:
+        """
+        Make user superuser, users can't set the flag themselves, so it's
+        called only by command 'make grant_superuser USERNAME=...'
+        1. Get user, if user is None or user is deleted, then call error
+           'User not found!'
+        2. Update user and log changes in 'user_history' table
+        3. Save new status of user
+        """
+        async with self.repository_uow as repo:
+            user = await repo.user.find_one(schema.model_dump())
+            if user is None or user.is_deleted:
+                raise UserNotFoundHTTPException
+
+            patch = UserDTO(is_superuser=True)
+            user, user_history = await asyncio.gather(
+                repo.user.update_by_pk(user.id, patch),
+                repo.user_history.patch(user, patch.model_dump(exclude_none=True))
             )
+        await self._save_user_status(user)
+        return UserResponseDTO.model_validate(user.model_dump())
+
+    async def _save_user_status(self, user: UserDTO) -> None:
+        """
+        Save status of updated user in memory storage, other workers discard
+        cached status by notification of memory storage
+        """
+        status = UserStatus.from_user(user)
+        async with self.memory_uow as mem:
+            await mem.storage.set_user_status(user.id.hex, status, self.config['USER_STATUS_EXP_TIME'])
+        self.revocation_filter.discard_user_status(user.id.hex)
 
     def _get_code(self,
                   key: str,
@@ -3,8 +3,11 @@ import asyncio
 from uuid import uuid4
 
 import pytest
-from mock import AsyncMock
-from httpx import AsyncClient
+from httpx import (
+    AsyncClient,
+    ASGITransport
+)
+from asgi_lifespan import LifespanManager
 from alembic.config import Config
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
@@ -24,9 +27,9 @@ from src.core.config import (
 )
 from src.core.redis_core import get_async_redis_client
 from src.core.sqlalchemy_core import get_sync_postgres_url, get_async_postgres_url
-from src.services.uow import RabbitmqUOW
 
 from tests.utils import run_upgrade
+from tests.test_handlers.utils import INTROSPECT_CLIENT
 
 
 config = get_config()
@@ -90,11 +93,58 @@ def settings() -> DefaultSettings:
 
 
 @pytest.fixture
-async def client(migration, redis) -> AsyncClient:
+def client_settings() -> dict:
+    """
+    Settings of application, which are overridden for test, fixture is
+    overridden by test module or by parametrization:
+    @pytest.mark.parametrize('client_settings', [{'HASH_ROUNDS': 1000}])
+    """
+    return {}
+
+
+@pytest.fixture
+async def client(migration, redis, client_settings) -> AsyncClient:
     config.DEBUG = True
     config.REG_EXP_TIME = 1
     config.ACCESS_EXP_TIME = 2
     config.REFRESH_EXP_TIME = 5
-    async with AsyncClient(app=get_application(config), base_url="http://test") as app:
-        RabbitmqUOW.commit = AsyncMock(return_value=None)
+    config.INTROSPECT_CLIENTS = dict([INTROSPECT_CLIENT])
+    # relay publishes to live broker, tests of relay turn it on and patch publish
+    config.OUTBOX_RELAY = False
+    defaults = {name: getattr(config, name) for name in client_settings}
+    for name, value in client_settings.items():
+        setattr(config, name, value)
+    async with LifespanManager(get_application(config)) as manager:
+        async with AsyncClient(app=manager.app, base_url="http://test") as app:
+            yield app
+    for name, value in defaults.items():
+        setattr(config, name, value)
+
+
+@pytest.fixture
+async def limited_app(migration, redis):
+    """
+    Application with rate limiter, proxies from '10.0.0.0/8' are trusted
+    """
+    await redis.flushdb()
+    config.DEBUG = False
+    config.OUTBOX_RELAY = False
+    config.TRUSTED_PROXIES = ['10.0.0.0/8']
+    async with LifespanManager(get_application(config)) as manager:
+        yield manager.app
+    config.DEBUG = True
+    config.TRUSTED_PROXIES = []
+
+
+@pytest.fixture
+async def limited_client(limited_app) -> AsyncClient:
+    # peer '127.0.0.1' isn't trusted proxy
+    async with AsyncClient(app=limited_app, base_url="http://test") as app:
+        yield app
+
+
+@pytest.fixture
+async def proxy_client(limited_app) -> AsyncClient:
+    transport = ASGITransport(app=limited_app, client=('10.0.0.1', 123))
+    async with AsyncClient(transport=transport, base_url="http://test") as app:
         yield app
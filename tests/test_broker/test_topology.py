@@ -0,0 +1,37 @@
+import os
+import re
+
+from src.core.config import BASE_DIR
+from src.infrastructure.broker import RabbitmqTopology
+
+
+TOPOLOGY_MODULE = os.path.join('src', 'infrastructure', 'broker', 'topology.py')
+
+CONSUMER_DIR = os.path.join(BASE_DIR, 'consumer')
+
+
+class TestTopology:
+    def test_1(self):
+        """
+        Module of topology is the same in service and consumer
+        """
+        with open(os.path.join(BASE_DIR, TOPOLOGY_MODULE), 'rb') as service, \
+                open(os.path.join(CONSUMER_DIR, TOPOLOGY_MODULE), 'rb') as consumer:
+            assert service.read() == consumer.read()
+
+    def test_2(self, settings):
+        """
+        Dead-letter exchange of queue is set by policy, not by arguments
+        """
+        topology = RabbitmqTopology.from_file(os.path.join(BASE_DIR, settings.RABBITMQ.RABBITMQ_TOPOLOGY_FILE))
+        names = {queue['name'] for queue in topology.definition['queues']}
+        exchanges = {exchange['name'] for exchange in topology.definition['exchanges']}
+        for queue in topology.definition['queues']:
+            assert 'x-dead-letter-exchange' not in (queue.get('arguments') or {})
+            if f'{queue["name"]}.dead' not in names:
+                continue
+
+            policies = [policy for policy in topology.policies
+                        if re.search(policy['pattern'], queue['name'])]
+            assert len(policies) == 1
+            assert policies[0]['definition']['dead-letter-exchange'] in exchanges
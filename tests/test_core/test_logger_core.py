@@ -0,0 +1,228 @@
+import hashlib
+import logging
+import threading
+import time
+
+from src.core.logger_core import (
+    LogSampler,
+    LineBucket,
+    BatchFileHandler
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class BlockingFormatter(logging.Formatter):
+    """
+    Formatter blocks writer thread until 'release' is set, so queue of
+    handler isn't drained
+    """
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def format(self, record: logging.LogRecord) -> str:
+        self.started.set()
+        self.release.wait(5)
+        return record.getMessage()
+
+
+def get_record(message: str) -> logging.LogRecord:
+    return logging.LogRecord('test', logging.INFO, __file__, 0, message, None, None)
+
+
+def read_lines(path) -> list:
+    return path.read_text().splitlines() if path.exists() else []
+
+
+def wait_lines(path, count: int, timeout: float = 2) -> list:
+    deadline = time.monotonic() + timeout
+    while len(read_lines(path)) < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return read_lines(path)
+
+
+class TestBatchFileHandler:
+    def test_1(self, tmp_path):
+        """
+        1. Writer thread is blocked by the first record
+        2. Emit records up to size of queue                   records are queued
+        3. Emit record to full queue                          record is dropped
+        4. Release writer and close handler                   queued records are written
+        """
+        path = tmp_path / 'test.log'
+        formatter = BlockingFormatter()
+        handler = BatchFileHandler(str(path), queue_size=2, batch_size=10, flush_interval=60)
+        handler.setFormatter(formatter)
+
+        # 1. Writer thread is blocked by the first record
+        handler.emit(get_record('first'))
+        assert formatter.started.wait(2)
+
+        # 2. Emit records up to size of queue
+        handler.emit(get_record('second'))
+        handler.emit(get_record('third'))
+        assert handler.dropped == 0
+
+        # 3. Emit record to full queue
+        handler.emit(get_record('dropped'))
+        assert handler.emitted == 3
+        assert handler.dropped == 1
+
+        # 4. Release writer and close handler
+        formatter.release.set()
+        handler.close()
+        assert read_lines(path) == ['first', 'second', 'third']
+        assert handler.written == 3
+
+    def test_2(self, tmp_path):
+        """
+        1. Emit records less than batch size                  nothing is written
+        2. Emit record to complete batch                      batch is written at once
+        """
+        path = tmp_path / 'test.log'
+        handler = BatchFileHandler(str(path), queue_size=10, batch_size=3, flush_interval=60)
+
+        # 1. Emit records less than batch size
+        handler.emit(get_record('first'))
+        handler.emit(get_record('second'))
+        time.sleep(0.1)
+        assert read_lines(path) == []
+        assert handler.written == 0
+
+        # 2. Emit record to complete batch
+        handler.emit(get_record('third'))
+        assert wait_lines(path, 3) == ['first', 'second', 'third']
+        assert handler.written == 3
+        handler.close()
+
+    def test_3(self, tmp_path):
+        """
+        1. Emit record less than batch size                   nothing is written
+        2. Wait 'flush_interval'                              record is written
+        3. Emit record after flush                            it waits for new interval
+        """
+        path = tmp_path / 'test.log'
+        handler = BatchFileHandler(str(path), queue_size=10, batch_size=100, flush_interval=0.2)
+
+        # 1. Emit record less than batch size
+        handler.emit(get_record('first'))
+        time.sleep(0.05)
+        assert read_lines(path) == []
+
+        # 2. Wait 'flush_interval'
+        assert wait_lines(path, 1) == ['first']
+
+        # 3. Emit record after flush
+        handler.emit(get_record('second'))
+        time.sleep(0.05)
+        assert read_lines(path) == ['first']
+        assert wait_lines(path, 2) == ['first', 'second']
+        handler.close()
+
+
+class TestLineBucket:
+    def test_1(self):
+        """
+        1. Take all tokens of full bucket                     True
+        2. Take token from empty bucket                       False
+        3. Take token after half of second                    bucket is refilled by half of rate
+        4. Take token after long pause                        bucket isn't refilled over rate
+        """
+        clock = FakeClock()
+        bucket = LineBucket(lines_per_second=4, clock=clock)
+
+        # 1. Take all tokens of full bucket
+        assert [bucket.take() for _ in range(4)] == [True] * 4
+
+        # 2. Take token from empty bucket
+        assert bucket.take() is False
+
+        # 3. Take token after half of second
+        clock.now += 0.5
+        assert [bucket.take() for _ in range(3)] == [True, True, False]
+
+        # 4. Take token after long pause
+        clock.now += 60
+        assert [bucket.take() for _ in range(5)] == [True] * 4 + [False]
+
+
+class TestLogSampler:
+    @staticmethod
+    def get_sampler(rate: float = 0.25, clock=None, **kwargs) -> LogSampler:
+        params = dict(rate=rate,
+                      route_rates={'/v1/user/me': 1.0, '/v1/health': 0.0},
+                      slow_time=1,
+                      lines_per_second=10 ** 6,
+                      important_lines_per_second=10 ** 6,
+                      clock=clock or FakeClock())
+        params.update(kwargs)
+        return LogSampler(**params)
+
+    def test_1(self):
+        """
+        Request is sampled if hash of request id is less than rate of route,
+        decision doesn't depend on worker
+        """
+        sampler = self.get_sampler()
+        request_ids = [f'request-{i}' for i in range(4000)]
+
+        for request_id in request_ids:
+            digest = hashlib.blake2b(request_id.encode(), digest_size=8).digest()
+            expected = int.from_bytes(digest, 'big') < 0.25 * 2 ** 64
+            assert sampler.should_log(request_id, '/v1/auth/login', 200, 0.01) is expected
+            assert self.get_sampler().should_log(request_id, '/v1/auth/login', 200, 0.01) is expected
+
+        logged = len(request_ids) - sampler.sampled_out
+        assert 0.2 < logged / len(request_ids) < 0.3
+
+    def test_2(self):
+        """
+        Rate of route template overrides default rate, errors and slow
+        requests are logged regardless of rate
+        """
+        sampler = self.get_sampler(rate=0.0)
+        request_ids = [f'request-{i}' for i in range(100)]
+
+        assert not any(sampler.should_log(i, '/v1/auth/login', 200, 0.01) for i in request_ids)
+        assert all(sampler.should_log(i, '/v1/user/me', 200, 0.01) for i in request_ids)
+        assert not any(sampler.should_log(i, '/v1/health', 200, 0.01) for i in request_ids)
+        assert all(sampler.should_log(i, '/v1/health', 500, 0.01) for i in request_ids)
+        assert all(sampler.should_log(i, '/v1/health', 200, 1) for i in request_ids)
+        assert all(sampler.should_log(i, '/v1/health', None, 0.01) for i in request_ids)
+        assert sampler.sampled_out == 200
+
+    def test_3(self):
+        """
+        1. Log sampled records over lines per second          extra records are rate limited
+        2. Log errors while bucket of sampled records
+           is empty                                           errors are logged by reserved bucket
+        3. Log errors over important lines per second         extra errors are rate limited
+        4. Log after second                                   both buckets are refilled
+        """
+        clock = FakeClock()
+        sampler = self.get_sampler(rate=1.0, clock=clock, lines_per_second=2, important_lines_per_second=3)
+
+        # 1. Log sampled records over lines per second
+        assert [sampler.should_log(f'r{i}', None, 200, 0.01) for i in range(3)] == [True, True, False]
+        assert sampler.rate_limited == 1
+
+        # 2. Log errors while bucket of sampled records is empty
+        assert [sampler.should_log(f'e{i}', None, 500, 0.01) for i in range(3)] == [True] * 3
+
+        # 3. Log errors over important lines per second
+        assert sampler.should_log('slow', None, 200, 5) is False
+        assert sampler.important_rate_limited == 1
+        assert sampler.rate_limited == 1
+
+        # 4. Log after second
+        clock.now += 1
+        assert sampler.should_log('r', None, 200, 0.01) is True
+        assert sampler.should_log('e', None, 500, 0.01) is True
@@ -0,0 +1,81 @@
+import os
+import time
+
+import orjson
+
+from src.core.metrics_core import (
+    MetricsExporter,
+    MetricsRegistry
+)
+
+
+DEAD_PID = 2 ** 22 + 1
+
+
+def get_registry(value: float) -> MetricsRegistry:
+    registry = MetricsRegistry()
+    registry.counter('test_total', 'Test counter', ('label',))
+    registry.histogram('test_seconds', 'Test histogram')
+    registry.gauge('test_gauge', 'Test gauge', lambda: 7)
+    registry.inc('test_total', ('a',), value)
+    registry.observe('test_seconds', (), 0.01)
+    return registry
+
+
+def write_snapshot(directory: str, pid: int, snapshot: dict, age: float) -> None:
+    path = os.path.join(directory, f'{pid}.json')
+    with open(path, 'wb') as file:
+        file.write(orjson.dumps(snapshot))
+    os.utime(path, (time.time() - age, time.time() - age))
+
+
+def get_lines(content: bytes) -> list:
+    return [line for line in content.decode().splitlines() if not line.startswith('#')]
+
+
+class TestMetricsExporter:
+    async def test_1(self, tmp_path):
+        """
+        1. Snapshot of dead worker isn't stale yet            it's rendered, file is kept
+        2. Snapshot becomes stale                             it's folded into 'dead.json'
+        3. Render after folding                               counters and histograms are the same,
+                                                              gauge of dead worker isn't exported
+        """
+        directory = str(tmp_path)
+        exporter = MetricsExporter(directory, interval=1, stale_intervals=3, registry=get_registry(1))
+        await exporter.start()
+
+        # 1. Snapshot of dead worker isn't stale yet
+        write_snapshot(directory, DEAD_PID, get_registry(10).snapshot(), age=0)
+        before = get_lines(exporter.render(exporter.registry.snapshot()))
+        assert 'test_total{label="a"} 11.0' in before
+        assert os.path.exists(os.path.join(directory, f'{DEAD_PID}.json'))
+
+        # 2. Snapshot becomes stale
+        write_snapshot(directory, DEAD_PID, get_registry(10).snapshot(), age=10)
+        after = get_lines(exporter.render(exporter.registry.snapshot()))
+        assert not os.path.exists(os.path.join(directory, f'{DEAD_PID}.json'))
+        assert os.path.exists(os.path.join(directory, MetricsExporter.aggregate_filename))
+
+        # 3. Render after folding
+        assert 'test_total{label="a"} 11.0' in after
+        assert 'test_seconds_count 2.0' in after
+        assert f'test_gauge{{pid="{DEAD_PID}"}} 7.0' in before
+        assert not [line for line in after if line.startswith('test_gauge') and str(DEAD_PID) in line]
+        await exporter.stop()
+
+    async def test_2(self, tmp_path):
+        """
+        Stale snapshots of previous run are folded on start and added to
+        existing aggregate
+        """
+        directory = str(tmp_path)
+        write_snapshot(directory, DEAD_PID, get_registry(10).snapshot(), age=10)
+        write_snapshot(directory, DEAD_PID + 1, get_registry(5).snapshot(), age=10)
+
+        exporter = MetricsExporter(directory, interval=1, stale_intervals=3, registry=get_registry(1))
+        await exporter.start()
+        assert sorted(name for name in os.listdir(directory) if name.endswith('.json')) == \
+            [MetricsExporter.aggregate_filename]
+        assert 'test_total{label="a"} 16.0' in get_lines(exporter.render(exporter.registry.snapshot()))
+        await exporter.stop()
@@ -0,0 +1,85 @@
+import asyncio
+
+from src.services.entities import (
+    JWTToken,
+    UserUsernamePasswordDTO
+)
+
+from tests.test_handlers.utils import (
+    get_user,
+    get_user_id,
+    get_code,
+    me_handler,
+    auth_handler,
+    profile_handler,
+    set_superuser,
+    registration_handler,
+    verify_email_handler,
+)
+
+
+class TestProfileHandler:
+    async def test_1(self, client, session, redis, settings):
+        """
+        1. Create user and make him superuser   response 201
+        2. Verify user email                    response 200
+        3. Auth user                            response 200
+        4. Run profiler, send requests          response 200, stacks aren't empty
+        """
+        # 1. Create user and make him superuser
+        user = get_user()
+        response = await registration_handler(client, user)
+        assert response.status_code == 201
+        user_id = await get_user_id(session, user.username)
+        await set_superuser(session, user_id)
+
+        # 2. Verify user email
+        code = await get_code(redis, settings, user_id)
+        response = await verify_email_handler(client, user_id, code)
+        assert response.status_code == 200
+
+        # 3. Auth user
+        login = UserUsernamePasswordDTO(username=user.username, password=user.password)
+        response = await auth_handler(client, login)
+        assert response.status_code == 200
+
+        # 4. Run profiler, send requests while it's running
+        token = JWTToken.model_validate_json(response.text)
+        profile = asyncio.create_task(profile_handler(client, token.access_token, duration=1))
+        while not profile.done():
+            await asyncio.gather(*(me_handler(client, token.access_token) for _ in range(10)))
+        response = await profile
+        assert response.status_code == 200
+        assert response.headers['content-type'].startswith('text/plain')
+
+        stacks = response.text.splitlines()
+        assert stacks
+        assert all(stack.rsplit(' ', 1)[1].isdigit() for stack in stacks)
+
+    async def test_2(self, client, session, redis, settings):
+        """
+        1. Create user                response 201
+        2. Verify user email          response 200
+        3. Auth user                  response 200
+        4. Run profiler               response 403
+        """
+        # 1. Create user
+        user = get_user()
+        response = await registration_handler(client, user)
+        assert response.status_code == 201
+
+        # 2. Verify user email
+        user_id = await get_user_id(session, user.username)
+        code = await get_code(redis, settings, user_id)
+        response = await verify_email_handler(client, user_id, code)
+        assert response.status_code == 200
+
+        # 3. Auth user
+        login = UserUsernamePasswordDTO(username=user.username, password=user.password)
+        response = await auth_handler(client, login)
+        assert response.status_code == 200
+
+        # 4. Run profiler
+        token = JWTToken.model_validate_json(response.text)
+        response = await profile_handler(client, token.access_token)
+        assert response.status_code == 403
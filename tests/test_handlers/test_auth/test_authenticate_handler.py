@@ -1,5 +1,7 @@
 import json
+import asyncio
 
+import pytest
 from jwt.utils import base64url_decode
 
 from src.endpoints.exceptions import (
@@ -9,6 +11,9 @@ from src.endpoints.exceptions import (
     TokenTypeInvalidHTTPException,
     NeedEmailVerifyHTTPException,
 )
+from src.services.abstract_interface import AbstractMemoryStorage
+from src.infrastructure.password_hasher.process_pool_password_hasher import get_crypt_context
+from src.infrastructure.repository.postgres_repository import UserRepository
 from src.services.entities import (
     JWTToken,
     UserPasswordDTO,
@@ -25,6 +30,8 @@ from tests.test_handlers.utils import (
     delete_user_handler,
     registration_handler,
     verify_email_handler,
+    get_hashed_password,
+    set_hashed_password
 )
 
 
@@ -196,3 +203,92 @@ class TestAuthenticateHandler:
         response = await auth_handler(client, login)
         assert response.status_code == 400
         assert json.loads(response.text)['detail'] == UserNotFoundHTTPException().detail
+
+    @pytest.mark.parametrize('client_settings', [{'HASH_ROUNDS': 1000}])
+    async def test_6(self, client, session, redis, settings):
+        """
+        1. Create user                                        response 201
+        2. Verify email user                                  response 200
+        3. Save hash of password with other rounds
+        4. Auth user                                          response 200
+        5. Hash of password is replaced in background
+        6. Auth user                                          response 200
+        7. Rehash of old hash doesn't overwrite changed hash
+        """
+        # 1. Create user
+        user = get_user()
+        response = await registration_handler(client, user)
+        assert response.status_code == 201
+
+        # 2. Verify user email
+        user_id = await get_user_id(session, user.username)
+        code = await get_code(redis, settings, user_id)
+        response = await verify_email_handler(client, user_id, code)
+        assert response.status_code == 200
+
+        # 3. Save hash of password with other rounds
+        old_hash = get_crypt_context(settings.ALGORITHM, rounds=2000).hash(user.password)
+        await set_hashed_password(session, user_id, old_hash)
+
+        # 4. Auth user
+        login = UserUsernamePasswordDTO(username=user.username, password=user.password)
+        response = await auth_handler(client, login)
+        assert response.status_code == 200
+
+        # 5. Hash of password is replaced in background
+        new_hash = old_hash
+        for _ in range(50):
+            new_hash = await get_hashed_password(session, user_id)
+            if new_hash != old_hash:
+                break
+            await asyncio.sleep(0.1)
+        assert new_hash != old_hash
+        assert 'rounds=1000' in new_hash
+
+        # 6. Auth user
+        response = await auth_handler(client, login)
+        assert response.status_code == 200
+
+        # 7. Rehash of old hash doesn't overwrite changed hash
+        rehash = get_crypt_context(settings.ALGORITHM, rounds=1000).hash(user.password)
+        assert not await UserRepository(session).replace_password_hash(user_id, old_hash, rehash)
+        await session.commit()
+        assert await get_hashed_password(session, user_id) == new_hash
+
+    async def test_7(self, client, session, redis, settings):
+        """
+        1. Create user                                        response 201
+        2. Verify email user                                  response 200
+        3. Auth user                                          response 200
+        4. Save expired session of user
+        5. Auth user                                          response 200
+        6. Expired session is pruned, valid sessions are kept
+        """
+        # 1. Create user
+        user = get_user()
+        response = await registration_handler(client, user)
+        assert response.status_code == 201
+
+        # 2. Verify user email
+        user_id = await get_user_id(session, user.username)
+        code = await get_code(redis, settings, user_id)
+        response = await verify_email_handler(client, user_id, code)
+        assert response.status_code == 200
+
+        # 3. Auth user
+        login = UserUsernamePasswordDTO(username=user.username, password=user.password)
+        response = await auth_handler(client, login)
+        assert response.status_code == 200
+
+        # 4. Save expired session of user
+        key = f'{AbstractMemoryStorage.sessions_name}:{user_id.hex}'
+        await redis.hset(key, 'expired', 'fingerprint:1')
+
+        # 5. Auth user
+        response = await auth_handler(client, login)
+        assert response.status_code == 200
+
+        # 6. Expired session is pruned, valid sessions are kept
+        sessions = await redis.hgetall(key)
+        assert b'expired' not in sessions
+        assert len(sessions) == 2
@@ -0,0 +1,168 @@
+import json
+
+from src.endpoints.exceptions import (
+    ForbiddenHTTPException,
+    TokenInvalidHTTPException,
+    TokenTypeInvalidHTTPException
+)
+from src.services.entities import (
+    JWTToken,
+    JWTIntrospectRequest,
+    UserUsernamePasswordDTO
+)
+
+from tests.test_handlers.utils import (
+    get_user,
+    get_code,
+    get_user_id,
+    set_superuser,
+    auth_handler,
+    logout_handler,
+    introspect_handler,
+    registration_handler,
+    verify_email_handler,
+    INTROSPECT_CLIENT
+)
+
+
+class TestIntrospectHandler:
+    async def test_1(self, client, session, redis, settings):
+        """
+        1. Create user                                        response 201
+        2. Verify user email                                  response 200
+        3. Auth user                                          response 200
+        4. Introspect access, refresh and invalid tokens      response 200
+        5. Logout user                                        response 200
+        6. Introspect access token                            response 200
+        """
+        # 1. Create user
+        user = get_user()
+        response = await registration_handler(client, user)
+        assert response.status_code == 201
+
+        # 2. Verify user email
+        user_id = await get_user_id(session, user.username)
+        code = await get_code(redis, settings, user_id)
+        response = await verify_email_handler(client, user_id, code)
+        assert response.status_code == 200
+
+        # 3. Auth user
+        login = UserUsernamePasswordDTO(username=user.username, password=user.password)
+        response = await auth_handler(client, login)
+        assert response.status_code == 200
+        token = JWTToken.model_validate_json(response.text)
+
+        # 4. Introspect access, refresh and invalid tokens
+        tokens = [token.access_token, token.refresh_token, 'invalid']
+        response = await introspect_handler(client, JWTIntrospectRequest(tokens=tokens))
+        assert response.status_code == 200
+        access, refresh, invalid = json.loads(response.text)['results']
+        assert access['active'] is True
+        assert access['user_id'] == str(user_id)
+        assert refresh['active'] is False
+        assert refresh['detail'] == TokenTypeInvalidHTTPException.detail_message
+        assert invalid['active'] is False
+        assert invalid['detail'] == TokenInvalidHTTPException.detail_message
+
+        # 5. Logout user
+        response = await logout_handler(client, token, token.access_token)
+        assert response.status_code == 200
+
+        # 6. Introspect access token
+        response = await introspect_handler(client, JWTIntrospectRequest(tokens=[token.access_token]))
+        assert response.status_code == 200
+        result, = json.loads(response.text)['results']
+        assert result['active'] is False
+        assert result['detail'] == TokenInvalidHTTPException.detail_message
+
+    async def test_2(self, client, session, redis, settings):
+        """
+        1. Create user                                        response 201
+        2. Verify user email                                  response 200
+        3. Auth user                                          response 200
+        4. Introspect without credentials                     response 401
+        5. Introspect with invalid client secret              response 401
+        6. Introspect with access token of user               response 403
+        """
+        # 1. Create user
+        user = get_user()
+        response = await registration_handler(client, user)
+        assert response.status_code == 201
+
+        # 2. Verify user email
+        user_id = await get_user_id(session, user.username)
+        code = await get_code(redis, settings, user_id)
+        response = await verify_email_handler(client, user_id, code)
+        assert response.status_code == 200
+
+        # 3. Auth user
+        login = UserUsernamePasswordDTO(username=user.username, password=user.password)
+        response = await auth_handler(client, login)
+        assert response.status_code == 200
+        token = JWTToken.model_validate_json(response.text)
+        content = JWTIntrospectRequest(tokens=[token.access_token])
+
+        # 4. Introspect without credentials
+        response = await introspect_handler(client, content, auth=None)
+        assert response.status_code == 401
+        assert response.headers['www-authenticate'] == 'Basic'
+        assert json.loads(response.text)['detail']['msg'] == 'Invalid client credentials!'
+
+        # 5. Introspect with invalid client secret
+        client_id, _ = INTROSPECT_CLIENT
+        response = await introspect_handler(client, content, auth=(client_id, 'invalid'))
+        assert response.status_code == 401
+
+        # 6. Introspect with access token of user
+        response = await introspect_handler(client, content, auth=None, header_token=token.access_token)
+        assert response.status_code == 403
+        assert json.loads(response.text)['detail']['msg'] == ForbiddenHTTPException.detail_message
+
+    async def test_3(self, client, session, redis, settings):
+        """
+        1. Create user and make it superuser                  response 201
+        2. Verify user email                                  response 200
+        3. Auth user                                          response 200
+        4. Introspect with access token of superuser          response 200
+        """
+        # 1. Create user and make it superuser
+        user = get_user()
+        response = await registration_handler(client, user)
+        assert response.status_code == 201
+        user_id = await get_user_id(session, user.username)
+        await set_superuser(session, user_id)
+
+        # 2. Verify user email
+        code = await get_code(redis, settings, user_id)
+        response = await verify_email_handler(client, user_id, code)
+        assert response.status_code == 200
+
+        # 3. Auth user
+        login = UserUsernamePasswordDTO(username=user.username, password=user.password)
+        response = await auth_handler(client, login)
+        assert response.status_code == 200
+        token = JWTToken.model_validate_json(response.text)
+
+        # 4. Introspect with access token of superuser
+        content = JWTIntrospectRequest(tokens=[token.access_token])
+        response = await introspect_handler(client, content, auth=None, header_token=token.access_token)
+        assert response.status_code == 200
+        result, = json.loads(response.text)['results']
+        assert result['active'] is True
+
+    async def test_4(self, client, settings):
+        """
+        1. Introspect 'INTROSPECT_MAX_TOKENS' tokens          response 200
+        2. Introspect more than 'INTROSPECT_MAX_TOKENS'       response 422
+        """
+        # 1. Introspect 'INTROSPECT_MAX_TOKENS' tokens
+        tokens = ['invalid'] * settings.INTROSPECT_MAX_TOKENS
+        response = await introspect_handler(client, JWTIntrospectRequest(tokens=tokens))
+        assert response.status_code == 200
+        assert len(json.loads(response.text)['results']) == settings.INTROSPECT_MAX_TOKENS
+
+        # 2. Introspect more than 'INTROSPECT_MAX_TOKENS'
+        tokens.append('invalid')
+        response = await introspect_handler(client, JWTIntrospectRequest.model_construct(tokens=tokens))
+        assert response.status_code == 422
+        assert 'Too many tokens!' in json.loads(response.text)['detail'][0]['msg']
@@ -0,0 +1,181 @@
+import json
+from pathlib import Path
+
+import jwt
+import pytest
+from httpx import AsyncClient
+from jwt.exceptions import InvalidSignatureError
+from cryptography.hazmat.primitives import serialization
+
+from src.core.config import API
+from src.infrastructure.key_ring import JWTKeyRing
+from src.infrastructure.key_ring.generate_key import generate_private_key
+from src.services.entities import (
+    JWTToken,
+    UserUsernamePasswordDTO
+)
+
+from tests.test_handlers.utils import (
+    get_user,
+    get_code,
+    get_user_id,
+    me_handler,
+    auth_handler,
+    registration_handler,
+    verify_email_handler
+)
+
+
+ALGORITHM = 'ES256'
+
+
+def write_key(keys_dir: Path, kid: str, private: bool = True) -> None:
+    key = generate_private_key(ALGORITHM)
+    if private:
+        pem = key.private_bytes(encoding=serialization.Encoding.PEM,
+                                format=serialization.PrivateFormat.PKCS8,
+                                encryption_algorithm=serialization.NoEncryption())
+    else:
+        pem = key.public_key().public_bytes(encoding=serialization.Encoding.PEM,
+                                            format=serialization.PublicFormat.SubjectPublicKeyInfo)
+    (keys_dir / f'{kid}.pem').write_bytes(pem)
+
+
+@pytest.fixture
+def keys_dir(tmp_path) -> Path:
+    write_key(tmp_path, 'active')
+    write_key(tmp_path, 'retiring')
+    return tmp_path
+
+
+class TestJWKSHandler:
+    async def test_1(self, client: AsyncClient, settings):
+        """
+        1. Get jwks                          response 200
+        2. Get jwks with etag of response    response 304
+        """
+        # 1
+        response = await client.get(url=API.jwks)
+        assert response.status_code == 200
+        assert 'keys' in json.loads(response.text)
+        assert response.headers['cache-control'] == f'public, max-age={settings.JWKS_MAX_AGE}'
+
+        # 2
+        headers = {'If-None-Match': response.headers['etag']}
+        response = await client.get(url=API.jwks, headers=headers)
+        assert response.status_code == 304
+
+
+class TestJWKSHandlerAsymmetric:
+    @pytest.fixture
+    def client_settings(self, keys_dir) -> dict:
+        return {'TOKEN_ALGORITHM': ALGORITHM,
+                'TOKEN_KEYS_DIR': str(keys_dir),
+                'TOKEN_ACTIVE_KID': 'active'}
+
+    async def test_1(self, client: AsyncClient, session, redis, settings, keys_dir):
+        """
+        1. Get jwks                                  response 200, both keys are listed
+        2. Get jwks with etag of response            response 304
+        3. Create, verify and auth user              response 200, token has 'kid' of active key
+        4. Verify token by key of jwks               payload of token
+        5. Get me with token signed by retiring key  response 200
+        """
+        # 1. Get jwks
+        response = await client.get(url=API.jwks)
+        assert response.status_code == 200
+        jwks = json.loads(response.text)
+        assert [jwk['kid'] for jwk in jwks['keys']] == ['active', 'retiring']
+        assert all(jwk['alg'] == ALGORITHM and jwk['use'] == 'sig' for jwk in jwks['keys'])
+        assert all('d' not in jwk for jwk in jwks['keys'])
+
+        # 2. Get jwks with etag of response
+        headers = {'If-None-Match': response.headers['etag']}
+        response = await client.get(url=API.jwks, headers=headers)
+        assert response.status_code == 304
+
+        # 3. Create, verify and auth user
+        user = get_user()
+        response = await registration_handler(client, user)
+        assert response.status_code == 201
+
+        user_id = await get_user_id(session, user.username)
+        code = await get_code(redis, settings, user_id)
+        response = await verify_email_handler(client, user_id, code)
+        assert response.status_code == 200
+
+        login = UserUsernamePasswordDTO(username=user.username, password=user.password)
+        response = await auth_handler(client, login)
+        assert response.status_code == 200
+        token = JWTToken.model_validate_json(response.text).access_token
+        assert jwt.get_unverified_header(token)['kid'] == 'active'
+
+        # 4. Verify token by key of jwks
+        key = jwt.PyJWKSet.from_dict(jwks)['active']
+        payload = jwt.decode(token, key=key.key, algorithms=[ALGORITHM])
+        assert payload['user_id'] == user_id.hex
+
+        # 5. Get me with token signed by retiring key
+        retiring = JWTKeyRing(ALGORITHM, settings.SECRET_KEY, str(keys_dir), 'retiring')
+        response = await me_handler(client, retiring.encode(payload))
+        assert response.status_code == 200
+
+
+class TestJWTKeyRing:
+    def test_1(self, keys_dir):
+        """
+        Token has 'kid' of active key, token of retiring key is accepted
+        """
+        ring = JWTKeyRing(ALGORITHM, 'secret', str(keys_dir), 'active')
+        token = ring.encode({'sub': 'test'})
+        assert jwt.get_unverified_header(token)['kid'] == 'active'
+        assert ring.decode(token) == {'sub': 'test'}
+
+        retiring = JWTKeyRing(ALGORITHM, 'secret', str(keys_dir), 'retiring')
+        assert ring.decode(retiring.encode({'sub': 'old'})) == {'sub': 'old'}
+
+    def test_2(self, keys_dir):
+        """
+        Retiring key can be public key, it verifies tokens and is listed in jwks
+        """
+        retiring = JWTKeyRing(ALGORITHM, 'secret', str(keys_dir), 'retiring')
+        token = retiring.encode({'sub': 'old'})
+        write_key(keys_dir, 'next')
+        (keys_dir / 'retiring.pem').write_bytes(
+            retiring.verify_keys['retiring'].public_bytes(encoding=serialization.Encoding.PEM,
+                                                          format=serialization.PublicFormat.SubjectPublicKeyInfo))
+
+        ring = JWTKeyRing(ALGORITHM, 'secret', str(keys_dir), 'next')
+        assert ring.decode(token) == {'sub': 'old'}
+        assert [jwk['kid'] for jwk in json.loads(ring.jwks_json)['keys']] == ['active', 'next', 'retiring']
+
+    def test_3(self, keys_dir, tmp_path_factory):
+        """
+        Token of unknown key and token without 'kid' are rejected
+        """
+        ring = JWTKeyRing(ALGORITHM, 'secret', str(keys_dir), 'active')
+
+        other_dir = tmp_path_factory.mktemp('other')
+        write_key(other_dir, 'unknown')
+        other = JWTKeyRing(ALGORITHM, 'secret', str(other_dir), 'unknown')
+        with pytest.raises(InvalidSignatureError):
+            ring.decode(other.encode({'sub': 'test'}))
+
+        token = jwt.encode({'sub': 'test'}, key=ring.signing_key, algorithm=ALGORITHM)
+        with pytest.raises(InvalidSignatureError):
+            ring.decode(token)
+
+    def test_4(self, keys_dir):
+        """
+        Jwks and etag change with keys, active key must be private and present
+        """
+        ring = JWTKeyRing(ALGORITHM, 'secret', str(keys_dir), 'active')
+        assert ring.jwks_etag == JWTKeyRing(ALGORITHM, 'secret', str(keys_dir), 'active').jwks_etag
+
+        write_key(keys_dir, 'next', private=False)
+        assert ring.jwks_etag != JWTKeyRing(ALGORITHM, 'secret', str(keys_dir), 'active').jwks_etag
+
+        with pytest.raises(ValueError):
+            JWTKeyRing(ALGORITHM, 'secret', str(keys_dir), 'next')
+        with pytest.raises(ValueError):
+            JWTKeyRing(ALGORITHM, 'secret', str(keys_dir), 'missing')
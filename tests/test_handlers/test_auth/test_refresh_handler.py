@@ -304,3 +304,58 @@ class TestRefreshHandler:
         # 9
         response = await logout_handler(client, new_token, new_token.access_token)
         assert response.status_code == 200
+
+    async def test_8(self, client, session, redis, settings):
+        """
+        1. Create user              response 201
+        2. Verify email user        response 200
+        3. Auth user                response 200
+        4. Auth user again          response 200
+        5. Refresh token            response 200
+        6. Refresh old token        response 400
+        7. Refresh new token        response 400
+        8. Refresh other session    response 200
+        """
+        # 1
+        user = get_user()
+        response = await registration_handler(client, user)
+        assert response.status_code == 201
+
+        # 2
+        user_id = await get_user_id(session, user.username)
+        code = await get_code(redis, settings, user_id)
+        response = await verify_email_handler(client, user_id, code)
+        assert response.status_code == 200
+
+        # 3
+        login = UserEmailPasswordDTO(email=user.email, password=user.password)
+        response = await auth_handler(client, login)
+        assert response.status_code == 200
+        token = JWTToken.model_validate_json(response.text)
+
+        # 4
+        response = await auth_handler(client, login)
+        assert response.status_code == 200
+        other_token = JWTToken.model_validate_json(response.text)
+
+        # 5
+        refresh_token = JWTRefreshToken(refresh_token=token.refresh_token)
+        response = await refresh_handler(client, refresh_token)
+        assert response.status_code == 200
+        new_token = JWTToken.model_validate_json(response.text)
+
+        # 6
+        response = await refresh_handler(client, refresh_token)
+        assert response.status_code == 400
+        assert json.loads(response.text)['detail'] == TokenInvalidHTTPException().detail
+
+        # 7
+        new_refresh_token = JWTRefreshToken(refresh_token=new_token.refresh_token)
+        response = await refresh_handler(client, new_refresh_token)
+        assert response.status_code == 400
+        assert json.loads(response.text)['detail'] == TokenInvalidHTTPException().detail
+
+        # 8
+        other_refresh_token = JWTRefreshToken(refresh_token=other_token.refresh_token)
+        response = await refresh_handler(client, other_refresh_token)
+        assert response.status_code == 200
@@ -28,3 +28,14 @@ class TestHealthHandler:
         response = await client.get(url=API.health_ping_memory_cache_v1)
         assert response.status_code == 200
         assert json.loads(response.text)['message'] == 'Memory cache worked!'
+
+    async def test_metrics(
+        self,
+        client: AsyncClient
+    ):
+        await client.get(url=API.health_ping_app_v1)
+        response = await client.get(url=API.metrics_v1)
+        assert response.status_code == 200
+        assert response.headers['content-type'].startswith('text/plain')
+        assert f'route="{API.health_ping_app_v1}"' in response.text
+        assert 'petchat_http_request_duration_seconds_bucket' in response.text
@@ -0,0 +1,166 @@
+import json
+
+from src.core.config import RateLimitPolicy
+from src.endpoints.exceptions import ManyRequestsHTTPException
+from src.services.entities import (
+    JWTToken,
+    UserUsernamePasswordDTO
+)
+from src.services.use_case import PolicyMatcher
+
+from tests.test_handlers.utils import (
+    get_user,
+    get_code,
+    get_user_id,
+    auth_handler,
+    profile_handler,
+    registration_handler,
+    verify_email_handler
+)
+
+
+LOGIN_BURST = 5
+
+PROFILE_BURST = 2
+
+
+async def get_token(client, session, redis, settings, username: str, email: str) -> str:
+    user = get_user(username=username, email=email)
+    response = await registration_handler(client, user)
+    assert response.status_code == 201
+
+    user_id = await get_user_id(session, user.username)
+    code = await get_code(redis, settings, user_id)
+    response = await verify_email_handler(client, user_id, code)
+    assert response.status_code == 200
+
+    login = UserUsernamePasswordDTO(username=user.username, password=user.password)
+    response = await auth_handler(client, login)
+    assert response.status_code == 200
+    return JWTToken.model_validate_json(response.text).access_token
+
+
+class TestRateLimiterHandler:
+    async def test_1(self, limited_client):
+        """
+        1. Auth user 'burst' times                            response not 429
+        2. Auth user once more                                response 429
+        """
+        login = UserUsernamePasswordDTO(username='testtest', password='testtest')
+
+        # 1. Auth user 'burst' times
+        for _ in range(LOGIN_BURST):
+            response = await auth_handler(limited_client, login)
+            assert response.status_code != 429
+
+        # 2. Auth user once more
+        response = await auth_handler(limited_client, login)
+        assert response.status_code == 429
+        assert json.loads(response.text)['msg'] == ManyRequestsHTTPException.detail_message
+        assert 0 < int(response.headers['retry-after']) <= 5
+
+    async def test_2(self, limited_client, session, redis, settings):
+        """
+        1. Create, verify and auth two users                  response 200
+        2. Profile by first user 'burst' times                response 403
+        3. Profile by first user once more                    response 429
+        4. Profile by second user from the same ip            response 403
+        5. Profile without token 'burst' times                response 401
+        6. Profile without token once more                    response 429
+        """
+        # 1. Create, verify and auth two users
+        first = await get_token(limited_client, session, redis, settings, 'firstuser', 'first@email.ru')
+        second = await get_token(limited_client, session, redis, settings, 'seconduser', 'second@email.ru')
+
+        # 2. Profile by first user 'burst' times
+        for _ in range(PROFILE_BURST):
+            response = await profile_handler(limited_client, first)
+            assert response.status_code == 403
+
+        # 3. Profile by first user once more
+        response = await profile_handler(limited_client, first)
+        assert response.status_code == 429
+
+        # 4. Profile by second user from the same ip
+        response = await profile_handler(limited_client, second)
+        assert response.status_code == 403
+
+        # 5. Profile without token 'burst' times
+        for _ in range(PROFILE_BURST):
+            response = await profile_handler(limited_client, None)
+            assert response.status_code == 401
+
+        # 6. Profile without token once more
+        response = await profile_handler(limited_client, None)
+        assert response.status_code == 429
+
+    async def test_3(self, limited_client, proxy_client):
+        """
+        1. Auth user 'burst' times from untrusted peer with
+           different 'X-Forwarded-For'                        response not 429
+        2. Auth user once more from untrusted peer            response 429
+        3. Auth user 'burst' times from trusted proxy         response not 429
+        4. Auth user once more from trusted proxy             response 429
+        5. Auth user from trusted proxy for other client      response not 429
+        6. Auth user from trusted proxy with spoofed address
+           before address of exhausted client                 response 429
+        """
+        login = UserUsernamePasswordDTO(username='testtest', password='testtest')
+
+        # 1. Auth user 'burst' times from untrusted peer with different 'X-Forwarded-For'
+        for i in range(LOGIN_BURST):
+            response = await auth_handler(limited_client, login, forwarded_for=f'1.1.1.{i}')
+            assert response.status_code != 429
+
+        # 2. Auth user once more from untrusted peer
+        response = await auth_handler(limited_client, login, forwarded_for='1.1.1.100')
+        assert response.status_code == 429
+
+        # 3. Auth user 'burst' times from trusted proxy
+        for _ in range(LOGIN_BURST):
+            response = await auth_handler(proxy_client, login, forwarded_for='2.2.2.2')
+            assert response.status_code != 429
+
+        # 4. Auth user once more from trusted proxy
+        response = await auth_handler(proxy_client, login, forwarded_for='2.2.2.2')
+        assert response.status_code == 429
+
+        # 5. Auth user from trusted proxy for other client
+        response = await auth_handler(proxy_client, login, forwarded_for='3.3.3.3')
+        assert response.status_code != 429
+
+        # 6. Auth user from trusted proxy with spoofed address before address of exhausted client
+        response = await auth_handler(proxy_client, login, forwarded_for='4.4.4.4, 2.2.2.2, 10.0.0.2')
+        assert response.status_code == 429
+
+
+class TestPolicyMatcher:
+    policies = (
+        RateLimitPolicy(path='/v1/user', rate=1, burst=1),
+        RateLimitPolicy(path='/v1/user/me', rate=2, burst=2),
+        RateLimitPolicy(path='/v1/user/*/verify', rate=3, burst=3),
+        RateLimitPolicy(path='/v1/*', rate=4, burst=4),
+    )
+
+    def test_1(self):
+        """
+        Longest prefix wins
+        """
+        matcher = PolicyMatcher(self.policies, default_rate=10, default_burst=10)
+        assert matcher.match('/v1/user').rate == 1
+        assert matcher.match('/v1/user/').rate == 1
+        assert matcher.match('/v1/user/me').rate == 2
+        assert matcher.match('/v1/user/me/settings').rate == 2
+        assert matcher.match('/v1/user/available').rate == 1
+
+    def test_2(self):
+        """
+        Segment '*' matches any segment, other paths get default policy
+        """
+        matcher = PolicyMatcher(self.policies, default_rate=10, default_burst=10)
+        assert matcher.match('/v1/user/42/verify').rate == 3
+        assert matcher.match('/v1/user/42/verify/code').rate == 3
+        assert matcher.match('/v1/auth/login').rate == 4
+        assert matcher.match('/v2/user/me').rate == 10
+        assert matcher.match('/').rate == 10
+        assert matcher.match('/').by_user is True
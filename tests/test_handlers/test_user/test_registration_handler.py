@@ -1,7 +1,14 @@
 import asyncio
 
+import pytest
+
+from src.infrastructure.broker import RabbitmqBroker
+from src.services.entities import BrokerUserReg
+from src.services.abstract_interface import AbstractBroker
 from tests.test_handlers.utils import (
     get_user,
+    get_outbox,
+    is_superuser,
     registration_handler
 )
 
@@ -106,15 +113,19 @@ class TestRegistrationHandler:
         response = await registration_handler(client, user)
         assert response.status_code == 201
 
-    async def test_12(self, client):
+    async def test_12(self, client, session):
         """
         1. Create user with is_superuser=True   response 201
+        2. Check user                           user isn't superuser
         """
         # 1. Create user with is_superuser=True
         user = get_user(is_superuser=True)
         response = await registration_handler(client, user)
         assert response.status_code == 201
 
+        # 2. Check user, flag of request is ignored
+        assert await is_superuser(session, user.username) is False
+
     async def test_13(self, client):
         """
         1. Create user1   response 201
@@ -165,3 +176,59 @@ class TestRegistrationHandler:
         await asyncio.sleep(settings.REG_EXP_TIME)
         response = await registration_handler(client, user)
         assert response.status_code == 201
+
+    @pytest.mark.parametrize('client_settings', [{'OUTBOX_RELAY': True}])
+    async def test_16(self, client, session, monkeypatch):
+        """
+        1. Create user                  response 201
+        2. Wait for outbox relay        message is published, outbox is empty
+        """
+        published = []
+
+        async def publish(broker, channel):
+            published.extend(broker.messages)
+        monkeypatch.setattr(RabbitmqBroker, 'publish', publish)
+
+        # 1. Create user
+        user = get_user()
+        response = await registration_handler(client, user)
+        assert response.status_code == 201
+
+        # 2. Wait for outbox relay
+        for _ in range(20):
+            if published and not await get_outbox(session):
+                break
+            await asyncio.sleep(0.1)
+        (queue_name, message), = published
+        assert queue_name == AbstractBroker.user_reg_queue_name
+        assert BrokerUserReg.model_validate_json(message).username == user.username
+        assert await get_outbox(session) == []
+
+    @pytest.mark.parametrize('client_settings', [{'OUTBOX_RELAY': True}])
+    async def test_17(self, client, session, monkeypatch):
+        """
+        1. Create user                  response 201
+        2. Wait for outbox relay        publishing fails, message stays in outbox
+        """
+        attempts = []
+
+        async def publish(broker, channel):
+            attempts.append(list(broker.messages))
+            raise ConnectionError('broker is unavailable')
+        monkeypatch.setattr(RabbitmqBroker, 'publish', publish)
+
+        # 1. Create user
+        user = get_user()
+        response = await registration_handler(client, user)
+        assert response.status_code == 201
+
+        # 2. Wait for outbox relay
+        for _ in range(20):
+            if attempts:
+                break
+            await asyncio.sleep(0.1)
+        assert attempts
+        await asyncio.sleep(0.1)
+        message, = await get_outbox(session)
+        assert message.queue == AbstractBroker.user_reg_queue_name
+        assert BrokerUserReg.model_validate_json(message.payload).username == user.username
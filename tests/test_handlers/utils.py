@@ -1,5 +1,6 @@
 import uuid
 from typing import (
+    List,
     Union,
     Optional
 )
@@ -10,7 +11,10 @@ from httpx import (
 )
 from pydantic import BaseModel
 from redis.asyncio import Redis
-from sqlalchemy import select
+from sqlalchemy import (
+    select,
+    update
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.config import (
@@ -20,6 +24,7 @@ from src.core.config import (
 from src.services.entities import (
     JWTToken,
     JWTRefreshToken,
+    JWTIntrospectRequest,
     UserPasswordDTO,
     UserEmailPasswordDTO,
     UserUsernamePasswordDTO,
@@ -27,7 +32,14 @@ from src.services.entities import (
     UserEmailDTO,
     UserUpdateType
 )
-from src.infrastructure.repository.postgres_models import User
+from src.infrastructure.repository.postgres_models import (
+    User,
+    Outbox
+)
+
+
+# client id and secret of service, which introspects tokens
+INTROSPECT_CLIENT = ('test_client', 'test_secret')
 
 
 class UserSchema(BaseModel):
@@ -67,6 +79,53 @@ async def get_user_id(session: AsyncSession,
     return obj.scalar()
 
 
+async def is_superuser(session: AsyncSession,
+                       username: str) -> Optional[bool]:
+    obj = await session.execute(
+        select(User.is_superuser)
+        .where(User.username.__eq__(username))
+    )
+    return obj.scalar()
+
+
+async def set_superuser(session: AsyncSession,
+                        user_id: uuid.UUID) -> None:
+    # users can't set the flag, so it's set in table like 'make grant_superuser'
+    await session.execute(
+        update(User)
+        .where(User.id.__eq__(user_id))
+        .values(is_superuser=True)
+    )
+    await session.commit()
+
+
+async def get_hashed_password(session: AsyncSession,
+                              user_id: uuid.UUID) -> Optional[str]:
+    obj = await session.execute(
+        select(User.hashed_password)
+        .where(User.id.__eq__(user_id))
+    )
+    return obj.scalar()
+
+
+async def set_hashed_password(session: AsyncSession,
+                              user_id: uuid.UUID,
+                              hashed_password: str) -> None:
+    await session.execute(
+        update(User)
+        .where(User.id.__eq__(user_id))
+        .values(hashed_password=hashed_password)
+    )
+    await session.commit()
+
+
+async def get_outbox(session: AsyncSession) -> List[Outbox]:
+    obj = await session.execute(
+        select(Outbox)
+    )
+    return list(obj.scalars())
+
+
 async def verify_email_handler(client: AsyncClient,
                                user_id: Optional[uuid.UUID],
                                code: Optional[str]) -> Response:
@@ -119,11 +178,15 @@ async def delete_user_handler(client: AsyncClient,
 
 
 async def auth_handler(client: AsyncClient,
-                       content: Union[UserEmailPasswordDTO, UserUsernamePasswordDTO]) -> Response:
+                       content: Union[UserEmailPasswordDTO, UserUsernamePasswordDTO],
+                       forwarded_for: Optional[str] = None) -> Response:
     data = {'url': API.auth_login_v1}
     if content:
         data['content'] = content.model_dump_json(exclude_none=True)
 
+    if forwarded_for:
+        data['headers'] = {'X-Forwarded-For': forwarded_for}
+
     return await client.post(**data)
 
 
@@ -163,3 +226,29 @@ async def me_handler(client: AsyncClient,
     if header_token is not None:
         data['headers'] = {'Authorization': f'Bearer {header_token}'}
     return await client.get(**data)
+
+
+async def introspect_handler(client: AsyncClient,
+                             content: Optional[JWTIntrospectRequest],
+                             auth: Optional[tuple] = INTROSPECT_CLIENT,
+                             header_token: Optional[str] = None) -> Response:
+    data = {'url': API.auth_introspect_v1}
+    if content:
+        data['content'] = content.model_dump_json()
+
+    if auth:
+        data['auth'] = auth
+
+    if header_token:
+        data['headers'] = {'Authorization': f'Bearer {header_token}'}
+
+    return await client.post(**data)
+
+
+async def profile_handler(client: AsyncClient,
+                          header_token: Optional[str],
+                          duration: float = 0.1) -> Response:
+    data = {'url': API.admin_profile_v1, 'params': {'duration': duration}}
+    if header_token is not None:
+        data['headers'] = {'Authorization': f'Bearer {header_token}'}
+    return await client.post(**data)
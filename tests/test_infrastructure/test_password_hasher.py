@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+from src.infrastructure.password_hasher import ProcessPoolPasswordHasher
+from src.services.abstract_interface import PasswordHasherBusyError
+
+
+@pytest.fixture
+def hasher():
+    hasher = ProcessPoolPasswordHasher('bcrypt', rounds=12, max_workers=1, max_queue_size=1)
+    yield hasher
+    hasher.close()
+
+
+class TestProcessPoolPasswordHasher:
+    async def test_1(self, hasher):
+        """
+        1. Hash password and cancel caller                    job keeps its place in queue
+        2. Hash password while job is running                 PasswordHasherBusyError
+        3. Wait job of cancelled caller                       place is released, password is hashed
+        """
+        # 1. Hash password and cancel caller
+        task = asyncio.create_task(hasher.hash('password'))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert hasher.pending == 1
+
+        # 2. Hash password while job is running
+        with pytest.raises(PasswordHasherBusyError):
+            await hasher.hash('password')
+
+        # 3. Wait job of cancelled caller
+        for _ in range(100):
+            if hasher.pending == 0:
+                break
+            await asyncio.sleep(0.1)
+        assert hasher.pending == 0
+        assert await hasher.verify('password', await hasher.hash('password'))
+        assert hasher.pending == 0
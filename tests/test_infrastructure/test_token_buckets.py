@@ -0,0 +1,100 @@
+from src.infrastructure.memory_storage import LocalTokenBuckets
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestLocalTokenBuckets:
+    def test_1(self):
+        """
+        1. Take token from empty bucket                       None, lease is needed
+        2. Put tokens of lease, one token is spent by request
+        3. Take every leased token                            0
+        4. Take token after lease is spent                    None, lease is needed
+        """
+        buckets = LocalTokenBuckets(capacity=10, clock=FakeClock())
+
+        # 1. Take token from empty bucket
+        assert buckets.take('key') is None
+
+        # 2. Put tokens of lease, one token is spent by request
+        granted = 3
+        buckets.put('key', granted - 1, retry_after=0, ttl=3)
+
+        # 3. Take every leased token
+        assert [buckets.take('key') for _ in range(granted - 1)] == [0, 0]
+
+        # 4. Take token after lease is spent
+        assert buckets.take('key') is None
+        assert 'key' not in buckets.buckets
+
+    def test_2(self):
+        """
+        1. Put tokens of lease
+        2. Take token before ttl passes                       0
+        3. Take token after ttl passes                        None, unused tokens are dropped
+        """
+        clock = FakeClock()
+        buckets = LocalTokenBuckets(capacity=10, clock=clock)
+
+        # 1. Put tokens of lease
+        buckets.put('key', 5, retry_after=0, ttl=1)
+
+        # 2. Take token before ttl passes
+        clock.now += 0.5
+        assert buckets.take('key') == 0
+        assert buckets.buckets['key'][0] == 4
+
+        # 3. Take token after ttl passes
+        clock.now += 0.5
+        assert buckets.take('key') is None
+        assert 'key' not in buckets.buckets
+
+    def test_3(self):
+        """
+        1. Put denial of lease, nothing is granted            -1 tokens are clamped to 0
+        2. Take token while denial is kept                    time left to 'retry_after'
+        3. Take token after 'retry_after' passes              None, lease is needed
+        4. Put denial without 'retry_after'                   bucket is removed
+        """
+        clock = FakeClock()
+        buckets = LocalTokenBuckets(capacity=10, clock=clock)
+
+        # 1. Put denial of lease, nothing is granted
+        buckets.put('key', -1, retry_after=2, ttl=3)
+        assert buckets.buckets['key'] == (0, clock.now + 2)
+
+        # 2. Take token while denial is kept
+        assert buckets.take('key') == 2
+        clock.now += 1.5
+        assert buckets.take('key') == 0.5
+
+        # 3. Take token after 'retry_after' passes
+        clock.now += 0.5
+        assert buckets.take('key') is None
+
+        # 4. Put denial without 'retry_after'
+        buckets.put('key', 2, retry_after=0, ttl=3)
+        buckets.put('key', -1, retry_after=0, ttl=3)
+        assert 'key' not in buckets.buckets
+
+    def test_4(self):
+        """
+        If count of buckets is equal capacity, then the oldest bucket is
+        removed, putting in existing bucket doesn't remove other buckets
+        """
+        buckets = LocalTokenBuckets(capacity=2, clock=FakeClock())
+        buckets.put('first', 1, retry_after=0, ttl=1)
+        buckets.put('second', 1, retry_after=0, ttl=1)
+        buckets.put('second', 2, retry_after=0, ttl=1)
+        assert list(buckets.buckets) == ['first', 'second']
+
+        buckets.put('third', 1, retry_after=0, ttl=1)
+        assert list(buckets.buckets) == ['second', 'third']
+        assert buckets.take('first') is None
+        assert buckets.take('second') == 0